@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from models.column import Column
+from models.importer import import_columns
+from models.table import Table, AnalysisCache
+
+# Tamaños por defecto del barrido
+DEFAULT_ROWS = [10**3, 10**4, 10**5, 10**6, 10**7, 10**8]
+DEFAULT_COLUMNS = [2, 10, 100, 1000]
+
+# Límite de celdas (filas x columnas) de los datos sintéticos y de los archivos importados
+DEFAULT_MAX_CELLS = 10**9
+DEFAULT_MAX_IMPORT_CELLS = 10**7
+
+# Versión del formato del reporte
+REPORT_VERSION = 1
+
+def synthetic_columns(rows: int, columns: int, seed: int = 0) -> List[Column]:
+  """
+  Genera columnas binarias aleatorias (probabilidad 0.5) directamente empaquetadas, sin pasar por valores 0/1.
+
+  :param rows: Número de filas.
+  :param columns: Número de columnas.
+  :param seed: Semilla del generador.
+  :return: Lista de columnas.
+  """
+  rng = np.random.default_rng(seed)
+  size = (rows + 7) // 8
+  result = []
+  for i in range(columns):
+    bits = rng.integers(0, 256, size, dtype=np.uint8)
+    if rows % 8:
+      # Los bits de relleno deben quedar en 0
+      bits[-1] &= np.uint8((0xFF << (8 - rows % 8)) & 0xFF)
+    result.append(Column.from_packed(f'item_{i}', bits, rows))
+  return result
+
+def measure(function: Callable, repeat: int, setup: Optional[Callable] = None) -> dict:
+  """
+  Mide el mejor tiempo de `repeat` ejecuciones y, en una ejecución aparte, el pico de memoria con tracemalloc.
+
+  :param function: Función a medir.
+  :param repeat: Número de ejecuciones cronometradas.
+  :param setup: Función opcional que se ejecuta antes de cada ejecución, fuera del tiempo medido.
+  :return: Diccionario con el mejor tiempo en segundos y el pico de memoria en bytes.
+  """
+  times = []
+  for _ in range(repeat):
+    if setup:
+      setup()
+    start = time.perf_counter()
+    function()
+    times.append(time.perf_counter() - start)
+
+  if setup:
+    setup()
+  tracemalloc.start()
+  try:
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  return {'seconds': min(times), 'peak_memory_bytes': peak}
+
+def benchmark_table(rows: int, columns: int, repeat: int) -> List[dict]:
+  """
+  Mide cada etapa del análisis de la tabla para un tamaño de datos. Antes de cada ejecución se vacía el caché
+  de resultados para medir el cálculo y no la búsqueda en el caché.
+
+  :param rows: Número de filas.
+  :param columns: Número de columnas.
+  :param repeat: Número de ejecuciones por etapa.
+  :return: Lista de mediciones.
+  """
+  data = synthetic_columns(rows, columns)
+  table = Table(cache=AnalysisCache())
+  table.set_columns(data)
+  table.selected_index_columns = [0, 1]
+
+  def reset():
+    table.cache.clear()
+    table.contingency_table = None
+
+  def reset_with_contingency():
+    reset()
+    table.get_contingency_table()
+
+  stages = [
+    ('set_columns', lambda: table.set_columns(data), None),
+    ('get_contingency_table', table.get_contingency_table, reset),
+    ('get_coverage_confidence', table.get_coverage_confidence, reset_with_contingency),
+    ('calculate_dependency_factor', table.calculate_dependency_factor, reset_with_contingency),
+    ('calculate_chi_squared', table.calculate_chi_squared, reset_with_contingency),
+    ('calculate_all_pairs', table.calculate_all_pairs, None),
+  ]
+  results = []
+  for name, function, setup in stages:
+    results.append({'benchmark': name, 'rows': rows, 'columns': columns, **measure(function, repeat, setup)})
+  return results
+
+def benchmark_import(rows: int, columns: int, repeat: int, extension: str) -> dict:
+  """
+  Mide la importación completa de un archivo sintético (.csv o .xlsx), sin usar el caché en disco.
+
+  :param rows: Número de filas.
+  :param columns: Número de columnas.
+  :param repeat: Número de ejecuciones.
+  :param extension: '.csv' o '.xlsx'.
+  :return: Medición de la importación.
+  """
+  rng = np.random.default_rng(0)
+  frame = pd.DataFrame(rng.integers(0, 2, (rows, columns), dtype=np.uint8), columns=[f'item_{i}' for i in range(columns)])
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, f'data{extension}')
+    if extension == '.csv':
+      frame.to_csv(path, index=False)
+    else:
+      frame.to_excel(path, index=False)
+    result = measure(lambda: import_columns(path), repeat)
+  return {'benchmark': f'import{extension}', 'rows': rows, 'columns': columns, **result}
+
+def add_throughput(result: dict) -> dict:
+  seconds = max(result['seconds'], 1e-12)
+  result['rows_per_second'] = result['rows'] / seconds
+  result['cells_per_second'] = result['rows'] * result['columns'] / seconds
+  return result
+
+def environment() -> dict:
+  """
+  Describe la versión del código y el entorno en el que se ejecutaron las mediciones.
+
+  :return: Diccionario con el commit de git, las versiones de Python y NumPy, la plataforma y la fecha.
+  """
+  try:
+    commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    commit = None
+  return {
+    'commit': commit,
+    'python': platform.python_version(),
+    'numpy': np.__version__,
+    'pandas': pd.__version__,
+    'platform': platform.platform(),
+    'processor': platform.processor(),
+    'cpus': os.cpu_count(),
+    'timestamp': datetime.now(timezone.utc).isoformat()
+  }
+
+def compare(report: dict, baseline: dict):
+  """
+  Imprime la relación de tiempos entre el reporte actual y uno anterior (> 1 significa más lento).
+
+  :param report: Reporte actual.
+  :param baseline: Reporte anterior.
+  """
+  previous = {(r['benchmark'], r['rows'], r['columns']): r for r in baseline['results']}
+  print(f"\nComparación con {baseline['environment'].get('commit')} (tiempo actual / anterior):")
+  for result in report['results']:
+    key = (result['benchmark'], result['rows'], result['columns'])
+    if key in previous:
+      ratio = result['seconds'] / max(previous[key]['seconds'], 1e-12)
+      memory = result['peak_memory_bytes'] / max(previous[key]['peak_memory_bytes'], 1)
+      print(f"{key[0]:<28} filas={key[1]:<10} columnas={key[2]:<5} tiempo x{ratio:.2f}  memoria x{memory:.2f}")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Mide el rendimiento del análisis de tablas con datos sintéticos.")
+  parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="Números de filas a medir.")
+  parser.add_argument('--columns', type=int, nargs='+', default=DEFAULT_COLUMNS, help="Números de columnas a medir.")
+  parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS,
+                      help="Omite los tamaños con más celdas que este límite.")
+  parser.add_argument('--max-import-cells', type=int, default=DEFAULT_MAX_IMPORT_CELLS,
+                      help="Límite de celdas de los archivos sintéticos importados (.xlsx usa la centésima parte).")
+  parser.add_argument('--repeat', type=int, default=3, help="Ejecuciones por medición; se guarda la más rápida.")
+  parser.add_argument('--quick', action='store_true', help="Barrido corto (hasta 10^5 filas y 100 columnas).")
+  parser.add_argument('--compare', metavar='REPORTE', help="Reporte JSON anterior con el que se comparan los tiempos.")
+  parser.add_argument('-o', '--output', default='benchmark_report.json', help="Archivo JSON del reporte.")
+  return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+  args = parse_args(argv)
+  rows_list = [rows for rows in args.rows if not args.quick or rows <= 10**5]
+  columns_list = [columns for columns in args.columns if not args.quick or columns <= 100]
+
+  results = []
+  for rows in rows_list:
+    for columns in columns_list:
+      if rows * columns > args.max_cells:
+        continue
+      print(f"Tabla: {rows} filas x {columns} columnas", file=sys.stderr)
+      results.extend(benchmark_table(rows, columns, args.repeat))
+      for extension, limit in (('.csv', args.max_import_cells), ('.xlsx', args.max_import_cells // 100)):
+        if rows * columns <= limit:
+          print(f"Importación {extension}: {rows} filas x {columns} columnas", file=sys.stderr)
+          results.append(benchmark_import(rows, columns, args.repeat, extension))
+
+  report = {
+    'version': REPORT_VERSION,
+    'environment': environment(),
+    'results': [add_throughput(result) for result in results]
+  }
+  with open(args.output, 'w', encoding='utf-8') as output:
+    json.dump(report, output, indent=2)
+    output.write('\n')
+  print(f"Reporte guardado en {args.output}", file=sys.stderr)
+
+  if args.compare:
+    with open(args.compare, encoding='utf-8') as file:
+      compare(report, json.load(file))
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,281 @@
+import argparse
+import csv
+import json
+import sys
+from typing import List, Optional
+from models.dataset import create_dataset, is_dataset, open_dataset
+from models.validation import InvalidDataError
+from models.instrumentation import instrumentation
+from models.permutation import permutation_p_values
+from models.significance import adjust_p_values, rank_by_p_value
+from models.table import Table, CRITICAL_VALUES, SIGNIFICANCE_LEVELS
+from models.transactions import import_transactions
+from models.workbook_cache import load_columns
+
+# Columnas del formato CSV de salida
+CSV_FIELDS = [
+  'item1', 'item2', 'n11', 'n10', 'n01', 'n00', 'chi_squared', 'df', 'p_value', 'method', 'p_adjusted', 'p_permutation',
+  'fd11', 'fd10', 'fd01', 'fd00', 'significance'
+]
+
+# Columnas del formato CSV de salida de las reglas de asociación
+RULE_CSV_FIELDS = [
+  'rule', 'antecedent', 'consequent', 'count', 'coverage', 'confidence', 'chi_squared', 'p_value', 'p_adjusted',
+  'p_permutation', 'dependency_factor', 'significance'
+]
+
+def significance_level(chi_squared: float, p_value: float, method: str, df: int = 1) -> Optional[str]:
+  """
+  Obtiene el mayor nivel de confianza con el que se rechaza la hipótesis de independencia.
+
+  :param chi_squared: Valor de chi-cuadrado.
+  :param p_value: Valor p de la prueba usada.
+  :param method: 'chi2' (compara con los valores críticos) o 'fisher' (compara el valor p).
+  :param df: Grados de libertad; con más de 1 se compara el valor p.
+  :return: Etiqueta del nivel (por ejemplo '99%') o None si no se rechaza con ningún nivel.
+  """
+  level = None
+  for label in CRITICAL_VALUES:
+    if method == 'fisher' or df != 1:
+      rejected = p_value < SIGNIFICANCE_LEVELS[label]
+    else:
+      rejected = chi_squared > CRITICAL_VALUES[label]
+    if rejected:
+      level = label
+  return level
+
+def analyze_pair(table: Table, index1: int, index2: int) -> dict:
+  """
+  Analiza un par de columnas con el mismo flujo que la interfaz gráfica.
+
+  :param table: Tabla con las columnas cargadas.
+  :param index1: Índice de la primera columna.
+  :param index2: Índice de la segunda columna.
+  :return: Diccionario con las celdas observadas (r x c), chi-cuadrado, grados de libertad, factor de dependencia
+           y significancia.
+  """
+  table.selected_index_columns = [index1, index2]
+  contingency = table.get_contingency_table()
+  chi_squared = table.calculate_chi_squared().statistic
+  df = table.get_degrees_of_freedom()
+  p_value, method = table.test_independence()
+  dependency = table.get_dependency_factor()
+  return {
+    'item1': table.columns[index1].name,
+    'item2': table.columns[index2].name,
+    'observed': [[int(value) for value in row[:-1]] for row in contingency[:-1]],
+    'chi_squared': float(chi_squared),
+    'df': df,
+    'p_value': p_value,
+    'method': method,
+    'dependency_factor': [[float(value) for value in row] for row in dependency],
+    'significance': significance_level(chi_squared, p_value, method, df)
+  }
+
+def analyze_all_pairs(table: Table) -> List[dict]:
+  """
+  Analiza todos los pares de columnas distintas con el motor vectorizado de todos los pares.
+  Si hay columnas categóricas, cada par se analiza por separado con `analyze_pair`.
+
+  :param table: Tabla con las columnas cargadas.
+  :return: Lista de diccionarios con el mismo formato que `analyze_pair`.
+  """
+  if not table.are_all_columns_binary():
+    k = len(table.columns)
+    return [analyze_pair(table, i, j) for i in range(k) for j in range(i + 1, k)]
+
+  results = table.calculate_all_pairs()
+  names = results['names']
+  records = []
+  for i in range(len(names)):
+    for j in range(i + 1, len(names)):
+      chi_squared = float(results['chi_squared'][i, j])
+      p_value = float(results['p_value'][i, j])
+      method = 'fisher' if results['exact'][i, j] else 'chi2'
+      records.append({
+        'item1': names[i],
+        'item2': names[j],
+        'observed': results['observed'][i, j].tolist(),
+        'chi_squared': chi_squared,
+        'df': 1,
+        'p_value': p_value,
+        'method': method,
+        'dependency_factor': results['dependency_factor'][i, j].round(3).tolist(),
+        'significance': significance_level(chi_squared, p_value, method)
+      })
+  return records
+
+def analyze_rules(table: Table, min_support: float, min_confidence: float, max_length: Optional[int]) -> List[dict]:
+  """
+  Busca todas las reglas de asociación frecuentes de la tabla.
+
+  :param table: Tabla con las columnas cargadas.
+  :param min_support: Soporte mínimo (0 a 1).
+  :param min_confidence: Confianza mínima (0 a 1).
+  :param max_length: Número máximo de ítems por regla.
+  :return: Lista de reglas con su significancia.
+  """
+  records = [rule.to_dict() for rule in table.mine_rules(min_support, min_confidence, max_length)]
+  for record in records:
+    record['df'] = 1
+    record['method'] = 'chi2'
+    record['significance'] = significance_level(record['chi_squared'], record['p_value'], 'chi2')
+  return records
+
+def write_records(records: List[dict], output, output_format: str):
+  """
+  Escribe los resultados en formato JSON o CSV.
+
+  :param records: Resultados de `analyze_pair` o `analyze_all_pairs`.
+  :param output: Archivo de texto abierto donde se escribe.
+  :param output_format: 'json' o 'csv'.
+  """
+  if output_format == 'json':
+    json.dump(records, output, ensure_ascii=False, indent=2)
+    output.write('\n')
+    return
+
+  if records and 'rule' in records[0]:
+    writer = csv.DictWriter(output, fieldnames=RULE_CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for record in records:
+      writer.writerow({
+        **record,
+        'antecedent': ';'.join(record['antecedent']),
+        'consequent': ';'.join(record['consequent']),
+        'p_adjusted': record.get('p_adjusted', ''),
+        'p_permutation': record.get('p_permutation', ''),
+        'significance': record['significance'] or ''
+      })
+    return
+
+  writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+  writer.writeheader()
+  for record in records:
+    row = {
+      'item1': record['item1'], 'item2': record['item2'],
+      'chi_squared': record['chi_squared'],
+      'df': record['df'],
+      'p_value': record['p_value'],
+      'method': record['method'],
+      'p_adjusted': record.get('p_adjusted', ''),
+      'p_permutation': record.get('p_permutation', ''),
+      'significance': record['significance'] or ''
+    }
+    # Las celdas individuales solo se escriben para tablas 2x2; las r x c se consultan en formato JSON
+    if record['df'] == 1:
+      (row['n11'], row['n10']), (row['n01'], row['n00']) = record['observed']
+      (row['fd11'], row['fd10']), (row['fd01'], row['fd00']) = record['dependency_factor']
+    writer.writerow(row)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(
+    description="MECHI - Chi2 en modo por lotes: analiza un archivo .xlsx o .csv sin abrir la interfaz gráfica."
+  )
+  parser.add_argument('file', help="Ruta del archivo .xlsx o .csv con columnas de valores 0 y 1, o carpeta de un dataset en disco.")
+  parser.add_argument('--categorical', action='store_true',
+                      help="Acepta columnas con valores distintos de 0 y 1 y las analiza con tablas r x c.")
+  parser.add_argument('--transactions', action='store_true',
+                      help="Lee el archivo en formato largo: una fila por par (transacción, ítem) en lugar de una columna por ítem.")
+  parser.add_argument('--transaction-column', help="Columna con el identificador de la transacción (por defecto la primera).")
+  parser.add_argument('--item-column', help="Columna con el ítem (por defecto la segunda).")
+  selection = parser.add_mutually_exclusive_group(required=True)
+  selection.add_argument('--pair', nargs=2, action='append', metavar=('ITEM1', 'ITEM2'),
+                         help="Par de columnas a analizar (se puede repetir).")
+  selection.add_argument('--all-pairs', action='store_true', help="Analiza todos los pares de columnas.")
+  selection.add_argument('--rules', action='store_true',
+                         help="Busca todas las reglas de asociación de k ítems que superan el soporte y la confianza mínimos.")
+  parser.add_argument('--create-dataset', metavar='DIR',
+                      help="Convierte el archivo en un dataset en disco en DIR y lo analiza desde ahí, sin cargarlo en memoria.")
+  parser.add_argument('--no-cache', action='store_true',
+                      help="Lee siempre el archivo completo, sin usar ni escribir su caché en disco.")
+  parser.add_argument('--min-support', type=float, default=0.1, help="Soporte mínimo de las reglas, de 0 a 1 (0.1 por defecto).")
+  parser.add_argument('--min-confidence', type=float, default=0.5,
+                      help="Confianza mínima de las reglas, de 0 a 1 (0.5 por defecto).")
+  parser.add_argument('--max-length', type=int, help="Número máximo de ítems por regla (sin límite por defecto).")
+  parser.add_argument('--adjust', choices=['bonferroni', 'bh'],
+                      help="Ajusta los valores p por comparaciones múltiples (Bonferroni o Benjamini-Hochberg).")
+  parser.add_argument('--rank', action='store_true', help="Ordena los resultados del valor p menor al mayor.")
+  parser.add_argument('--permutations', type=int, metavar='N',
+                      help="Agrega un valor p empírico con N permutaciones por par.")
+  parser.add_argument('--workers', type=int,
+                      help="Procesos para contar las co-ocurrencias por fragmentos de filas y para las permutaciones (por defecto, el número de CPUs).")
+  parser.add_argument('--seed', type=int, help="Semilla de las permutaciones.")
+  parser.add_argument('--trace', metavar='ARCHIVO',
+                      help="Guarda una traza JSON (formato de eventos de Chrome) con el tiempo de cada etapa y los contadores.")
+  parser.add_argument('--trace-memory', action='store_true', help="Incluye el uso de memoria de cada etapa en la traza (más lento).")
+  parser.add_argument('--format', choices=['json', 'csv'], default='json', help="Formato de salida (json por defecto).")
+  parser.add_argument('-o', '--output', help="Archivo de salida (por defecto la salida estándar).")
+  return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+  args = parse_args(argv)
+  if args.trace:
+    instrumentation.enable(memory=args.trace_memory)
+  try:
+    return run(args)
+  finally:
+    if args.trace:
+      instrumentation.export(args.trace)
+
+def run(args: argparse.Namespace) -> int:
+  try:
+    if args.transactions:
+      columns = import_transactions(args.file, args.transaction_column, args.item_column).to_columns(sparse=True)
+    elif is_dataset(args.file):
+      columns = open_dataset(args.file)
+    elif args.create_dataset:
+      columns = create_dataset(args.file, args.create_dataset)
+    else:
+      columns = load_columns(args.file, categorical=args.categorical, use_cache=not args.no_cache)
+  except (InvalidDataError, ValueError, OSError) as e:
+    print(f"Error al leer el archivo: {e}", file=sys.stderr)
+    return 1
+
+  table = Table(workers=args.workers)
+  table.set_columns(columns)
+  if table.row_count == 0:
+    print("El archivo está vacío.", file=sys.stderr)
+    return 1
+
+  if args.all_pairs:
+    records = analyze_all_pairs(table)
+  elif args.rules:
+    if not table.are_all_columns_binary():
+      print("La búsqueda de reglas solo está disponible para columnas binarias.", file=sys.stderr)
+      return 1
+    records = analyze_rules(table, args.min_support, args.min_confidence, args.max_length)
+  else:
+    names = [column.name for column in columns]
+    records = []
+    for name1, name2 in args.pair:
+      missing = [name for name in (name1, name2) if name not in names]
+      if missing:
+        print(f"No existe la columna: {', '.join(missing)}", file=sys.stderr)
+        return 1
+      records.append(analyze_pair(table, names.index(name1), names.index(name2)))
+
+  # La prueba de permutación solo se aplica a tablas 2x2
+  binary_records = [record for record in records if record['df'] == 1]
+  if args.permutations and binary_records:
+    observed = [record['observed'] for record in binary_records]
+    p_permutations = permutation_p_values(observed, args.permutations, args.workers, args.seed)
+    for record, p_permutation in zip(binary_records, p_permutations):
+      record['p_permutation'] = float(p_permutation)
+
+  p_values = [record['p_value'] for record in records]
+  if args.adjust:
+    for record, p_adjusted in zip(records, adjust_p_values(p_values, args.adjust)):
+      record['p_adjusted'] = float(p_adjusted)
+  if args.rank:
+    records = [records[index] for index in rank_by_p_value(p_values)]
+
+  if args.output:
+    with open(args.output, 'w', encoding='utf-8', newline='') as output:
+      write_records(records, output, args.format)
+  else:
+    write_records(records, sys.stdout, args.format)
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -1,12 +1,396 @@
+import hashlib
+import numpy as np
+
+# Bytes empaquetados procesados a la vez al contar o calcular el hash, para que la memoria usada no dependa
+# del número de filas (los bits pueden estar mapeados desde disco)
+BLOCK_BYTES = 1 << 22
+
 class Column:
   """
   Clase que representa una columna en una tabla, con un nombre y una lista de valores binarios (0 o 1).
+  Los valores se guardan empaquetados a nivel de bit (8 celdas por byte) para reducir el uso de memoria.
   """
   def __init__(self, name: str, values: list[int]):
     self.name = name
-    self.values = values
+    values = np.asarray(values)
+    if values.size and not np.isin(values, (0, 1)).all():
+      raise ValueError(f"La columna '{name}' contiene valores que no son 0 o 1.")
+    # Los bytes después de los primeros ceil(size / 8) son capacidad reservada y deben valer 0
+    self._bits = np.packbits(values.astype(np.uint8))
+    self._size = values.size
+    self._fingerprint = None
+
+  @classmethod
+  def from_packed(cls, name: str, bits: np.ndarray, size: int) -> "Column":
+    """
+    Crea una columna a partir de valores ya empaquetados con `np.packbits`.
+
+    :param name: Nombre de la columna.
+    :param bits: Arreglo uint8 con los bits empaquetados (los bits de relleno deben ser 0); puede ser un np.memmap.
+    :param size: Número de filas representadas.
+    :return: Nueva instancia de Column.
+    """
+    column = cls.__new__(cls)
+    column.name = name
+    column._bits = bits if isinstance(bits, np.memmap) else np.asarray(bits, dtype=np.uint8)
+    column._size = size
+    column._fingerprint = None
+    return column
+
+  def __len__(self) -> int:
+    return self._size
+
+  @property
+  def bits(self) -> np.ndarray:
+    """
+    Valores empaquetados, 8 filas por byte (el bit más significativo es la primera fila).
+    """
+    return self._bits[:(self._size + 7) // 8]
+
+  @property
+  def values(self) -> np.ndarray:
+    """
+    Valores desempaquetados como arreglo uint8 de 0 y 1.
+    """
+    return np.unpackbits(self.bits, count=self._size)
+
+  @property
+  def is_binary(self) -> bool:
+    return True
+
+  @property
+  def levels(self) -> list:
+    """
+    Niveles de la columna en el orden de sus códigos (primero 1, luego 0).
+    """
+    return [1, 0]
+
+  @property
+  def codes(self) -> np.ndarray:
+    """
+    Códigos enteros de cada fila: 0 para el valor 1 y 1 para el valor 0, igual que el orden de `levels`.
+    """
+    return 1 - self.values
+
+  def count(self) -> int:
+    """
+    Cuenta las filas con valor 1.
+
+    :return: Número de unos en la columna.
+    """
+    bits = self.bits
+    return sum(int(np.bitwise_count(bits[start:start + BLOCK_BYTES]).sum(dtype=np.int64))
+               for start in range(0, len(bits), BLOCK_BYTES))
+
+  def and_count(self, other: "Column") -> int:
+    """
+    Cuenta las filas donde esta columna y otra valen 1 al mismo tiempo.
+
+    :param other: Columna con la que se compara.
+    :return: Número de filas con ambos valores en 1.
+    """
+    if len(other) != self._size:
+      raise ValueError("Las columnas deben tener el mismo número de filas.")
+    if isinstance(other, SparseColumn):
+      return other.and_count(self)
+    bits, other_bits = self.bits, other.bits
+    return sum(int(np.bitwise_count(bits[start:start + BLOCK_BYTES] & other_bits[start:start + BLOCK_BYTES]).sum(dtype=np.int64))
+               for start in range(0, len(bits), BLOCK_BYTES))
+
+  def fingerprint(self) -> str:
+    """
+    Obtiene un hash del contenido de la columna. Se calcula una sola vez y se recalcula después de cualquier cambio.
+
+    :return: Hash hexadecimal de los valores y el número de filas.
+    """
+    if self._fingerprint is None:
+      digest = hashlib.blake2b(digest_size=16)
+      bits = self.bits
+      for start in range(0, len(bits), BLOCK_BYTES):
+        digest.update(np.ascontiguousarray(bits[start:start + BLOCK_BYTES]).tobytes())
+      digest.update(int(self._size).to_bytes(8, 'little'))
+      self._fingerprint = digest.hexdigest()
+    return self._fingerprint
+
+  def get(self, index: int) -> int:
+    """
+    Obtiene el valor de una fila.
+
+    :param index: Índice de la fila.
+    :return: 0 o 1.
+    """
+    if not 0 <= index < self._size:
+      raise IndexError("Índice de fila fuera de rango.")
+    return int(self._bits[index >> 3] >> (7 - (index & 7))) & 1
+
+  def set(self, index: int, value: int):
+    """
+    Cambia el valor de una fila.
+
+    :param index: Índice de la fila.
+    :param value: Nuevo valor (0 o 1).
+    """
+    if not 0 <= index < self._size:
+      raise IndexError("Índice de fila fuera de rango.")
+    if value not in (0, 1):
+      raise ValueError("El valor debe ser 0 o 1.")
+    mask = np.uint8(1 << (7 - (index & 7)))
+    self._fingerprint = None
+    if value:
+      self._bits[index >> 3] |= mask
+    else:
+      self._bits[index >> 3] &= ~mask
+
+  def append(self, value: int):
+    """
+    Agrega una fila al final de la columna. La capacidad crece al doble para que agregar sea O(1) amortizado.
+
+    :param value: Valor de la nueva fila (0 o 1).
+    """
+    if self._size == len(self._bits) * 8:
+      grown = np.zeros(max(8, len(self._bits) * 2), dtype=np.uint8)
+      grown[:len(self._bits)] = self._bits
+      self._bits = grown
+    self._size += 1
+    self.set(self._size - 1, value)
+
+  def pop(self) -> int:
+    """
+    Elimina la última fila de la columna.
+
+    :return: Valor de la fila eliminada.
+    """
+    value = self.get(self._size - 1)
+    self.set(self._size - 1, 0)
+    self._size -= 1
+    return value
+
+  def __repr__(self):
+    return f"Column(name={self.name!r}, rows={self._size})"
+
+class SparseColumn:
+  """
+  Clase que representa una columna binaria poco densa (por ejemplo, un ítem presente en menos del 1% de las
+  transacciones). Solo se guardan, ordenados, los índices de las filas con valor 1, por lo que la memoria y el
+  costo de contar dependen del número de unos y no del número de filas. Los bits empaquetados y los valores
+  se generan al pedirlos, para las operaciones que necesitan la columna completa.
+  """
+  def __init__(self, name: str, rows: np.ndarray, size: int):
+    self.name = name
+    rows = np.asarray(rows, dtype=np.int64)
+    if rows.size and (rows[0] < 0 or rows[-1] >= size or (np.diff(rows) <= 0).any()):
+      raise ValueError(f"Los índices de la columna '{name}' deben estar ordenados, sin repetir y dentro de las filas.")
+    self._rows = rows
+    self._size = size
+    self._fingerprint = None
+
+  @classmethod
+  def from_column(cls, column: Column) -> "SparseColumn":
+    """
+    Crea una columna dispersa con los mismos valores que una columna empaquetada.
+
+    :param column: Columna binaria.
+    :return: Nueva instancia de SparseColumn.
+    """
+    return cls(column.name, np.flatnonzero(column.values), len(column))
+
+  def __len__(self) -> int:
+    return self._size
+
+  @property
+  def rows(self) -> np.ndarray:
+    """
+    Índices ordenados de las filas con valor 1.
+    """
+    return self._rows
+
+  @property
+  def bits(self) -> np.ndarray:
+    """
+    Valores empaquetados como en Column.bits (el bit más significativo es la primera fila).
+    """
+    rows = self._rows
+    # Cada fila aparece una sola vez, así que sumar los bits de un byte equivale a unirlos
+    return np.bincount(rows >> 3, weights=0x80 >> (rows & 7), minlength=(self._size + 7) // 8).astype(np.uint8)
+
+  @property
+  def values(self) -> np.ndarray:
+    """
+    Valores desempaquetados como arreglo uint8 de 0 y 1.
+    """
+    values = np.zeros(self._size, dtype=np.uint8)
+    values[self._rows] = 1
+    return values
+
+  @property
+  def is_binary(self) -> bool:
+    return True
+
+  @property
+  def levels(self) -> list:
+    """
+    Niveles de la columna en el orden de sus códigos (primero 1, luego 0).
+    """
+    return [1, 0]
+
+  @property
+  def codes(self) -> np.ndarray:
+    """
+    Códigos enteros de cada fila: 0 para el valor 1 y 1 para el valor 0, igual que el orden de `levels`.
+    """
+    return 1 - self.values
+
+  def count(self) -> int:
+    """
+    Cuenta las filas con valor 1.
+
+    :return: Número de unos en la columna.
+    """
+    return len(self._rows)
+
+  def and_count(self, other) -> int:
+    """
+    Cuenta las filas donde esta columna y otra valen 1 al mismo tiempo, intersectando los índices si la otra
+    columna también es dispersa o consultando sus bits solo en las filas con valor 1 de esta.
+
+    :param other: Columna binaria (Column o SparseColumn) con la que se compara.
+    :return: Número de filas con ambos valores en 1.
+    """
+    if len(other) != self._size:
+      raise ValueError("Las columnas deben tener el mismo número de filas.")
+    if isinstance(other, SparseColumn):
+      return len(np.intersect1d(self._rows, other.rows, assume_unique=True))
+    rows = self._rows
+    return int(((other.bits[rows >> 3] >> (7 - (rows & 7))) & 1).sum(dtype=np.int64))
+
+  def fingerprint(self) -> str:
+    """
+    Obtiene un hash del contenido de la columna. Se calcula una sola vez y se recalcula después de cualquier cambio.
+
+    :return: Hash hexadecimal de los índices y el número de filas.
+    """
+    if self._fingerprint is None:
+      digest = hashlib.blake2b(self._rows.tobytes(), digest_size=16)
+      digest.update(int(self._size).to_bytes(8, 'little'))
+      self._fingerprint = digest.hexdigest()
+    return self._fingerprint
+
+  def get(self, index: int) -> int:
+    """
+    Obtiene el valor de una fila con una búsqueda binaria en los índices.
+
+    :param index: Índice de la fila.
+    :return: 0 o 1.
+    """
+    if not 0 <= index < self._size:
+      raise IndexError("Índice de fila fuera de rango.")
+    position = np.searchsorted(self._rows, index)
+    return int(position < len(self._rows) and self._rows[position] == index)
+
+  def set(self, index: int, value: int):
+    """
+    Cambia el valor de una fila (en O(unos), ya que se inserta o se quita un índice).
+
+    :param index: Índice de la fila.
+    :param value: Nuevo valor (0 o 1).
+    """
+    if value not in (0, 1):
+      raise ValueError("El valor debe ser 0 o 1.")
+    if self.get(index) == value:
+      return
+    position = np.searchsorted(self._rows, index)
+    self._rows = np.insert(self._rows, position, index) if value else np.delete(self._rows, position)
+    self._fingerprint = None
+
+  def append(self, value: int):
+    """
+    Agrega una fila al final de la columna.
+
+    :param value: Valor de la nueva fila (0 o 1).
+    """
+    self._size += 1
+    self.set(self._size - 1, value)
+
+  def pop(self) -> int:
+    """
+    Elimina la última fila de la columna.
+
+    :return: Valor de la fila eliminada.
+    """
+    value = self.get(self._size - 1)
+    self.set(self._size - 1, 0)
+    self._size -= 1
+    return value
+
+  def __repr__(self):
+    return f"SparseColumn(name={self.name!r}, rows={self._size}, ones={len(self._rows)})"
+
+class CategoricalColumn:
+  """
+  Clase que representa una columna con valores categóricos (más de dos niveles), guardados como códigos enteros.
+  """
+  def __init__(self, name: str, values: list):
+    self.name = name
+    levels, codes = np.unique(np.asarray(values), return_inverse=True)
+    self._levels = levels.tolist()
+    self._codes = codes.astype(np.int32)
+    self._fingerprint = None
+
+  @classmethod
+  def from_codes(cls, name: str, codes: np.ndarray, levels: list) -> "CategoricalColumn":
+    """
+    Crea una columna a partir de códigos ya calculados.
+
+    :param name: Nombre de la columna.
+    :param codes: Arreglo de enteros, índices dentro de `levels`.
+    :param levels: Niveles de la columna.
+    :return: Nueva instancia de CategoricalColumn.
+    """
+    column = cls.__new__(cls)
+    column.name = name
+    column._levels = list(levels)
+    column._codes = np.asarray(codes, dtype=np.int32)
+    column._fingerprint = None
+    return column
+
+  def __len__(self) -> int:
+    return len(self._codes)
+
+  @property
+  def is_binary(self) -> bool:
+    return False
+
+  @property
+  def levels(self) -> list:
+    return list(self._levels)
+
+  @property
+  def codes(self) -> np.ndarray:
+    return self._codes
+
+  @property
+  def values(self) -> np.ndarray:
+    return np.asarray(self._levels, dtype=object)[self._codes]
+
+  def fingerprint(self) -> str:
+    """
+    Obtiene un hash del contenido de la columna (códigos y niveles).
+
+    :return: Hash hexadecimal.
+    """
+    if self._fingerprint is None:
+      digest = hashlib.blake2b(self._codes.tobytes(), digest_size=16)
+      digest.update(repr(self._levels).encode())
+      self._fingerprint = digest.hexdigest()
+    return self._fingerprint
+
+  def __repr__(self):
+    return f"CategoricalColumn(name={self.name!r}, rows={len(self)}, levels={len(self._levels)})"
 
 if __name__ == "__main__":
-  c = Column("Sample Column", [1, 2, 3, 4, 5])
+  c = Column("Sample Column", [1, 0, 1, 1, 0])
   print(f"Column Name: {c.name}")
-  print(f"Column Values: {c.values}")
\ No newline at end of file
+  print(f"Column Values: {c.values.tolist()}")
+  print(f"Packed bytes: {c.bits.nbytes}, ones: {c.count()}")
+  s = SparseColumn.from_column(c)
+  print(f"Sparse rows: {s.rows.tolist()}, ones in common: {s.and_count(c)}")
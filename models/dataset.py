@@ -0,0 +1,109 @@
+import json
+import os
+import numpy as np
+from typing import Callable, List, Optional
+from .column import Column
+from .importer import DEFAULT_CHUNK_ROWS, iter_chunks
+from .validation import to_binary, check_block
+from .instrumentation import instrumentation
+
+# Versión del formato de los datasets en disco
+DATASET_VERSION = 1
+
+# Archivo con los nombres de las columnas y el número de filas del dataset
+METADATA_FILE = 'dataset.json'
+
+def _bits_file(directory: str, index: int) -> str:
+  return os.path.join(directory, f'column_{index}.bits')
+
+def is_dataset(path: str) -> bool:
+  """
+  Indica si una ruta es la carpeta de un dataset en disco.
+
+  :param path: Ruta a revisar.
+  :return: True si la carpeta contiene los metadatos de un dataset.
+  """
+  return os.path.isfile(os.path.join(path, METADATA_FILE))
+
+@instrumentation.traced('dataset.create')
+def create_dataset(path: str, directory: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   progress: Optional[Callable[[int, Optional[int]], None]] = None) -> List[Column]:
+  """
+  Convierte un archivo .xlsx o .csv en un dataset en disco: un archivo de bits empaquetados por columna.
+  Cada bloque leído se valida, se empaqueta y se agrega al final de su archivo, por lo que la memoria usada
+  solo depende del tamaño del bloque y no del número de filas.
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :param directory: Carpeta donde se escribe el dataset (se crea si no existe).
+  :param chunk_rows: Número de filas por bloque (múltiplo de 8).
+  :param progress: Función opcional que recibe las filas leídas y el total estimado de filas.
+  :return: Columnas del dataset, mapeadas desde disco.
+  """
+  if chunk_rows % 8 != 0:
+    raise ValueError("El número de filas por bloque debe ser múltiplo de 8.")
+  os.makedirs(directory, exist_ok=True)
+  # Los metadatos se escriben al final; sin ellos la carpeta no se reconoce como dataset
+  if is_dataset(directory):
+    os.remove(os.path.join(directory, METADATA_FILE))
+
+  names = []
+  files = []
+  rows_read = 0
+  try:
+    for names, block, total in iter_chunks(path, chunk_rows):
+      if not files:
+        if len(set(names)) != len(names):
+          raise ValueError("El archivo contiene nombres de columnas repetidos.")
+        files = [open(_bits_file(directory, i), 'wb') for i in range(len(names))]
+
+      values, valid = to_binary(block)
+      check_block(block, valid, names, rows_read)
+      for col, file in enumerate(files):
+        file.write(np.packbits(values[:, col]).tobytes())
+      rows_read += len(block)
+      instrumentation.count('import.rows', len(block))
+      if progress:
+        progress(rows_read, total)
+  finally:
+    for file in files:
+      file.close()
+
+  with open(os.path.join(directory, METADATA_FILE), 'w', encoding='utf-8') as file:
+    json.dump({'version': DATASET_VERSION, 'names': names, 'rows': rows_read}, file, ensure_ascii=False)
+  return open_dataset(directory)
+
+def open_dataset(directory: str) -> List[Column]:
+  """
+  Abre un dataset en disco. Los bits de cada columna se mapean en memoria (solo lectura), así que el sistema
+  operativo los carga por partes a medida que se recorren y abrirlo no depende del número de filas.
+
+  :param directory: Carpeta del dataset.
+  :return: Columnas del dataset, mapeadas desde disco.
+  """
+  with open(os.path.join(directory, METADATA_FILE), encoding='utf-8') as file:
+    metadata = json.load(file)
+  if metadata.get('version') != DATASET_VERSION:
+    raise ValueError(f"Versión de dataset no soportada: {metadata.get('version')}")
+
+  rows = metadata['rows']
+  columns = []
+  for i, name in enumerate(metadata['names']):
+    if rows == 0:
+      bits = np.zeros(0, dtype=np.uint8)
+    else:
+      bits = np.memmap(_bits_file(directory, i), dtype=np.uint8, mode='r', shape=((rows + 7) // 8,))
+    columns.append(Column.from_packed(name, bits, rows))
+  return columns
+
+if __name__ == "__main__":
+  import tempfile
+  from .table import Table
+
+  with tempfile.TemporaryDirectory() as directory:
+    columns = create_dataset("src/PAN.xlsx", directory)
+    table = Table()
+    table.set_columns(open_dataset(directory))
+    table.selected_index_columns = [0, 1]
+    print(f"Columnas: {[column.name for column in table.columns]}, filas: {table.row_count}")
+    print(f"Tabla de contingencia: {table.get_contingency_table()}")
+    print(f"Chi-cuadrado: {table.calculate_chi_squared().statistic:.4f}")
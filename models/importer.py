@@ -0,0 +1,225 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from typing import Callable, Iterator, List, Optional, Tuple
+from .column import Column, CategoricalColumn
+from .instrumentation import instrumentation
+from .validation import InvalidDataError, ValidationErrors, to_binary, check_block
+
+# Filas leídas por bloque; debe ser múltiplo de 8 para poder concatenar los bits empaquetados
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+def iter_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[List[str], np.ndarray, Optional[int]]]:
+  """
+  Lee un archivo .xlsx o .csv por bloques de filas sin cargarlo completo en memoria.
+
+  :param path: Ruta del archivo.
+  :param chunk_rows: Número de filas por bloque.
+  :return: Iterador de tuplas con los nombres de las columnas, el bloque (filas x columnas) y el total
+           estimado de filas del archivo (None si no se conoce). Un archivo con encabezados y sin filas
+           produce un solo bloque vacío. Una fila con más celdas que encabezados lanza InvalidDataError; a las
+           filas más cortas se les agregan celdas vacías.
+  """
+  extension = os.path.splitext(path)[1].lower()
+  if extension == '.csv':
+    names = [str(name) for name in pd.read_csv(path, nrows=0).columns]
+    # Las filas se leen con una columna más que los encabezados, que recibe las celdas sobrantes de las filas más
+    # anchas: sin ella pandas las descartaría en silencio (al inicio de un bloque) o usaría la primera como índice
+    reader = pd.read_csv(path, chunksize=chunk_rows, header=None, skiprows=1,
+                         names=list(range(len(names) + 1)), index_col=False)
+    rows_read = 0
+    try:
+      for chunk in reader:
+        extra = chunk.iloc[:, -1].notna().to_numpy()
+        if extra.any():
+          raise _extra_cell_error(rows_read + int(np.argmax(extra)) + 2, len(names))
+        yield names, chunk.iloc[:, :-1].to_numpy(), None
+        rows_read += len(chunk)
+    except pd.errors.ParserError as error:
+      # Una fila con dos o más celdas de sobra no cabe ni en la columna extra
+      line = re.search(r"Expected \d+ fields in line (\d+)", str(error))
+      if line is None:
+        raise
+      raise _extra_cell_error(int(line.group(1)), len(names)) from error
+    return
+
+  from openpyxl import load_workbook
+  workbook = load_workbook(path, read_only=True, data_only=True)
+  try:
+    sheet = workbook.active
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+      return
+    # Las columnas sin encabezado se nombran por su posición
+    names = [str(name) if name is not None else f"Columna {i + 1}" for i, name in enumerate(header)]
+    total = sheet.max_row - 1 if sheet.max_row else None
+    buffer = []
+    blocks = 0
+    for line, row in enumerate(rows, start=2):
+      if len(row) != len(names):
+        # Sin las dimensiones de la hoja, openpyxl no rellena las filas hasta el mismo ancho
+        if any(value is not None for value in row[len(names):]):
+          raise _extra_cell_error(line, len(names))
+        row = (tuple(row) + (None,) * len(names))[:len(names)]
+      buffer.append(row)
+      if len(buffer) == chunk_rows:
+        yield names, np.array(buffer), total
+        buffer = []
+        blocks += 1
+    if buffer or blocks == 0:
+      # Un archivo con encabezados y sin filas produce un bloque vacío, para conservar los nombres de las columnas
+      yield names, np.array(buffer, dtype=object).reshape(len(buffer), len(names)), total
+  finally:
+    workbook.close()
+
+def _extra_cell_error(line: int, width: int) -> InvalidDataError:
+  # Error de una fila con más celdas que encabezados; `line` es la fila del archivo (el encabezado es la 1)
+  return InvalidDataError(
+    f"La fila {line} tiene más celdas que encabezados: la columna {width + 1} no tiene nombre.",
+    line - 2, f"Columna {width + 1}"
+  )
+
+def _category_values(column: np.ndarray, rows_read: int, name: str) -> Tuple[np.ndarray, np.ndarray]:
+  # Separa los valores de una columna categórica en números (NaN si la celda es texto) y texto (None si es un
+  # número), para que 1, 1.0 y '1' sean el mismo nivel sin importar cómo leyó pandas cada bloque
+  series = pd.Series(column, dtype=object)
+  booleans = series.map(type).isin((bool, np.bool_)).to_numpy()
+  numbers = pd.to_numeric(series.where(~booleans), errors='coerce').to_numpy(dtype=np.float64)
+  texts = np.full(len(column), None, dtype=object)
+  other = np.isnan(numbers) & ~series.isna().to_numpy()
+  texts[other] = series[other].astype(str).str.strip().to_numpy()
+  missing = np.isnan(numbers) & (pd.isna(texts) | (texts == ''))
+  if missing.any():
+    row = int(np.argmax(missing))
+    # +2 por la fila de encabezados y porque las filas del archivo empiezan en 1
+    raise InvalidDataError(
+      f"Celda vacía en la fila {rows_read + row + 2}, columna '{name}'. Las columnas categóricas no admiten celdas vacías.",
+      rows_read + row, name
+    )
+  return numbers, texts
+
+def _number_label(number: float) -> str:
+  # Texto de un nivel numérico: los enteros sin decimales, para que 5 y 5.0 den el mismo nivel
+  return str(int(number)) if float(number).is_integer() else repr(float(number))
+
+def category_labels(values: np.ndarray) -> np.ndarray:
+  """
+  Convierte valores leídos de un archivo en texto normalizado, igual que los niveles de las columnas categóricas:
+  5, 5.0 y ' 5 ' dan '5' aunque pandas haya leído cada bloque con otro tipo (por ejemplo, float si el bloque
+  tiene una celda vacía). Los valores lógicos y el texto no numérico solo pierden los espacios de los extremos.
+
+  :param values: Arreglo de valores sin celdas vacías.
+  :return: Arreglo de texto con la misma longitud.
+  """
+  series = pd.Series(values, dtype=object)
+  booleans = series.map(type).isin((bool, np.bool_)).to_numpy()
+  numbers = pd.to_numeric(series.where(~booleans), errors='coerce').to_numpy(dtype=np.float64)
+  labels = series.astype(str).str.strip().to_numpy(dtype=object)
+  # Los enteros se convierten de una vez; solo los números con decimales pasan uno por uno por `_number_label`
+  integral = np.isfinite(numbers) & (np.abs(numbers) < 2 ** 53) & (numbers == np.floor(numbers))
+  labels[integral] = numbers[integral].astype(np.int64).astype(str)
+  fractional = ~np.isnan(numbers) & ~integral
+  labels[fractional] = [_number_label(number) for number in numbers[fractional]]
+  return labels
+
+def _pack_block(block: np.ndarray, values: np.ndarray, valid: np.ndarray, names: List[str], parts: list,
+                raw_parts: list, rows_read: int):
+  # Agrega un bloque validado a las partes de cada columna: bits empaquetados o, si la columna dejó de ser
+  # binaria, sus valores normalizados (números y texto)
+  for col, column_parts in enumerate(parts):
+    if raw_parts[col] is None and valid[:, col].all():
+      column_parts.append(np.packbits(values[:, col]))
+      continue
+    if raw_parts[col] is None:
+      # Primer valor distinto de 0 o 1: las filas anteriores pasan de bits empaquetados a números 0 y 1
+      previous = np.unpackbits(np.concatenate(column_parts), count=rows_read) if column_parts else np.zeros(0, np.uint8)
+      raw_parts[col] = [(previous.astype(np.float64), np.full(rows_read, None, dtype=object))]
+    raw_parts[col].append(_category_values(block[:, col], rows_read, names[col]))
+
+def _categorical_column(name: str, raw: list) -> CategoricalColumn:
+  # Los niveles numéricos van primero y en orden numérico ('2' antes que '10'); los de texto, después y en orden
+  # alfabético. Los niveles se guardan como texto, con los números enteros sin decimales
+  numbers = np.concatenate([part[0] for part in raw])
+  texts = np.concatenate([part[1] for part in raw])
+  is_number = ~np.isnan(numbers)
+  number_levels = np.unique(numbers[is_number])
+  text_levels = np.unique(texts[~is_number].astype(str))
+  codes = np.empty(len(numbers), dtype=np.int32)
+  codes[is_number] = np.searchsorted(number_levels, numbers[is_number])
+  codes[~is_number] = len(number_levels) + np.searchsorted(text_levels, texts[~is_number].astype(str))
+  levels = [_number_label(level) for level in number_levels]
+  return CategoricalColumn.from_codes(name, codes, levels + text_levels.tolist())
+
+@instrumentation.traced('import')
+def import_columns(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                   categorical: bool = False, errors: Optional[ValidationErrors] = None) -> List[Column]:
+  """
+  Importa un archivo bloque por bloque, validando cada bloque y empaquetando sus bits en las columnas.
+  La importación se detiene en el primer bloque con un valor no válido, salvo que se acepten columnas categóricas
+  o que se recojan los errores.
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :param chunk_rows: Número de filas por bloque (múltiplo de 8).
+  :param progress: Función opcional que recibe las filas leídas y el total estimado de filas.
+  :param categorical: Si es True, las columnas con valores distintos de 0 o 1 se importan como CategoricalColumn
+                      (con sus valores como texto) en lugar de lanzar InvalidDataError; las celdas vacías de
+                      esas columnas sí lanzan InvalidDataError.
+  :param errors: Índice opcional donde se agregan las posiciones de los valores no válidos en lugar de lanzar
+                 InvalidDataError; esas celdas se importan como 0. No se usa si `categorical` es True.
+  :return: Lista de columnas importadas.
+  """
+  if chunk_rows % 8 != 0:
+    raise ValueError("El número de filas por bloque debe ser múltiplo de 8.")
+
+  names = []
+  parts = []
+  # Números y texto de las columnas que dejaron de ser binarias (None mientras sigan siendo binarias)
+  raw_parts = []
+  rows_read = 0
+  chunks = iter_chunks(path, chunk_rows)
+  while True:
+    # Lectura y conversión del archivo, medida aparte de la validación y el empaquetado
+    with instrumentation.span('import.parse'):
+      chunk = next(chunks, None)
+    if chunk is None:
+      break
+    names, block, total = chunk
+    if not parts:
+      if len(set(names)) != len(names):
+        raise ValueError("El archivo contiene nombres de columnas repetidos.")
+      parts = [[] for _ in names]
+      raw_parts = [None for _ in names]
+
+    with instrumentation.span('import.validate', rows=len(block)):
+      values, valid = to_binary(block)
+      if not categorical and errors is None:
+        check_block(block, valid, names, rows_read)
+      elif not categorical:
+        errors.names = names
+        errors.add(block, valid, rows_read)
+
+    with instrumentation.span('import.pack', rows=len(block)):
+      if categorical:
+        _pack_block(block, values, valid, names, parts, raw_parts, rows_read)
+      else:
+        for col, column_parts in enumerate(parts):
+          column_parts.append(np.packbits(values[:, col]))
+    rows_read += len(block)
+    instrumentation.count('import.rows', len(block))
+    instrumentation.count('import.cells', block.size)
+    if progress:
+      progress(rows_read, total)
+
+  return [
+    Column.from_packed(name, np.concatenate(column_parts), rows_read) if raw is None
+    else _categorical_column(name, raw)
+    for name, column_parts, raw in zip(names, parts, raw_parts)
+  ]
+
+if __name__ == "__main__":
+  columns = import_columns("src/PAN.xlsx", progress=lambda rows, total: print(f"Filas leídas: {rows}/{total}"))
+  for column in columns:
+    print(f"{column.name}: {len(column)} filas, {column.count()} unos")
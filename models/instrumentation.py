@@ -0,0 +1,218 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Optional
+
+# Variable de entorno con la ruta del archivo de traza; si está definida, la instrumentación se activa al iniciar
+TRACE_ENVIRONMENT_VARIABLE = 'MECHI_TRACE'
+
+class _NullSpan:
+  # Intervalo que no hace nada, usado mientras la instrumentación está desactivada
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    return False
+
+  def set(self, **args):
+    pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+  def __init__(self, instrumentation: "Instrumentation", name: str, args: dict):
+    self.instrumentation = instrumentation
+    self.name = name
+    self.args = args
+
+  def set(self, **args):
+    """
+    Agrega argumentos al intervalo (por ejemplo, el número de filas procesadas).
+    """
+    self.args.update(args)
+
+  def __enter__(self):
+    if self.instrumentation.memory and tracemalloc.is_tracing():
+      self.memory_start = tracemalloc.get_traced_memory()[0]
+      tracemalloc.reset_peak()
+    self.start = time.perf_counter_ns()
+    return self
+
+  def __exit__(self, *exc):
+    end = time.perf_counter_ns()
+    if self.instrumentation.memory and tracemalloc.is_tracing():
+      current, peak = tracemalloc.get_traced_memory()
+      self.args['memory_delta_bytes'] = current - self.memory_start
+      self.args['memory_peak_bytes'] = peak
+    self.instrumentation._add_event({
+      'name': self.name, 'ph': 'X', 'ts': self.instrumentation._timestamp(self.start),
+      'dur': (end - self.start) / 1000, 'pid': os.getpid(), 'tid': threading.get_ident(), 'args': self.args
+    })
+    return False
+
+class Instrumentation:
+  """
+  Registro de intervalos de tiempo con nombre, contadores e instantáneas de memoria de las etapas del programa.
+  Se activa y desactiva en tiempo de ejecución; desactivada, cada intervalo solo cuesta una comparación.
+  La traza se exporta en el formato JSON de eventos de Chrome (se abre en chrome://tracing o en Perfetto).
+  """
+
+  def __init__(self):
+    self.enabled = False
+    self.memory = False
+    self.counters = defaultdict(int)
+    self._events = []
+    self._lock = threading.Lock()
+    self._origin = time.perf_counter_ns()
+
+  def enable(self, memory: bool = False):
+    """
+    Activa la instrumentación.
+
+    :param memory: Si es True, también registra el uso de memoria de cada intervalo con tracemalloc (más lento).
+    """
+    self.enabled = True
+    self.memory = memory
+    if memory and not tracemalloc.is_tracing():
+      tracemalloc.start()
+
+  def disable(self):
+    """
+    Desactiva la instrumentación, conservando los eventos registrados.
+    """
+    self.enabled = False
+    if self.memory and tracemalloc.is_tracing():
+      tracemalloc.stop()
+    self.memory = False
+
+  def reset(self):
+    """
+    Borra los eventos y contadores registrados.
+    """
+    with self._lock:
+      self._events = []
+      self.counters = defaultdict(int)
+      self._origin = time.perf_counter_ns()
+
+  def _timestamp(self, nanoseconds: int) -> float:
+    # Microsegundos desde el inicio de la traza
+    return (nanoseconds - self._origin) / 1000
+
+  def _add_event(self, event: dict):
+    with self._lock:
+      self._events.append(event)
+
+  def span(self, name: str, **args):
+    """
+    Crea un intervalo de tiempo con nombre para usar con `with`.
+
+    :param name: Nombre de la etapa, por ejemplo 'import.parse'.
+    :param args: Datos adicionales que se guardan con el intervalo.
+    :return: Administrador de contexto del intervalo.
+    """
+    if not self.enabled:
+      return _NULL_SPAN
+    return _Span(self, name, args)
+
+  def traced(self, name: str):
+    """
+    Decorador que registra cada llamada a la función como un intervalo.
+
+    :param name: Nombre del intervalo.
+    """
+    def decorator(function):
+      @functools.wraps(function)
+      def wrapper(*args, **kwargs):
+        if not self.enabled:
+          return function(*args, **kwargs)
+        with _Span(self, name, {}):
+          return function(*args, **kwargs)
+      return wrapper
+    return decorator
+
+  def count(self, name: str, value: int = 1):
+    """
+    Suma un valor a un contador (por ejemplo filas, celdas o pares procesados).
+
+    :param name: Nombre del contador.
+    :param value: Valor a sumar.
+    """
+    if not self.enabled:
+      return
+    with self._lock:
+      self.counters[name] += int(value)
+      total = self.counters[name]
+    self._add_event({
+      'name': name, 'ph': 'C', 'ts': self._timestamp(time.perf_counter_ns()),
+      'pid': os.getpid(), 'tid': threading.get_ident(), 'args': {name: total}
+    })
+
+  def snapshot_memory(self, label: str):
+    """
+    Registra el uso de memoria actual y el pico desde la última instantánea (requiere `enable(memory=True)`).
+
+    :param label: Nombre de la instantánea.
+    """
+    if not self.enabled or not tracemalloc.is_tracing():
+      return
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    self._add_event({
+      'name': label, 'ph': 'C', 'ts': self._timestamp(time.perf_counter_ns()),
+      'pid': os.getpid(), 'tid': threading.get_ident(), 'args': {'current_bytes': current, 'peak_bytes': peak}
+    })
+
+  def to_dict(self) -> dict:
+    """
+    Obtiene la traza registrada.
+
+    :return: Diccionario con los eventos en formato de Chrome y los totales de los contadores.
+    """
+    with self._lock:
+      return {'traceEvents': list(self._events), 'displayTimeUnit': 'ms', 'counters': dict(self.counters)}
+
+  def summary(self) -> dict:
+    """
+    Resume los intervalos registrados por nombre.
+
+    :return: Diccionario que asocia cada nombre con el número de llamadas y el tiempo total en segundos.
+    """
+    totals = defaultdict(lambda: {'calls': 0, 'seconds': 0.0})
+    for event in self.to_dict()['traceEvents']:
+      if event['ph'] == 'X':
+        totals[event['name']]['calls'] += 1
+        totals[event['name']]['seconds'] += event['dur'] / 1e6
+    return dict(totals)
+
+  def export(self, path: str):
+    """
+    Guarda la traza en un archivo JSON.
+
+    :param path: Ruta del archivo.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+      json.dump(self.to_dict(), file, ensure_ascii=False)
+
+# Instrumentación compartida por todo el programa
+instrumentation = Instrumentation()
+
+def _enable_from_environment(path: Optional[str]):
+  if path:
+    instrumentation.enable(memory=os.environ.get(f'{TRACE_ENVIRONMENT_VARIABLE}_MEMORY') == '1')
+    atexit.register(instrumentation.export, path)
+
+_enable_from_environment(os.environ.get(TRACE_ENVIRONMENT_VARIABLE))
+
+if __name__ == "__main__":
+  instrumentation.enable(memory=True)
+  with instrumentation.span('demo.suma', elementos=10**5):
+    total = sum(range(10**5))
+  instrumentation.count('demo.filas', 10**5)
+  instrumentation.snapshot_memory('demo.memoria')
+  print(instrumentation.summary())
+  print(instrumentation.to_dict()['counters'])
@@ -0,0 +1,80 @@
+import numpy as np
+from typing import Dict, Sequence
+
+# Medidas que calcula `rule_metrics`
+RULE_METRICS = ('coverage', 'confidence', 'dependency_factor', 'leverage', 'conviction')
+
+def rule_counts(observed: np.ndarray, both_directions: bool = True) -> Dict[str, np.ndarray]:
+  """
+  Obtiene las frecuencias de todas las reglas "Si (A=a) entonces B=b" de tablas de contingencia apiladas.
+  Las reglas siguen el orden de `Table.get_rules`: primero A -> B recorriendo las celdas por filas y después
+  B -> A recorriendo las celdas por columnas.
+
+  :param observed: Frecuencias observadas (... x r x c), por ejemplo (k x k x 2 x 2) para todos los pares.
+  :param both_directions: Si es False, solo se generan las reglas A -> B.
+  :return: Diccionario con las frecuencias de cada regla ('count'), de su antecedente ('antecedent_count') y de
+           su consecuente ('consequent_count'), de forma (... x 2rc) o (... x rc), y el total de filas (...).
+  """
+  observed = np.asarray(observed, dtype=np.int64)
+  shape, (r, c) = observed.shape[:-2], observed.shape[-2:]
+  rows = observed.sum(axis=-1)
+  cols = observed.sum(axis=-2)
+  total = rows.sum(axis=-1)
+
+  count = [observed.reshape(shape + (r * c,))]
+  antecedent = [np.broadcast_to(rows[..., :, None], shape + (r, c)).reshape(shape + (r * c,))]
+  consequent = [np.broadcast_to(cols[..., None, :], shape + (r, c)).reshape(shape + (r * c,))]
+  if both_directions:
+    count.append(np.swapaxes(observed, -1, -2).reshape(shape + (c * r,)))
+    antecedent.append(np.broadcast_to(cols[..., :, None], shape + (c, r)).reshape(shape + (c * r,)))
+    consequent.append(np.broadcast_to(rows[..., None, :], shape + (c, r)).reshape(shape + (c * r,)))
+  return {
+    'count': np.concatenate(count, axis=-1),
+    'antecedent_count': np.concatenate(antecedent, axis=-1),
+    'consequent_count': np.concatenate(consequent, axis=-1),
+    'total': total
+  }
+
+def rule_metrics(observed: np.ndarray, metrics: Sequence[str] = RULE_METRICS,
+                 both_directions: bool = True) -> Dict[str, np.ndarray]:
+  """
+  Calcula en una sola llamada las medidas de todas las reglas de tablas de contingencia apiladas, con fórmulas
+  cerradas sobre las frecuencias (sin recorrer pares ni reglas en Python):
+
+  - cobertura: n(A y B) / N
+  - confianza: n(A y B) / n(A)
+  - factor de dependencia (lift): n(A y B) N / (n(A) n(B))
+  - apalancamiento (leverage): P(A y B) - P(A) P(B)
+  - convicción: (1 - P(B)) / (1 - confianza), infinita si la confianza es 1
+
+  :param observed: Frecuencias observadas (... x r x c), por ejemplo (k x k x 2 x 2) para todos los pares.
+  :param metrics: Nombres de las medidas a calcular (ver RULE_METRICS).
+  :param both_directions: Si es False, solo se calculan las reglas A -> B (ver `rule_counts`).
+  :return: Diccionario con las frecuencias de `rule_counts` y un arreglo (... x 2rc) por cada medida pedida.
+  """
+  result = rule_counts(observed, both_directions)
+  count = result['count'].astype(np.float64)
+  antecedent = result['antecedent_count'].astype(np.float64)
+  consequent = result['consequent_count'].astype(np.float64)
+  total = result['total'][..., None].astype(np.float64)
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    coverage = np.where(total != 0, count / total, 0.0)
+    confidence = np.where(antecedent != 0, count / antecedent, 0.0)
+    if 'coverage' in metrics:
+      result['coverage'] = coverage
+    if 'confidence' in metrics:
+      result['confidence'] = confidence
+    if 'dependency_factor' in metrics:
+      result['dependency_factor'] = np.where(antecedent * consequent != 0, count * total / (antecedent * consequent), 0.0)
+    if 'leverage' in metrics:
+      result['leverage'] = np.where(total != 0, coverage - antecedent * consequent / (total * total), 0.0)
+    if 'conviction' in metrics:
+      probability = np.where(total != 0, consequent / total, 0.0)
+      result['conviction'] = np.where(confidence < 1, (1 - probability) / (1 - confidence), np.inf)
+  return result
+
+if __name__ == "__main__":
+  observed = np.array([[[3, 1], [2, 4]], [[5, 0], [1, 2]]])
+  for name, values in rule_metrics(observed).items():
+    print(f"{name}: {np.round(values, 3).tolist()}")
@@ -0,0 +1,160 @@
+import itertools
+import math
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .column import Column
+from .significance import chi2_sf
+from .results import RuleResult
+
+# Máximo de bytes empaquetados que se intersectan a la vez al contar candidatos
+BATCH_BYTES = 1 << 25
+
+def frequent_itemsets(columns: List[Column], min_support: float, max_length: Optional[int] = None,
+                      co_occurrence: Optional[np.ndarray] = None) -> Dict[Tuple[int, ...], int]:
+  """
+  Encuentra todos los conjuntos de ítems frecuentes con el algoritmo Apriori sobre los bits empaquetados.
+
+  Cada nivel se genera uniendo conjuntos del nivel anterior que comparten todos sus ítems salvo el último y
+  se descartan los candidatos con algún subconjunto no frecuente. La frecuencia de un candidato es el popcount
+  del AND entre los bits de su conjunto padre (guardados del nivel anterior) y los de su último ítem.
+
+  :param columns: Columnas binarias con el mismo número de filas.
+  :param min_support: Soporte mínimo, como fracción del total de filas (0 a 1).
+  :param max_length: Tamaño máximo de los conjuntos (sin límite por defecto).
+  :param co_occurrence: Matriz de co-ocurrencia ya calculada; si se da, los pares se cuentan sin intersectar bits.
+  :return: Diccionario que asocia cada conjunto frecuente (tupla ordenada de índices de columna) con su frecuencia.
+  """
+  if not columns:
+    return {}
+  total = len(columns[0])
+  min_count = max(1, math.ceil(min_support * total))
+  counts = np.diagonal(co_occurrence) if co_occurrence is not None else np.array([column.count() for column in columns])
+  level = [(i,) for i in range(len(columns)) if counts[i] >= min_count]
+  # Solo se empaquetan los ítems frecuentes (las columnas dispersas generan sus bits al pedirlos); `slots`
+  # indica la fila de `packed` de cada columna
+  packed = np.stack([columns[items[0]].bits for items in level]) if level else np.zeros((0, (total + 7) // 8), dtype=np.uint8)
+  slots = np.full(len(columns), -1, dtype=np.int64)
+  slots[[items[0] for items in level]] = np.arange(len(level))
+  level_bits = packed
+  itemsets = {items: int(counts[items[0]]) for items in level}
+
+  length = 1
+  while len(level) > 1 and (max_length is None or length < max_length):
+    positions = {items: position for position, items in enumerate(level)}
+
+    # Unir conjuntos con el mismo prefijo y podar los que tienen algún subconjunto no frecuente
+    parents, last_items, candidates = [], [], []
+    for _, group in itertools.groupby(range(len(level)), key=lambda position: level[position][:-1]):
+      group = list(group)
+      for a, b in itertools.combinations(group, 2):
+        candidate = level[a] + (level[b][-1],)
+        if all(candidate[:i] + candidate[i + 1:] in positions for i in range(length - 1)):
+          parents.append(a)
+          last_items.append(candidate[-1])
+          candidates.append(candidate)
+    if not candidates:
+      break
+    parents = np.array(parents)
+    last_items = np.array(last_items)
+
+    next_level, next_bits = [], []
+    need_bits = max_length is None or length + 1 < max_length
+    if length == 1 and co_occurrence is not None:
+      # Los pares salen directamente de la matriz de co-ocurrencia
+      candidate_counts = co_occurrence[[items[0] for items in level], :][parents, last_items]
+      frequent = np.flatnonzero(candidate_counts >= min_count)
+      next_level = [candidates[i] for i in frequent]
+      if need_bits:
+        next_bits = [level_bits[parents[frequent]] & packed[slots[last_items[frequent]]]]
+      for i in frequent:
+        itemsets[candidates[i]] = int(candidate_counts[i])
+    else:
+      batch = max(1, BATCH_BYTES // max(packed.shape[1], 1))
+      for start in range(0, len(candidates), batch):
+        block = level_bits[parents[start:start + batch]] & packed[slots[last_items[start:start + batch]]]
+        candidate_counts = np.bitwise_count(block).sum(axis=1, dtype=np.int64)
+        frequent = np.flatnonzero(candidate_counts >= min_count)
+        for i in frequent:
+          itemsets[candidates[start + i]] = int(candidate_counts[i])
+          next_level.append(candidates[start + i])
+        if need_bits:
+          next_bits.append(block[frequent])
+
+    level = next_level
+    level_bits = np.concatenate(next_bits) if next_bits else np.zeros((0, packed.shape[1]), dtype=np.uint8)
+    length += 1
+
+  return itemsets
+
+def association_rules(itemsets: Dict[Tuple[int, ...], int], names: List[str], total: int,
+                      min_confidence: float = 0.0) -> List[RuleResult]:
+  """
+  Genera las reglas "Si (antecedente) entonces consecuente" de todos los conjuntos frecuentes de 2 o más ítems.
+  Cada regla se evalúa con la tabla 2x2 entre "se cumple el antecedente" y "se cumple el consecuente".
+
+  :param itemsets: Conjuntos frecuentes, como los retorna `frequent_itemsets`.
+  :param names: Nombres de las columnas.
+  :param total: Total de filas.
+  :param min_confidence: Confianza mínima (0 a 1).
+  :return: Lista de reglas ordenadas de mayor a menor confianza (y frecuencia), con sus frecuencias, chi-cuadrado,
+           valor p y factor de dependencia.
+  """
+  antecedents, consequents, both, first, second = [], [], [], [], []
+  for items, count in itemsets.items():
+    for size in range(1, len(items)):
+      for antecedent in itertools.combinations(items, size):
+        consequent = tuple(item for item in items if item not in antecedent)
+        # Todo subconjunto de un conjunto frecuente también es frecuente, así que sus frecuencias ya están
+        antecedents.append(antecedent)
+        consequents.append(consequent)
+        both.append(count)
+        first.append(itemsets[antecedent])
+        second.append(itemsets[consequent])
+  if not antecedents:
+    return []
+
+  both = np.array(both, dtype=np.int64)
+  first = np.array(first, dtype=np.int64)
+  second = np.array(second, dtype=np.int64)
+  confidence = both / first
+  keep = np.flatnonzero(confidence >= min_confidence)
+  both, first, second, confidence = both[keep], first[keep], second[keep], confidence[keep]
+
+  observed = np.stack([
+    np.stack([both, first - both], axis=-1),
+    np.stack([second - both, total - first - second + both], axis=-1)
+  ], axis=-2)
+  # Forma cerrada del chi-cuadrado de una tabla 2x2: N (ad - bc)^2 / (producto de los totales marginales)
+  # Los productos de cuatro frecuencias desbordan int64 con unas 2e5 filas, así que se calculan en float64
+  cells = observed.astype(np.float64)
+  first_f, second_f = first.astype(np.float64), second.astype(np.float64)
+  margins = first_f * (total - first_f) * second_f * (total - second_f)
+  determinant = cells[:, 0, 0] * cells[:, 1, 1] - cells[:, 0, 1] * cells[:, 1, 0]
+  with np.errstate(divide='ignore', invalid='ignore'):
+    chi_squared = np.where(margins != 0, total * determinant ** 2 / margins, 0.0)
+    dependency_factor = np.where(first_f * second_f != 0, both * total / (first_f * second_f), 0.0)
+  p_value = chi2_sf(chi_squared, 1)
+
+  # Orden estable por confianza y luego por frecuencia, de mayor a menor
+  order = np.lexsort((-both, -confidence))
+  rules = []
+  for position in order.tolist():
+    rule = keep[position]
+    rules.append(RuleResult(
+      tuple((names[i], 1) for i in antecedents[rule]), tuple((names[i], 1) for i in consequents[rule]),
+      int(both[position]), int(first[position]), int(second[position]), total,
+      float(chi_squared[position]), float(p_value[position]), float(dependency_factor[position])
+    ))
+  return rules
+
+if __name__ == "__main__":
+  columns = [
+    Column('Pan', [1, 1, 1, 1, 0, 1, 0, 1]),
+    Column('Leche', [1, 1, 0, 1, 1, 1, 0, 1]),
+    Column('Huevo', [1, 0, 0, 1, 0, 1, 1, 1]),
+  ]
+  itemsets = frequent_itemsets(columns, min_support=0.3)
+  print(f"Conjuntos frecuentes: {itemsets}")
+  for rule in association_rules(itemsets, [column.name for column in columns], 8, min_confidence=0.6):
+    print(f"{rule.rule}: Confianza = {rule.confidence*100:.2f}%, X^2 = {rule.chi_squared:.4f}, "
+          f"FD = {rule.dependency_factor:.3f}")
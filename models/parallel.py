@@ -0,0 +1,126 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+# Celdas (filas x columnas) desempaquetadas a la vez al calcular co-ocurrencias
+CO_OCCURRENCE_BLOCK_CELLS = 1 << 25
+
+# Filas máximas por bloque: float32 representa exactamente todos los enteros hasta 2^24, así que los conteos
+# (y las sumas parciales del producto) de un bloque con como máximo 2^24 filas son exactos
+FLOAT32_EXACT_ROWS = 1 << 24
+
+# Filas mínimas por fragmento; con menos filas iniciar los procesos cuesta más que el conteo
+MIN_SHARD_ROWS = 1 << 22
+
+# Pares de ítems de una misma fila contados a la vez por `sparse_co_occurrence`
+SPARSE_BATCH_PAIRS = 1 << 24
+
+def count_co_occurrence(bits: List[np.ndarray]) -> np.ndarray:
+  """
+  Calcula la matriz de co-ocurrencia (X^T X) de columnas binarias empaquetadas en una sola pasada.
+  Las filas se desempaquetan por bloques para que la memoria usada no dependa del número de filas.
+
+  :param bits: Bits empaquetados de cada columna, todos de la misma longitud.
+  :return: Matriz de co-ocurrencia (k x k).
+  """
+  k = len(bits)
+  co_occurrence = np.zeros((k, k), dtype=np.int64)
+  if k == 0:
+    return co_occurrence
+  block_bytes = max(1, min(CO_OCCURRENCE_BLOCK_CELLS // (8 * k), FLOAT32_EXACT_ROWS // 8))
+  for start in range(0, len(bits[0]), block_bytes):
+    # Solo se apila el bloque actual, así que las columnas mapeadas desde disco nunca se cargan completas;
+    # el bloque tiene como máximo FLOAT32_EXACT_ROWS filas, así que el producto en float32 es exacto
+    packed = np.stack([column_bits[start:start + block_bytes] for column_bits in bits])
+    block = np.unpackbits(packed, axis=1).astype(np.float32)
+    co_occurrence += (block @ block.T).astype(np.int64)
+  return co_occurrence
+
+def _describe_shard(bits: np.ndarray, start: int, stop: int):
+  # Los bits mapeados desde disco se envían como (archivo, desplazamiento, longitud) para que cada proceso
+  # los mapee por su cuenta en lugar de copiarlos; `bits` debe empezar al inicio de su np.memmap
+  if isinstance(bits, np.memmap) and bits.filename:
+    return bits.filename, bits.offset + start, stop - start
+  return bits[start:stop]
+
+def _count_shard(shard: list) -> np.ndarray:
+  bits = [
+    np.memmap(part[0], dtype=np.uint8, mode='r', offset=part[1], shape=(part[2],)) if isinstance(part, tuple) else part
+    for part in shard
+  ]
+  return count_co_occurrence(bits)
+
+def parallel_co_occurrence(bits: List[np.ndarray], workers: Optional[int] = None) -> np.ndarray:
+  """
+  Calcula la matriz de co-ocurrencia repartiendo las filas en fragmentos entre un pool de procesos.
+  Cada proceso cuenta las co-ocurrencias de su fragmento y las matrices parciales se suman al final; como
+  el conteo es una suma sobre filas, el resultado es idéntico al de `count_co_occurrence`.
+
+  :param bits: Bits empaquetados de cada columna, todos de la misma longitud.
+  :param workers: Procesos a usar (por defecto, el número de CPUs).
+  :return: Matriz de co-ocurrencia (k x k).
+  """
+  if not bits:
+    return count_co_occurrence(bits)
+  total_bytes = len(bits[0])
+  workers = workers or os.cpu_count() or 1
+  shards = min(workers, total_bytes * 8 // MIN_SHARD_ROWS)
+  if shards <= 1:
+    return count_co_occurrence(bits)
+
+  # Los límites de los fragmentos caen en bytes completos, es decir, en múltiplos de 8 filas
+  bounds = np.linspace(0, total_bytes, shards + 1).astype(np.int64)
+  tasks = [[_describe_shard(column_bits, int(start), int(stop)) for column_bits in bits]
+           for start, stop in zip(bounds[:-1], bounds[1:])]
+  with ProcessPoolExecutor(max_workers=shards) as pool:
+    return sum(pool.map(_count_shard, tasks))
+
+def sparse_co_occurrence(rows: List[np.ndarray], size: int) -> np.ndarray:
+  """
+  Calcula la matriz de co-ocurrencia (X^T X) de columnas dispersas, dadas por los índices ordenados de sus filas
+  con valor 1. Las entradas se agrupan por fila y cada par de ítems presentes en la misma fila suma 1 a su celda
+  con un `bincount`, así que el costo depende de la suma de (ítems por fila)^2 y no de filas x columnas.
+
+  :param rows: Índices ordenados de las filas con valor 1 de cada columna.
+  :param size: Número de filas de las columnas.
+  :return: Matriz de co-ocurrencia (k x k).
+  """
+  k = len(rows)
+  lengths = np.array([len(column_rows) for column_rows in rows], dtype=np.int64)
+  upper = np.zeros(k * k, dtype=np.int64)
+  if lengths.sum() > 0:
+    # Entradas (fila, ítem) ordenadas por fila; dentro de cada fila los ítems quedan en orden creciente
+    row_ids = np.concatenate(rows).astype(np.int64)
+    order = np.argsort(row_ids, kind='stable')
+    items = np.repeat(np.arange(k, dtype=np.int64), lengths)[order]
+    row_ids = row_ids[order]
+    starts = np.flatnonzero(np.concatenate(([True], row_ids[1:] != row_ids[:-1])))
+    ends = np.concatenate((starts[1:], [len(row_ids)]))
+    # Cada entrada forma un par con cada una de las entradas siguientes de su misma fila
+    partners = np.repeat(ends, ends - starts) - np.arange(len(items)) - 1
+    pair_ends = np.cumsum(partners)
+    batch_pairs = max(SPARSE_BATCH_PAIRS, k * k)
+    start = 0
+    while start < len(items):
+      done = pair_ends[start - 1] if start else 0
+      stop = max(start + 1, int(np.searchsorted(pair_ends, done + batch_pairs, side='right')))
+      counts = partners[start:stop]
+      offsets = np.cumsum(counts) - counts
+      # El compañero del par t de la entrada e está en la posición e + 1 + (t - desplazamiento de e)
+      partner = np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(np.arange(start, stop) + 1 - offsets, counts)
+      upper += np.bincount(np.repeat(items[start:stop], counts) * k + items[partner], minlength=k * k)
+      start = stop
+  upper = upper.reshape(k, k)
+  co_occurrence = upper + upper.T
+  co_occurrence[np.diag_indices(k)] = lengths
+  return co_occurrence
+
+if __name__ == "__main__":
+  import time
+  rng = np.random.default_rng(0)
+  bits = [rng.integers(0, 256, 1 << 24, dtype=np.uint8) for _ in range(16)]
+  for name, function in (("Un proceso", count_co_occurrence), ("Por fragmentos", parallel_co_occurrence)):
+    start = time.perf_counter()
+    co_occurrence = function(bits)
+    print(f"{name}: {time.perf_counter() - start:.2f} s, suma = {co_occurrence.sum()}")
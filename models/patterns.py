@@ -0,0 +1,109 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Máximo de columnas para las que se guarda el histograma de patrones (2^8 = 256 patrones)
+MAX_PATTERN_COLUMNS = 8
+
+# Bytes empaquetados por columna que se codifican a la vez, para que la memoria usada no dependa del número de filas
+PATTERN_BLOCK_BYTES = 1 << 20
+
+def pattern_code(values: Sequence[int]) -> int:
+  """
+  Codifica los valores de una fila como un entero: la columna i aporta el bit i.
+
+  :param values: Valores (0 o 1) de la fila, uno por columna.
+  :return: Patrón de la fila (0 a 2^k - 1).
+  """
+  return sum(int(value) << i for i, value in enumerate(values))
+
+def pattern_histogram(bits: List[np.ndarray], size: int) -> np.ndarray:
+  """
+  Cuenta cuántas filas tienen cada patrón de valores. Cada fila se codifica como un entero de k bits y todas se
+  cuentan con un solo `bincount` por bloque; el histograma es un estadístico suficiente de la tabla, así que
+  cualquier tabla de contingencia o conteo de conjuntos de columnas sale de él en O(2^k).
+
+  :param bits: Bits empaquetados de cada columna (como Column.bits), como máximo MAX_PATTERN_COLUMNS.
+  :param size: Número de filas.
+  :return: Arreglo de 2^k enteros con la frecuencia de cada patrón.
+  """
+  k = len(bits)
+  if k > MAX_PATTERN_COLUMNS:
+    raise ValueError(f"El histograma de patrones admite como máximo {MAX_PATTERN_COLUMNS} columnas.")
+  histogram = np.zeros(1 << k, dtype=np.int64)
+  for start in range(0, (size + 7) // 8, PATTERN_BLOCK_BYTES):
+    rows = min(size - start * 8, PATTERN_BLOCK_BYTES * 8)
+    codes = np.zeros(rows, dtype=np.uint8)
+    for i, column_bits in enumerate(bits):
+      codes |= np.unpackbits(column_bits[start:start + PATTERN_BLOCK_BYTES], count=rows) << np.uint8(i)
+    histogram += np.bincount(codes, minlength=1 << k)
+  return histogram
+
+def _pattern_bits(k: int) -> np.ndarray:
+  # Matriz (2^k x k) con el valor de cada columna en cada patrón
+  return (np.arange(1 << k)[:, None] >> np.arange(k)) & 1
+
+def pattern_co_occurrence(histogram: np.ndarray) -> np.ndarray:
+  """
+  Calcula la matriz de co-ocurrencia (X^T X) a partir del histograma de patrones, en O(2^k k^2).
+
+  :param histogram: Histograma de patrones de k columnas.
+  :return: Matriz de co-ocurrencia (k x k).
+  """
+  k = len(histogram).bit_length() - 1
+  pattern_bits = _pattern_bits(k)
+  return (pattern_bits.T * histogram) @ pattern_bits
+
+def remove_pattern_column(histogram: np.ndarray, index: int) -> np.ndarray:
+  """
+  Elimina una columna del histograma sumando los patrones que solo se distinguen en ella.
+
+  :param histogram: Histograma de patrones de k columnas.
+  :param index: Índice de la columna a eliminar.
+  :return: Histograma de patrones de las k - 1 columnas restantes.
+  """
+  k = len(histogram).bit_length() - 1
+  return histogram.reshape(1 << (k - 1 - index), 2, 1 << index).sum(axis=1).ravel()
+
+def itemset_counts(histogram: np.ndarray) -> np.ndarray:
+  """
+  Cuenta, para cada conjunto de columnas (codificado como un patrón), las filas en las que todas valen 1.
+  Es la suma sobre los patrones que lo contienen, que se calcula columna por columna en O(k 2^k).
+
+  :param histogram: Histograma de patrones de k columnas.
+  :return: Arreglo de 2^k enteros; la posición 0 (conjunto vacío) es el total de filas.
+  """
+  k = len(histogram).bit_length() - 1
+  counts = histogram.astype(np.int64)
+  for i in range(k):
+    # Cada bloque de 2^(i+1) patrones tiene primero los que no contienen la columna i y luego los que sí
+    view = counts.reshape(-1, 2, 1 << i)
+    view[:, 0, :] += view[:, 1, :]
+  return counts
+
+def pattern_itemsets(histogram: np.ndarray, min_count: int,
+                     max_length: Optional[int] = None) -> Dict[Tuple[int, ...], int]:
+  """
+  Obtiene todos los conjuntos de columnas frecuentes a partir del histograma, en el mismo orden que
+  `mining.frequent_itemsets` (por tamaño y luego en orden lexicográfico).
+
+  :param histogram: Histograma de patrones de k columnas.
+  :param min_count: Frecuencia mínima de un conjunto.
+  :param max_length: Tamaño máximo de los conjuntos (sin límite por defecto).
+  :return: Diccionario que asocia cada conjunto frecuente (tupla ordenada de índices de columna) con su frecuencia.
+  """
+  k = len(histogram).bit_length() - 1
+  counts = itemset_counts(histogram)
+  pattern_bits = _pattern_bits(k).astype(bool)
+  lengths = pattern_bits.sum(axis=1)
+  masks = np.flatnonzero((counts >= min_count) & (lengths > 0) & (lengths <= (max_length or k)))
+  itemsets = sorted(tuple(np.flatnonzero(pattern_bits[mask]).tolist()) for mask in masks)
+  itemsets.sort(key=len)
+  return {items: int(counts[sum(1 << i for i in items)]) for items in itemsets}
+
+if __name__ == "__main__":
+  rng = np.random.default_rng(0)
+  values = rng.integers(0, 2, (3, 20), dtype=np.uint8)
+  histogram = pattern_histogram([np.packbits(column) for column in values], 20)
+  print(f"Histograma: {histogram.tolist()}")
+  print(f"Co-ocurrencias:\n{pattern_co_occurrence(histogram)}")
+  print(f"Conjuntos frecuentes: {pattern_itemsets(histogram, 3)}")
@@ -0,0 +1,87 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Número máximo de valores muestreados a la vez por cada proceso (permutaciones x pares)
+BATCH_CELLS = 1 << 22
+
+# Tolerancia relativa al comparar estadísticos permutados con el observado
+STATISTIC_TOLERANCE = 1e-9
+
+def _count_extreme(seed: np.random.SeedSequence, n_permutations: int, ones_second: np.ndarray,
+                   zeros_second: np.ndarray, ones_first: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+  """
+  Cuenta, para cada par, cuántas permutaciones dan un estadístico al menos tan extremo como el observado.
+  Se ejecuta en un proceso del pool con su propia semilla.
+
+  :return: Arreglo con el número de permutaciones extremas por par.
+  """
+  rng = np.random.default_rng(seed)
+  pairs = len(threshold)
+  expected = ones_first * ones_second / np.maximum(ones_second + zeros_second, 1)
+  batch = max(1, BATCH_CELLS // max(pairs, 1))
+  extreme = np.zeros(pairs, dtype=np.int64)
+  done = 0
+  while done < n_permutations:
+    size = min(batch, n_permutations - done)
+    both = rng.hypergeometric(ones_second, zeros_second, ones_first, size=(size, pairs))
+    extreme += (np.abs(both - expected) >= threshold).sum(axis=0)
+    done += size
+  return extreme
+
+def permutation_p_values(observed, n_permutations: int = 10000, workers: Optional[int] = None,
+                         seed: Optional[int] = None) -> np.ndarray:
+  """
+  Calcula valores p empíricos de independencia barajando una columna de cada par.
+
+  Barajar una columna conserva sus totales, así que la celda [1, 1] de cada permutación sigue exactamente
+  una distribución hipergeométrica; se muestrea directamente de ella, lo que equivale a barajar pero
+  cuesta O(1) por permutación en lugar de O(filas). Con márgenes fijos el chi-cuadrado solo depende de
+  |n11 - esperado|, por lo que ese es el estadístico comparado. Las permutaciones se reparten en un pool
+  de procesos, cada uno con una semilla derivada de `seed`, de modo que el resultado es reproducible.
+
+  :param observed: Arreglo (..., 2, 2) de tablas observadas [[n11, n10], [n01, n00]].
+  :param n_permutations: Número de permutaciones por par.
+  :param workers: Procesos a usar (por defecto, el número de CPUs; 1 calcula en el proceso actual).
+  :param seed: Semilla para reproducir los resultados.
+  :return: Arreglo (...) de valores p empíricos, (1 + extremas) / (1 + permutaciones).
+  """
+  observed = np.asarray(observed, dtype=np.int64)
+  shape = observed.shape[:-2]
+  observed = observed.reshape(-1, 2, 2)
+  ones_first = observed[:, 0, :].sum(axis=1)
+  ones_second = observed[:, :, 0].sum(axis=1)
+  total = observed.sum(axis=(1, 2))
+  zeros_second = total - ones_second
+
+  expected = ones_first * ones_second / np.maximum(total, 1)
+  threshold = np.abs(observed[:, 0, 0] - expected) * (1 - STATISTIC_TOLERANCE)
+
+  # Con un margen constante todas las permutaciones son iguales a la observada
+  p_values = np.ones(len(observed))
+  active = (ones_first > 0) & (ones_first < total) & (ones_second > 0) & (zeros_second > 0)
+  if not active.any():
+    return p_values.reshape(shape)
+
+  workers = workers or os.cpu_count() or 1
+  workers = max(1, min(workers, n_permutations))
+  seeds = np.random.SeedSequence(seed).spawn(workers)
+  shares = [n_permutations // workers + (i < n_permutations % workers) for i in range(workers)]
+  arguments = [
+    (seeds[i], shares[i], ones_second[active], zeros_second[active], ones_first[active], threshold[active])
+    for i in range(workers)
+  ]
+
+  if workers == 1:
+    extreme = _count_extreme(*arguments[0])
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      extreme = sum(pool.map(_count_extreme, *zip(*arguments)))
+
+  p_values[active] = (1 + extreme) / (1 + n_permutations)
+  return p_values.reshape(shape)
+
+if __name__ == "__main__":
+  observed = np.array([[[1, 2], [3, 4]], [[40, 10], [10, 40]]])
+  print(f"Valores p por permutación: {permutation_p_values(observed, seed=0)}")
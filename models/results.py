@@ -0,0 +1,112 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# Condición de una regla: nombre de la columna y nivel que debe tomar
+Condition = Tuple[str, object]
+
+def _conditions_text(conditions: Tuple[Condition, ...]) -> str:
+  return ", ".join(f"{name}={level}" for name, level in conditions)
+
+class ChiSquaredResult:
+  """
+  Resultado numérico de la prueba chi-cuadrado de una tabla de contingencia. Guarda los valores observados,
+  esperados y los componentes del estadístico; el texto de los pasos del cálculo solo se genera al mostrarlo.
+  """
+
+  __slots__ = ('observed', 'expected', 'components', 'statistic', 'df', 'p_value')
+
+  def __init__(self, observed: np.ndarray, expected: np.ndarray, components: np.ndarray, df: int, p_value: float):
+    self.observed = observed
+    self.expected = expected
+    self.components = components
+    self.statistic = float(components.sum())
+    self.df = df
+    self.p_value = p_value
+
+  def format_steps(self) -> str:
+    """
+    Describe el cálculo de cada componente, recorriendo las celdas por filas.
+
+    :return: Cadena con los pasos del cálculo.
+    """
+    return ", ".join(
+      f"({o} - {e:.2f})^2 / {e:.2f} = {n:.4f}"
+      for o, e, n in zip(self.observed.ravel(), self.expected.ravel(), self.components.ravel())
+    )
+
+  def format_result(self) -> str:
+    """
+    Describe el estadístico como la suma de sus componentes.
+
+    :return: Cadena "X^2 = a + b + ... = total".
+    """
+    return f"X^2 = {' + '.join(f'{n:.4f}' for n in self.components.ravel())} = {self.statistic:.4f}"
+
+class RuleResult:
+  """
+  Resultado numérico de una regla "Si (antecedente) entonces consecuente". Solo guarda frecuencias (y, en las
+  reglas encontradas por Apriori, su chi-cuadrado); la cobertura, la confianza, la tabla 2x2 y el texto de la
+  regla se calculan al consultarlos.
+  """
+
+  __slots__ = ('antecedent', 'consequent', 'count', 'antecedent_count', 'consequent_count', 'total',
+               'chi_squared', 'p_value', 'dependency_factor')
+
+  def __init__(self, antecedent: Tuple[Condition, ...], consequent: Tuple[Condition, ...], count: int,
+               antecedent_count: int, consequent_count: int, total: int, chi_squared: Optional[float] = None,
+               p_value: Optional[float] = None, dependency_factor: Optional[float] = None):
+    self.antecedent = antecedent
+    self.consequent = consequent
+    self.count = count
+    self.antecedent_count = antecedent_count
+    self.consequent_count = consequent_count
+    self.total = total
+    self.chi_squared = chi_squared
+    self.p_value = p_value
+    self.dependency_factor = dependency_factor
+
+  @property
+  def rule(self) -> str:
+    return f"Si ({_conditions_text(self.antecedent)}) entonces {_conditions_text(self.consequent)}"
+
+  @property
+  def coverage(self) -> float:
+    return self.count / self.total if self.total != 0 else 0.0
+
+  @property
+  def confidence(self) -> float:
+    return self.count / self.antecedent_count if self.antecedent_count != 0 else 0.0
+
+  @property
+  def observed(self) -> list:
+    # Tabla 2x2 entre "se cumple el antecedente" y "se cumple el consecuente": [[11, 10], [01, 00]]
+    return [
+      [self.count, self.antecedent_count - self.count],
+      [self.consequent_count - self.count, self.total - self.antecedent_count - self.consequent_count + self.count]
+    ]
+
+  def format_coverage(self) -> str:
+    return f"{self.coverage*100:.2f}% ({self.count}/{self.total})"
+
+  def format_confidence(self) -> str:
+    return f"{self.confidence*100:.2f}% ({self.count}/{self.antecedent_count})"
+
+  def to_dict(self) -> dict:
+    """
+    Convierte la regla en un diccionario para exportarla (JSON o CSV).
+
+    :return: Diccionario con el texto de la regla, los nombres del antecedente y del consecuente, la frecuencia,
+             la cobertura, la confianza, las celdas observadas, chi-cuadrado, valor p y factor de dependencia.
+    """
+    return {
+      'rule': self.rule,
+      'antecedent': [name for name, _ in self.antecedent],
+      'consequent': [name for name, _ in self.consequent],
+      'count': self.count,
+      'coverage': self.coverage,
+      'confidence': self.confidence,
+      'observed': self.observed,
+      'chi_squared': self.chi_squared,
+      'p_value': self.p_value,
+      'dependency_factor': self.dependency_factor
+    }
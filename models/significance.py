@@ -0,0 +1,214 @@
+import math
+import numpy as np
+
+# Máximo de iteraciones de la serie y de la fracción continua de la función gamma incompleta
+MAX_ITERATIONS = 1000
+EPSILON = 1e-15
+TINY = 1e-300
+
+# Tolerancia relativa para considerar dos tablas igual de probables en la prueba exacta de Fisher
+FISHER_TOLERANCE = 1e-7
+
+# Máximo de tablas posibles (con los mismos márgenes) evaluadas a la vez por `fisher_exact_p_values`
+FISHER_BATCH_CELLS = 1 << 22
+
+def _regularized_gamma_q(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+  """
+  Función gamma incompleta superior regularizada Q(a, x), vectorizada.
+  Usa la serie de P(a, x) cuando x < a + 1 y la fracción continua de Lentz en otro caso.
+
+  :param a: Parámetro de forma (> 0).
+  :param x: Punto de evaluación (>= 0, puede ser infinito).
+  :return: Q(a, x) con la forma de la difusión de a y x (NaN donde a o x son NaN).
+  """
+  a, x = np.broadcast_arrays(np.asarray(a, dtype=np.float64), np.asarray(x, dtype=np.float64))
+  result = np.ones(a.shape)
+  log_gamma = np.vectorize(math.lgamma, otypes=[np.float64])
+
+  # Q(a, inf) = 0 y un valor NaN se propaga, como en scipy; el resto se calcula con la serie o la fracción
+  undefined = np.isnan(a) | np.isnan(x)
+  result[undefined] = np.nan
+  result[np.isposinf(x) & ~undefined] = 0.0
+  positive = (x > 0) & np.isfinite(x) & ~undefined
+  use_series = positive & (x < a + 1)
+  use_fraction = positive & ~use_series
+
+  if use_series.any():
+    a_s, x_s = a[use_series], x[use_series]
+    term = 1.0 / a_s
+    total = term.copy()
+    denominator = a_s.copy()
+    for _ in range(MAX_ITERATIONS):
+      denominator += 1
+      term *= x_s / denominator
+      total += term
+      if (np.abs(term) < np.abs(total) * EPSILON).all():
+        break
+    p = total * np.exp(-x_s + a_s * np.log(x_s) - log_gamma(a_s))
+    result[use_series] = np.clip(1.0 - p, 0.0, 1.0)
+
+  if use_fraction.any():
+    a_f, x_f = a[use_fraction], x[use_fraction]
+    b = x_f + 1 - a_f
+    c = np.full(b.shape, 1 / TINY)
+    d = 1 / b
+    h = d.copy()
+    for i in range(1, MAX_ITERATIONS):
+      an = -i * (i - a_f)
+      b = b + 2
+      d = an * d + b
+      d = np.where(np.abs(d) < TINY, TINY, d)
+      c = b + an / c
+      c = np.where(np.abs(c) < TINY, TINY, c)
+      d = 1 / d
+      delta = d * c
+      h *= delta
+      if (np.abs(delta - 1) < EPSILON).all():
+        break
+    result[use_fraction] = np.clip(np.exp(-x_f + a_f * np.log(x_f) - log_gamma(a_f)) * h, 0.0, 1.0)
+
+  return result
+
+def chi2_sf(statistics, df=1) -> np.ndarray:
+  """
+  Calcula valores p exactos de la distribución chi-cuadrado (función de supervivencia) de forma vectorizada.
+
+  :param statistics: Valor o arreglo de valores de chi-cuadrado.
+  :param df: Grados de libertad (escalar o arreglo difundible con los estadísticos).
+  :return: Arreglo de valores p, P(X >= estadístico); 0 para un estadístico infinito y NaN para uno NaN.
+  """
+  statistics = np.asarray(statistics, dtype=np.float64)
+  df = np.asarray(df, dtype=np.float64)
+  if (df <= 0).any():
+    raise ValueError("Los grados de libertad deben ser positivos.")
+  return _regularized_gamma_q(df / 2, np.maximum(statistics, 0) / 2)
+
+def adjust_p_values(p_values, method: str = 'bh') -> np.ndarray:
+  """
+  Ajusta valores p por comparaciones múltiples.
+
+  :param p_values: Arreglo de valores p (cualquier forma; los valores NaN se ignoran).
+  :param method: 'bonferroni' o 'bh' (Benjamini-Hochberg).
+  :return: Arreglo de valores p ajustados con la misma forma.
+  """
+  p_values = np.asarray(p_values, dtype=np.float64)
+  flat = p_values.ravel()
+  valid = ~np.isnan(flat)
+  m = int(valid.sum())
+  adjusted = np.full(flat.shape, np.nan)
+  if m == 0:
+    return adjusted.reshape(p_values.shape)
+
+  if method == 'bonferroni':
+    adjusted[valid] = np.minimum(flat[valid] * m, 1.0)
+  elif method == 'bh':
+    values = flat[valid]
+    order = np.argsort(values)
+    ranked = values[order] * m / np.arange(1, m + 1)
+    # Mínimo acumulado desde el valor p más grande para mantener la monotonía
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(ranked, 1.0)
+    adjusted[valid] = result
+  else:
+    raise ValueError(f"Método de ajuste desconocido: {method}")
+  return adjusted.reshape(p_values.shape)
+
+def rank_by_p_value(p_values) -> np.ndarray:
+  """
+  Ordena posiciones de la más a la menos significativa.
+
+  :param p_values: Arreglo de valores p (cualquier forma).
+  :return: Índices planos ordenados por valor p ascendente (los NaN al final).
+  """
+  return np.argsort(np.asarray(p_values, dtype=np.float64).ravel(), kind='stable')
+
+class LogFactorialTable:
+  """
+  Tabla precalculada de log(n!) que crece al doble cuando se pide un n mayor al guardado.
+  Se comparte entre todas las pruebas exactas para que cada una solo haga búsquedas en un arreglo.
+  """
+
+  def __init__(self, size: int = 1024):
+    self._values = np.zeros(1)
+    self._grow(size)
+
+  def _grow(self, size: int):
+    start = len(self._values)
+    increments = np.log(np.arange(start, size, dtype=np.float64))
+    self._values = np.concatenate([self._values, self._values[-1] + np.cumsum(increments)])
+
+  def __call__(self, n) -> np.ndarray:
+    """
+    Obtiene log(n!) para un entero o arreglo de enteros no negativos.
+
+    :param n: Entero o arreglo de enteros.
+    :return: log(n!) con la misma forma.
+    """
+    n = np.asarray(n, dtype=np.int64)
+    largest = int(n.max()) if n.size else 0
+    if largest >= len(self._values):
+      self._grow(max(largest + 1, 2 * len(self._values)))
+    return self._values[n]
+
+# Tabla compartida de log-factoriales
+log_factorial = LogFactorialTable()
+
+def fisher_exact(observed) -> float:
+  """
+  Calcula el valor p bilateral de la prueba exacta de Fisher para una tabla 2x2.
+  Suma las probabilidades hipergeométricas de todas las tablas con los mismos totales marginales
+  que sean tan o menos probables que la observada.
+
+  :param observed: Tabla 2x2 de frecuencias observadas [[a, b], [c, d]].
+  :return: Valor p bilateral.
+  """
+  return float(fisher_exact_p_values(observed))
+
+def fisher_exact_p_values(observed) -> np.ndarray:
+  """
+  Calcula el valor p bilateral de la prueba exacta de Fisher para muchas tablas 2x2 a la vez, sin recorrerlas
+  en Python. Las tablas posibles de todas ellas (las que tienen los mismos márgenes, una por valor de la celda
+  [0, 0]) se ponen en un solo arreglo y las probabilidades de cada tabla se suman con un `bincount`.
+
+  :param observed: Arreglo (..., 2, 2) de tablas observadas [[a, b], [c, d]].
+  :return: Arreglo (...) de valores p bilaterales.
+  """
+  observed = np.asarray(observed, dtype=np.int64)
+  shape = observed.shape[:-2]
+  a, b, c, d = observed.reshape(-1, 4).T
+  row1, row2, col1 = a + b, c + d, a + c
+  total = row1 + row2
+  # Las tablas posibles de cada tabla observada van de `start` a min(row1, col1) en la celda [0, 0]
+  start = np.maximum(0, col1 - row2)
+  lengths = np.minimum(row1, col1) - start + 1
+  constant = log_factorial(row1) + log_factorial(row2) + log_factorial(col1) + log_factorial(total - col1) - log_factorial(total)
+  log_p_observed = constant - log_factorial(a) - log_factorial(b) - log_factorial(c) - log_factorial(d)
+
+  p_values = np.ones(len(a))
+  ends = np.cumsum(lengths)
+  first = 0
+  while first < len(a):
+    done = ends[first - 1] if first else 0
+    last = max(first + 1, int(np.searchsorted(ends, done + FISHER_BATCH_CELLS, side='right')))
+    batch = np.arange(first, last)
+    tables = np.repeat(batch, lengths[batch])
+    x = start[tables] + np.arange(len(tables)) - np.repeat(ends[batch] - lengths[batch] - done, lengths[batch])
+    log_p = (constant[tables] - log_factorial(x) - log_factorial(row1[tables] - x) - log_factorial(col1[tables] - x)
+             - log_factorial(row2[tables] - col1[tables] + x))
+    # Las tablas que se suman son a lo sumo tan probables como la observada, así que exp(log_p - log_p_observed)
+    # no desborda y la suma se hace en escala relativa a la observada
+    relative = log_p - log_p_observed[tables]
+    keep = relative <= math.log1p(FISHER_TOLERANCE)
+    sums = np.bincount(tables[keep] - first, weights=np.exp(relative[keep]), minlength=len(batch))
+    p_values[batch] = np.minimum(np.exp(log_p_observed[batch]) * sums, 1.0)
+    first = last
+  return p_values.reshape(shape)
+
+if __name__ == "__main__":
+  statistics = np.array([0.0794, 3.84, 6.63, 15.1367, 50.0])
+  p_values = chi2_sf(statistics)
+  print(f"Valores p (df=1): {p_values}")
+  print(f"Bonferroni: {adjust_p_values(p_values, 'bonferroni')}")
+  print(f"Benjamini-Hochberg: {adjust_p_values(p_values, 'bh')}")
+  print(f"Fisher [[1, 2], [3, 4]]: {fisher_exact([[1, 2], [3, 4]])}")
@@ -1,7 +1,110 @@
+import copy
+import functools
 import math
+import threading
+import numpy as np
 import pandas as pd
-from typing import List, Tuple
-from .column import Column
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+from .column import Column, SparseColumn
+from .significance import chi2_sf, fisher_exact, fisher_exact_p_values
+from .permutation import permutation_p_values
+from .mining import frequent_itemsets, association_rules
+from .metrics import rule_metrics
+from .results import ChiSquaredResult, RuleResult
+from .parallel import CO_OCCURRENCE_BLOCK_CELLS, parallel_co_occurrence, sparse_co_occurrence
+from .patterns import (MAX_PATTERN_COLUMNS, pattern_code, pattern_histogram, pattern_co_occurrence, pattern_itemsets,
+                       remove_pattern_column)
+from .instrumentation import instrumentation
+
+# Valores críticos para la distribución chi-cuadrado con df=1
+CRITICAL_VALUES = {
+  '95%': 3.84,
+  '99%': 6.63,
+  '99.99%': 15.1367
+}
+
+# Niveles de significancia equivalentes a los valores críticos, usados con valores p exactos
+SIGNIFICANCE_LEVELS = {
+  '95%': 0.05,
+  '99%': 0.01,
+  '99.99%': 0.0001
+}
+
+# Frecuencia esperada mínima por debajo de la cual se usa la prueba exacta de Fisher
+EXACT_TEST_THRESHOLD = 5.0
+
+class AnalysisCache:
+  """
+  Caché LRU de resultados de análisis, indexada por el contenido de las columnas y el par seleccionado.
+  Como la llave depende del contenido, cualquier cambio en los datos produce una llave nueva y los
+  resultados anteriores simplemente dejan de usarse hasta ser desalojados. Los resultados se calculan en
+  hilos en segundo plano, así que el orden LRU se modifica siempre con un candado.
+  """
+
+  def __init__(self, maxsize: int = 128):
+    self.maxsize = maxsize
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def entry(self, key: tuple) -> dict:
+    """
+    Obtiene (o crea) el diccionario de resultados de una llave y la marca como la más reciente.
+
+    :param key: Llave del par analizado.
+    :return: Diccionario con los resultados ya calculados para esa llave.
+    """
+    with self._lock:
+      if key in self._entries:
+        self._entries.move_to_end(key)
+        return self._entries[key]
+      entry = self._entries[key] = {}
+      while len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+      return entry
+
+  def clear(self):
+    """
+    Elimina todos los resultados guardados.
+    """
+    with self._lock:
+      self._entries.clear()
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+# Caché compartida por todas las tablas
+analysis_cache = AnalysisCache()
+
+def _freeze(arrays: dict) -> Mapping[str, np.ndarray]:
+  # Diccionario de arreglos de solo lectura, para compartirlo desde la caché sin copiarlo
+  for array in arrays.values():
+    array.setflags(write=False)
+  return MappingProxyType(arrays)
+
+def cached_result(name: str, frozen: bool = False):
+  """
+  Decorador que guarda el resultado de un método de Table en la caché de análisis.
+  Antes de calcular se actualiza la tabla de contingencia del par seleccionado.
+
+  :param name: Nombre del resultado dentro de la entrada de la caché.
+  :param frozen: Si es True, el método retorna un diccionario de arreglos que se guarda como solo lectura y se
+                 retorna sin copiar (para las consultas internas frecuentes); si es False, cada llamada recibe
+                 una copia que puede modificar sin alterar la caché.
+  """
+  def decorator(method):
+    @functools.wraps(method)
+    def wrapper(self):
+      entry = self.cache.entry(self._cache_key())
+      if name not in entry:
+        self.get_contingency_table()
+        result = method(self)
+        entry[name] = _freeze(result) if frozen else result
+      return entry[name] if frozen else copy.deepcopy(entry[name])
+    return wrapper
+  return decorator
 
 class Table:
   """
@@ -9,10 +112,21 @@ class Table:
   calcular tablas de contingencia, cobertura, confianza, factor de dependencia, chi-cuadrado y determinar significancia.
   """
 
-  def __init__(self):
+  def __init__(self, cache: AnalysisCache = None, workers: int = 1, patterns: bool = False):
     self.columns = []
     self.selected_index_columns = []
     self.contingency_table = None
+    self.cache = cache if cache is not None else analysis_cache
+    # Frecuencia esperada mínima para usar chi-cuadrado; None desactiva la prueba exacta
+    self.exact_threshold = EXACT_TEST_THRESHOLD
+    # Estadísticos suficientes: co-ocurrencias de cada par de columnas (la diagonal son las sumas por columna)
+    self.co_occurrence = np.zeros((0, 0), dtype=np.int64)
+    # Procesos para calcular las co-ocurrencias por fragmentos de filas (None usa todas las CPUs)
+    self.workers = workers
+    # Con `patterns`, si hay como máximo MAX_PATTERN_COLUMNS columnas binarias se mantiene además el histograma de
+    # los patrones de fila (2^k conteos), del que salen las co-ocurrencias y la frecuencia de cualquier conjunto
+    self.patterns = patterns
+    self.pattern_histogram = None
 
   def select_index_column(self, index: int):
     """
@@ -22,19 +136,174 @@ class Table:
     """
     self.selected_index_columns.append(index)
 
+  @property
+  def row_count(self) -> int:
+    return len(self.columns[0]) if self.columns else 0
+
   def add_column(self, new_column: Column):
     """
-    Agrega una nueva columna a la tabla.
+    Agrega una nueva columna a la tabla y actualiza las co-ocurrencias en O(filas x columnas existentes).
 
     :param new_column: Instancia de la clase Column que se va a agregar.
     """
+    if self.columns and len(new_column) != self.row_count:
+      raise ValueError("Todas las columnas deben tener el mismo número de filas.")
+    # Las columnas categóricas no tienen bits, así que sus co-ocurrencias quedan en 0
+    if new_column.is_binary:
+      counts = [new_column.and_count(column) if column.is_binary else 0 for column in self.columns] + [new_column.count()]
+    else:
+      counts = [0] * (len(self.columns) + 1)
+    k = len(self.columns)
+    co_occurrence = np.zeros((k + 1, k + 1), dtype=np.int64)
+    co_occurrence[:k, :k] = self.co_occurrence
+    co_occurrence[k, :] = counts
+    co_occurrence[:, k] = counts
+    self.co_occurrence = co_occurrence
     self.columns.append(new_column)
+    if self.pattern_histogram is not None and new_column.is_binary and counts[-1] == 0 and k < MAX_PATTERN_COLUMNS:
+      # Una columna de ceros es el bit más alto en 0: los patrones existentes no cambian
+      self.pattern_histogram = np.concatenate((self.pattern_histogram, np.zeros_like(self.pattern_histogram)))
+    else:
+      self.pattern_histogram = self._compute_pattern_histogram()
+    self._invalidate()
+
+  def set_columns(self, columns: List[Column], co_occurrence: Optional[np.ndarray] = None,
+                  pattern_histogram: Optional[np.ndarray] = None):
+    """
+    Reemplaza todas las columnas de la tabla, calculando las co-ocurrencias en una sola pasada vectorizada.
+    Si se usa el histograma de patrones, las co-ocurrencias se obtienen de él sin otra pasada por las filas.
+
+    :param columns: Lista de columnas con el mismo número de filas.
+    :param co_occurrence: Matriz de co-ocurrencia de estas columnas ya calculada (por ejemplo, en un hilo en segundo plano).
+    :param pattern_histogram: Histograma de patrones de estas columnas ya calculado.
+    """
+    if len({len(column) for column in columns}) > 1:
+      raise ValueError("Todas las columnas deben tener el mismo número de filas.")
+    self.columns = list(columns)
+    if pattern_histogram is not None and self._uses_patterns():
+      self.pattern_histogram = pattern_histogram
+    else:
+      self.pattern_histogram = self._compute_pattern_histogram()
+    if co_occurrence is None:
+      if self.pattern_histogram is not None:
+        co_occurrence = pattern_co_occurrence(self.pattern_histogram)
+      else:
+        co_occurrence = self._compute_co_occurrence()
+    self.co_occurrence = co_occurrence
+    self._invalidate()
+
+  def remove_column(self, index: int = -1):
+    """
+    Elimina una columna de la tabla (por defecto la última).
+
+    :param index: Índice de la columna a eliminar.
+    """
+    index = range(len(self.columns))[index]
+    self.columns.pop(index)
+    self.co_occurrence = np.delete(np.delete(self.co_occurrence, index, axis=0), index, axis=1)
+    if self.pattern_histogram is not None and self._uses_patterns():
+      self.pattern_histogram = remove_pattern_column(self.pattern_histogram, index)
+    else:
+      self.pattern_histogram = self._compute_pattern_histogram()
+    self._invalidate()
 
   def clear_columns(self):
     """
     Elimina todas las columnas de la tabla.
     """
     self.columns = []
+    self.co_occurrence = np.zeros((0, 0), dtype=np.int64)
+    self.pattern_histogram = None
+    self._invalidate()
+
+  def append_row(self, values: List[int]):
+    """
+    Agrega una fila al final de todas las columnas y actualiza las co-ocurrencias. Solo está disponible si todas
+    las columnas son binarias.
+
+    :param values: Valores (0 o 1) de la nueva fila, uno por columna.
+    """
+    if len(values) != len(self.columns):
+      raise ValueError("La fila debe tener un valor por columna.")
+    self._check_rows_editable()
+    for column, value in zip(self.columns, values):
+      column.append(value)
+    ones = np.flatnonzero(values)
+    self.co_occurrence[np.ix_(ones, ones)] += 1
+    if self.pattern_histogram is not None:
+      self.pattern_histogram[pattern_code(values)] += 1
+    self._invalidate()
+
+  def remove_last_row(self) -> List[int]:
+    """
+    Elimina la última fila de todas las columnas y actualiza las co-ocurrencias. Solo está disponible si todas
+    las columnas son binarias.
+
+    :return: Valores de la fila eliminada.
+    """
+    self._check_rows_editable()
+    values = [column.pop() for column in self.columns]
+    ones = np.flatnonzero(values)
+    self.co_occurrence[np.ix_(ones, ones)] -= 1
+    if self.pattern_histogram is not None:
+      self.pattern_histogram[pattern_code(values)] -= 1
+    self._invalidate()
+    return values
+
+  def set_value(self, row: int, col: int, value: int):
+    """
+    Cambia el valor de una celda y actualiza las co-ocurrencias de su columna en O(columnas). Las celdas de las
+    columnas categóricas no se pueden editar.
+
+    :param row: Índice de la fila.
+    :param col: Índice de la columna.
+    :param value: Nuevo valor (0 o 1).
+    """
+    if not self.columns[col].is_binary:
+      raise ValueError(f"La columna '{self.columns[col].name}' es categórica y sus celdas no se pueden editar.")
+    old = self.columns[col].get(row)
+    if old == value:
+      return
+    self.columns[col].set(row, value)
+    delta = value - old
+    # Las columnas categóricas no tienen co-ocurrencias, así que cuentan como 0
+    row_values = np.array([column.get(row) if column.is_binary else 0 for column in self.columns], dtype=np.int64)
+    row_values[col] = 0
+    self.co_occurrence[col, :] += delta * row_values
+    self.co_occurrence[:, col] += delta * row_values
+    self.co_occurrence[col, col] += delta
+    if self.pattern_histogram is not None:
+      # La fila pasa del patrón con el valor anterior en la columna al patrón con el nuevo
+      code = pattern_code(row_values)
+      self.pattern_histogram[code | (old << col)] -= 1
+      self.pattern_histogram[code | (value << col)] += 1
+    self._invalidate()
+
+  def _check_rows_editable(self):
+    # Agregar o quitar filas requiere un valor 0 o 1 en cada columna
+    categorical = [column.name for column in self.columns if not column.is_binary]
+    if categorical:
+      raise ValueError(f"No se pueden agregar ni eliminar filas en una tabla con columnas categóricas: {', '.join(categorical)}")
+
+  def _cache_key(self) -> tuple:
+    column1 = self.columns[self.selected_index_columns[0]]
+    column2 = self.columns[self.selected_index_columns[1]]
+    return column1.fingerprint(), column2.fingerprint(), column1.name, column2.name
+
+  def _uses_patterns(self) -> bool:
+    return self.patterns and 0 < len(self.columns) <= MAX_PATTERN_COLUMNS and self.are_all_columns_binary()
+
+  @instrumentation.traced('table.patterns')
+  def _compute_pattern_histogram(self) -> Optional[np.ndarray]:
+    # Histograma de los patrones de fila, o None si la tabla no lo usa
+    if not self._uses_patterns():
+      return None
+    instrumentation.count('table.cells', self.row_count * len(self.columns))
+    return pattern_histogram([column.bits for column in self.columns], self.row_count)
+
+  def _invalidate(self):
+    # La tabla de contingencia guardada deja de corresponder a los datos
+    self.contingency_table = None
 
   def are_all_columns_binary(self) -> bool:
     """
@@ -42,7 +311,7 @@ class Table:
 
     :return: True si todos los valores son binarios, False en caso contrario.
     """
-    return all(all(value in (0, 1) for value in column.values) for column in self.columns)
+    return all(column.is_binary for column in self.columns)
 
   def get_names(self) -> Tuple[str, str]:
     """
@@ -54,139 +323,176 @@ class Table:
     name2 = self.columns[self.selected_index_columns[1]].name
     return name1, name2
 
+  @instrumentation.traced('table.get_contingency_table')
   def get_contingency_table(self) -> List[List[int]]:
     """
     Genera una tabla de contingencia a partir de las columnas seleccionadas y la retorna como una lista de listas.
+    Con dos columnas binarias las celdas salen de las co-ocurrencias; con columnas categóricas se cuentan los
+    códigos enteros de ambas columnas con un solo `bincount`, dando una tabla de r x c más los totales.
 
     :return: Tabla de contingencia como lista de listas.
     """
-    name1, name2 = self.get_names()
-    
-    # Preparar los datos para DataFrame
-    data = {
-      name1: self.columns[self.selected_index_columns[0]].values,
-      name2: self.columns[self.selected_index_columns[1]].values
-    }
+    entry = self.cache.entry(self._cache_key())
+    if 'contingency' not in entry:
+      entry['contingency'] = self._count_contingency_table()
+    # La caché guarda los conteos como arreglo de solo lectura; cada llamada recibe su propio DataFrame, así que
+    # modificarlo no altera los resultados de las siguientes consultas
+    counts, labels1, labels2 = entry['contingency']
+    self.contingency_table = pd.DataFrame(counts.copy(), index=[*labels1, 'All'], columns=[*labels2, 'All'])
+    return counts.tolist()
+
+  def _count_contingency_table(self) -> Tuple[np.ndarray, Tuple[str, ...], Tuple[str, ...]]:
+    # Cuenta las celdas y los totales del par seleccionado; retorna los conteos (de solo lectura) y las etiquetas
+    column1 = self.columns[self.selected_index_columns[0]]
+    column2 = self.columns[self.selected_index_columns[1]]
+
+    if column1.is_binary and column2.is_binary:
+      # Las celdas salen de las co-ocurrencias mantenidas (AND y popcount sobre los bits empaquetados)
+      index1, index2 = self.selected_index_columns[:2]
+      both = int(self.co_occurrence[index1, index2])
+      total1 = int(self.co_occurrence[index1, index1])
+      total2 = int(self.co_occurrence[index2, index2])
+      total = len(column1)
+      observed = np.array([[both, total1 - both], [total2 - both, total - total1 - total2 + both]])
+    else:
+      # Cada par de códigos (i, j) se convierte en la celda i * c + j de la tabla aplanada
+      r, c = len(column1.levels), len(column2.levels)
+      cells = column1.codes.astype(np.int64) * c + column2.codes
+      observed = np.bincount(cells, minlength=r * c).reshape(r, c)
 
-    df = pd.DataFrame(data)
+    counts = np.zeros((observed.shape[0] + 1, observed.shape[1] + 1), dtype=np.int64)
+    counts[:-1, :-1] = observed
+    counts[:-1, -1] = observed.sum(axis=1)
+    counts[-1, :] = counts[:-1, :].sum(axis=0)
 
-    # Generar la tabla de contingencia
-    self.contingency_table = pd.crosstab(df[name1], df[name2], margins=True)
-    self.contingency_table = self.contingency_table.rename(index={0: f'~{name1}', 1: name1}, columns={0: f'~{name2}', 1: name2})
-    self.contingency_table = self.contingency_table.reindex([name1, f'~{name1}', 'All'], axis=0).reindex([name2, f'~{name2}', 'All'], axis=1)
+    counts.setflags(write=False)
+    labels1, labels2 = self.get_labels()
+    return counts, tuple(labels1), tuple(labels2)
 
-    # Rellenar valores NaN con ceros
-    self.contingency_table = self.contingency_table.fillna(0)
+  def get_labels(self) -> Tuple[List[str], List[str]]:
+    """
+    Obtiene las etiquetas de las filas y columnas de la tabla de contingencia (sin los totales).
+    Una columna binaria se etiqueta como `nombre` y `~nombre`; una categórica como `nombre=nivel`.
 
-    return self.contingency_table.values.tolist()
+    :return: Tupla con las etiquetas de la primera y de la segunda columna seleccionada.
+    """
+    labels = []
+    for index in self.selected_index_columns[:2]:
+      column = self.columns[index]
+      if column.is_binary:
+        labels.append([column.name, f'~{column.name}'])
+      else:
+        labels.append([f'{column.name}={level}' for level in column.levels])
+    return labels[0], labels[1]
+
+  def get_degrees_of_freedom(self) -> int:
+    """
+    Obtiene los grados de libertad de la tabla de contingencia, (filas - 1) * (columnas - 1).
+
+    :return: Grados de libertad.
+    """
+    if self.contingency_table is None:
+      self.get_contingency_table()
+    rows, cols = self.contingency_table.shape
+    return (rows - 2) * (cols - 2)
+
+  def _split_contingency_table(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    # Separa la tabla de contingencia en celdas observadas, totales por fila, totales por columna y total
+    values = self.contingency_table.values
+    return values[:-1, :-1], values[:-1, -1], values[-1, :-1], values[-1, -1]
 
   def calculate_coverage_confidence(self, condition):
     """
     Calcula la cobertura y confianza para una condición dada.
 
-    :param condition: Condición a evaluar.
+    :param condition: Condición a evaluar, con el texto de la regla ("Si (A=a) entonces B=b").
     :return: Una tupla con cobertura, confianza, número de ocurrencias de la condición y el total de ocurrencias de la condición.
     """
-    name1, name2 = self.get_names()
-    total = self.contingency_table.at['All', 'All']
-    coverage_count = total_condition = 0  # Inicializar variables
-
-    if condition == f"Si ({name1}=1) entonces {name2}=1":
-      coverage_count = self.contingency_table.at[name1, name2]
-      total_n = self.contingency_table.at[name1, 'All']
-    elif condition == f"Si ({name1}=1) entonces {name2}=0":
-      coverage_count = self.contingency_table.at[name1, f'~{name2}']
-      total_n = self.contingency_table.at[name1, 'All']
-    elif condition == f"Si ({name1}=0) entonces {name2}=1":
-      coverage_count = self.contingency_table.at[f'~{name1}', name2]
-      total_n = self.contingency_table.at[f'~{name1}', 'All']
-    elif condition == f"Si ({name1}=0) entonces {name2}=0":
-      coverage_count = self.contingency_table.at[f'~{name1}', f'~{name2}']
-      total_n = self.contingency_table.at[f'~{name1}', 'All']
-    elif condition == f"Si ({name2}=1) entonces {name1}=1":
-      coverage_count = self.contingency_table.at[name1, name2]
-      total_n = self.contingency_table.at['All', name2]
-    elif condition == f"Si ({name2}=1) entonces {name1}=0":
-      coverage_count = self.contingency_table.at[f'~{name1}', name2]
-      total_n = self.contingency_table.at['All', name2]
-    elif condition == f"Si ({name2}=0) entonces {name1}=1":
-      coverage_count = self.contingency_table.at[name1, f'~{name2}']
-      total_n = self.contingency_table.at['All', f'~{name2}']
-    elif condition == f"Si ({name2}=0) entonces {name1}=0":
-      coverage_count = self.contingency_table.at[f'~{name1}', f'~{name2}']
-      total_n = self.contingency_table.at['All', f'~{name2}']
-    else:
-      coverage = confidence = None
-      return coverage, confidence, coverage_count, total_condition
-
-    # Calcular cobertura
-    coverage = coverage_count / total if total != 0 else 0
-    
-    # Calcular confianza basada en la condición
-    confidence = coverage_count / total_n if total_n != 0 else 0
-    total_condition = total_n
+    entry = self.cache.entry(self._cache_key())
+    if 'rule_index' not in entry:
+      # Posición de cada regla en los arreglos de `get_rule_metrics`, calculada una vez por par
+      entry['rule_index'] = {rule.rule: i for i, rule in enumerate(self.get_rules())}
+    index = entry['rule_index'].get(condition)
+    if index is None:
+      return None, None, 0, 0
+    metrics = self.get_rule_metrics()
+    return (float(metrics['coverage'][index]), float(metrics['confidence'][index]),
+            int(metrics['count'][index]), int(metrics['antecedent_count'][index]))
+
+  @cached_result('rule_metrics', frozen=True)
+  def get_rule_metrics(self) -> Mapping[str, np.ndarray]:
+    """
+    Calcula la cobertura, confianza, factor de dependencia, apalancamiento y convicción de todas las reglas
+    entre los niveles de las columnas seleccionadas, en el orden de `get_rules`.
 
-    return coverage, confidence, coverage_count, total_condition
+    :return: Diccionario de solo lectura con arreglos de NumPy de solo lectura (ver `rule_metrics`), compartido
+             con la caché.
+    """
+    return rule_metrics(self._split_contingency_table()[0])
 
+  @instrumentation.traced('table.get_coverage_confidence')
+  @cached_result('coverage_confidence')
   def get_coverage_confidence(self) -> Tuple[List[str], List[str]]:
     """
-    Calcula la cobertura y confianza para varias condiciones predefinidas y las retorna como listas de cadenas.
+    Calcula la cobertura y confianza para todas las condiciones entre los niveles de las columnas seleccionadas
+    y las retorna como listas de cadenas.
 
     :return: Dos listas, una con resultados de cobertura y otra con resultados de confianza.
     """
     coverage_list = []
     confidence_list = []
-    name1, name2 = self.get_names()
-    conditions = [
-      f"Si ({name1}=1) entonces {name2}=1",
-      f"Si ({name1}=1) entonces {name2}=0",
-      f"Si ({name1}=0) entonces {name2}=1",
-      f"Si ({name1}=0) entonces {name2}=0",
-      f"Si ({name2}=1) entonces {name1}=1",
-      f"Si ({name2}=1) entonces {name1}=0",
-      f"Si ({name2}=0) entonces {name1}=1",
-      f"Si ({name2}=0) entonces {name1}=0"
-    ]
+    for rule in self.get_rules():
+      text = rule.rule
+      coverage_list.append(f"{text}: Cobertura = {rule.format_coverage()}")
+      confidence_list.append(f"{text}: Confianza = {rule.format_confidence()}")
+    return coverage_list, confidence_list
 
-    # Calcular y almacenar la cobertura y confianza para cada condición
-    for condition in conditions:
-      coverage, confidence, coverage_count, total_condition = self.calculate_coverage_confidence(condition)
-      if coverage is not None and confidence is not None:
-        coverage_result = (f"{condition}: Cobertura = {coverage*100:.2f}% "
-                           f"({coverage_count}/{self.contingency_table.at['All', 'All']})")
-        confidence_result = (f"{condition}: Confianza = {confidence*100:.2f}% "
-                             f"({coverage_count}/{total_condition})")
-      else:
-        coverage_result = f"{condition}: No se pudo calcular cobertura"
-        confidence_result = f"{condition}: No se pudo calcular confianza"
+  @instrumentation.traced('table.get_rules')
+  @cached_result('rules')
+  def get_rules(self) -> List[RuleResult]:
+    """
+    Obtiene todas las condiciones "Si (A=a) entonces B=b" entre los niveles de las columnas seleccionadas, en
+    ambas direcciones y en el mismo orden que `get_coverage_confidence`, como resultados numéricos.
 
-      coverage_list.append(coverage_result)
-      confidence_list.append(confidence_result)
+    :return: Lista de reglas con sus frecuencias; la cobertura y la confianza se calculan al consultarlas.
+    """
+    column1 = self.columns[self.selected_index_columns[0]]
+    column2 = self.columns[self.selected_index_columns[1]]
+    conditions1 = [(column1.name, level) for level in column1.levels]
+    conditions2 = [(column2.name, level) for level in column2.levels]
+    # Antecedente y consecuente de cada regla, en el orden de los arreglos de `rule_metrics`
+    pairs = [(a, b) for a in conditions1 for b in conditions2] + [(b, a) for b in conditions2 for a in conditions1]
+
+    metrics = self.get_rule_metrics()
+    total = int(metrics['total'])
+    return [
+      RuleResult((antecedent,), (consequent,), count, antecedent_count, consequent_count, total,
+                 dependency_factor=dependency_factor)
+      for (antecedent, consequent), count, antecedent_count, consequent_count, dependency_factor in zip(
+        pairs, metrics['count'].tolist(), metrics['antecedent_count'].tolist(),
+        metrics['consequent_count'].tolist(), metrics['dependency_factor'].tolist()
+      )
+    ]
 
-    return coverage_list, confidence_list
+  def _get_expected(self) -> np.ndarray:
+    # Frecuencias esperadas bajo independencia: total de la fila x total de la columna / total
+    _, row_totals, col_totals, total = self._split_contingency_table()
+    return np.outer(row_totals, col_totals) / total if total != 0 else np.zeros((len(row_totals), len(col_totals)))
 
+  @instrumentation.traced('table.calculate_dependency_factor')
   def calculate_dependency_factor(self):
     """
     Calcula el factor de dependencia para cada combinación posible de valores en las columnas seleccionadas.
 
     :return: DataFrame con los factores de dependencia.
     """
-    name1, name2 = self.get_names()
-    total = self.contingency_table.at['All', 'All']
-    factors = pd.DataFrame(index=[name1, f'~{name1}'], columns=[name2, f'~{name2}'])
-
-    for i in [name1, f'~{name1}']:
-      for j in [name2, f'~{name2}']:
-        P_i_and_j = self.contingency_table.at[i, j] / total
-        P_i = self.contingency_table.at[i, 'All'] / total
-        P_j = self.contingency_table.at['All', j] / total
-        if P_i * P_j != 0:
-          FD = P_i_and_j / (P_i * P_j)
-        else:
-          FD = 0
-        factors.at[i, j] = round(FD, 3)  # Redondear a 3 decimales
-    return factors
+    r, c = self._split_contingency_table()[0].shape
+    # Las primeras r x c reglas son las de la primera columna hacia la segunda, recorridas por filas
+    factors = self.get_rule_metrics()['dependency_factor'][:r * c].reshape(r, c).round(3)  # Redondear a 3 decimales
+    labels1, labels2 = self.get_labels()
+    return pd.DataFrame(factors, index=labels1, columns=labels2)
 
+  @cached_result('dependency_factor')
   def get_dependency_factor(self) -> List[List[int]]:
     """
     Retorna los factores de dependencia como una lista de listas.
@@ -199,94 +505,240 @@ class Table:
   def __repr__(self):
     return f"Table(columns={self.columns})"
 
-  def calculate_chi_squared(self) -> Tuple[float, str]:
+  @instrumentation.traced('table.calculate_chi_squared')
+  @cached_result('chi_squared')
+  def calculate_chi_squared(self) -> ChiSquaredResult:
     """
     Calcula el valor de chi-cuadrado para las columnas seleccionadas.
 
-    :return: Tupla con el valor de chi-cuadrado, los pasos del cálculo y el resultado final en formato de cadena.
+    :return: Resultado con los valores observados y esperados, los componentes, el estadístico, los grados de
+             libertad y el valor p de la distribución chi-cuadrado. Los pasos del cálculo se obtienen como texto
+             con `format_steps` y `format_result`.
     """
     if self.contingency_table is None:
       self.get_contingency_table()
-    
-    name1, name2 = self.get_names()
-    
-    # Valores observados
-    o_11 = self.contingency_table.at[name1, name2]
-    o_12 = self.contingency_table.at[name1, f'~{name2}']
-    o_21 = self.contingency_table.at[f'~{name1}', name2]
-    o_22 = self.contingency_table.at[f'~{name1}', f'~{name2}']
-    
-    # Totales marginales
-    n1_total = self.contingency_table.at[name1, 'All']
-    n0_total = self.contingency_table.at[f'~{name1}', 'All']
-    total_n2 = self.contingency_table.at['All', name2]
-    total_n0 = self.contingency_table.at['All', f'~{name2}']
-    grand_total = self.contingency_table.at['All', 'All']
-
-    # Valores esperados
-    e_11 = (n1_total * total_n2) / grand_total
-    e_12 = (n1_total * total_n0) / grand_total
-    e_21 = (n0_total * total_n2) / grand_total
-    e_22 = (n0_total * total_n0) / grand_total
 
-    # Componentes del cálculo de chi-cuadrado
-    n1 = (o_11 - e_11)**2 / e_11 if e_11 != 0 else 0
-    n2 = (o_12 - e_12)**2 / e_12 if e_12 != 0 else 0
-    n3 = (o_21 - e_21)**2 / e_21 if e_21 != 0 else 0
-    n4 = (o_22 - e_22)**2 / e_22 if e_22 != 0 else 0
-
-    # Suma de componentes para obtener el valor de chi-cuadrado
-    chi_squared = n1 + n2 + n3 + n4
+    # Valores observados y esperados
+    observed = self._split_contingency_table()[0]
+    expected = self._get_expected()
 
-    # Pasos detallados del cálculo
-    steps = (
-      f"({o_11} - {e_11:.2f})^2 / {e_11:.2f} = {n1:.4f}, "
-      f"({o_12} - {e_12:.2f})^2 / {e_12:.2f} = {n2:.4f}, "
-      f"({o_21} - {e_21:.2f})^2 / {e_21:.2f} = {n3:.4f}, "
-      f"({o_22} - {e_22:.2f})^2 / {e_22:.2f} = {n4:.4f}"
-    )
-    result_string = f"X^2 = {n1:.4f} + {n2:.4f} + {n3:.4f} + {n4:.4f} = {chi_squared:.4f}"
+    # Componentes del cálculo de chi-cuadrado
+    with np.errstate(divide='ignore', invalid='ignore'):
+      components = np.where(expected != 0, (observed - expected)**2 / expected, 0.0)
 
-    return chi_squared, steps, result_string
+    df = self.get_degrees_of_freedom()
+    statistic = components.sum()
+    p_value = float(chi2_sf(statistic, df)) if df > 0 else 1.0
+    return ChiSquaredResult(observed, expected, components, df, p_value)
 
-  def determine_significance(self, chi_squared: float) -> str:
+  def determine_significance(self, chi_squared: float, df: int = 1, p_value: float = None, method: str = 'chi2') -> str:
     """
-    Determina la significancia del valor de chi-cuadrado calculado.
+    Determina la significancia del valor de chi-cuadrado calculado a partir de su valor p exacto.
 
     :param chi_squared: Valor de chi-cuadrado calculado.
-    :return: Una cadena que indica el nivel de significancia y las comparaciones con valores críticos.
-    """
-    # Grados de libertad para una tabla 2x2 es (filas-1) * (columnas-1) = 1
-    df = 1
-    
-    # Valores críticos para la distribución chi-cuadrado con df=1
-    critical_values = {
-      '95%': 3.84,
-      '99%': 6.63,
-      '99.99%': 15.1367
-    }
-    
+    :param df: Grados de libertad, (filas-1) * (columnas-1); los valores críticos solo aplican a 1 grado de libertad.
+    :param p_value: Valor p ya calculado (por ejemplo, de la prueba exacta de Fisher); si se omite se calcula con chi-cuadrado.
+    :param method: 'chi2' compara con los valores críticos (o con el valor p si df > 1); 'fisher' compara el valor p con los niveles de significancia.
+    :return: Una cadena que indica el nivel de significancia, las comparaciones con valores críticos y el valor p.
+    """
+    if p_value is None:
+      p_value = float(chi2_sf(chi_squared, df))
+
     # Inicializar significancia y mensajes
     significance = "No se rechaza hipótesis de independencia"
     messages = []
 
-    if chi_squared > critical_values['95%']:
-      significance = "Dependientes por confianza de 95%"
-      messages.append(f"{chi_squared:.4f} > {critical_values['95%']}, entonces SÍ se rechaza hipótesis de independencia con confianza de 95%")
+    if method == 'fisher' or df != 1:
+      if method == 'fisher':
+        messages.append("Frecuencias esperadas pequeñas: se usa la prueba exacta de Fisher")
+      for label, alpha in SIGNIFICANCE_LEVELS.items():
+        if p_value < alpha:
+          significance = f"Dependientes por confianza de {label}"
+          messages.append(f"p = {p_value:.4g} < {alpha}, entonces SÍ se rechaza hipótesis de independencia con confianza de {label}")
+        else:
+          messages.append(f"p = {p_value:.4g} >= {alpha}, entonces NO se rechaza hipótesis de independencia con confianza de {label}")
     else:
-      messages.append(f"{chi_squared:.4f} < {critical_values['95%']}, entonces NO se rechaza hipótesis de independencia con confianza de 95%")
-    if chi_squared > critical_values['99%']:
-      significance = "Dependientes por confianza de 99%"
-      messages.append(f"{chi_squared:.4f} > {critical_values['99%']}, entonces SÍ se rechaza hipótesis de independencia con confianza de 99%")
+      for label, critical_value in CRITICAL_VALUES.items():
+        if chi_squared > critical_value:
+          significance = f"Dependientes por confianza de {label}"
+          messages.append(f"{chi_squared:.4f} > {critical_value}, entonces SÍ se rechaza hipótesis de independencia con confianza de {label}")
+        else:
+          messages.append(f"{chi_squared:.4f} < {critical_value}, entonces NO se rechaza hipótesis de independencia con confianza de {label}")
+    messages.append(f"Valor p = {p_value:.4g}")
+
+    return significance + "\n" + "\n".join(messages)
+
+  @instrumentation.traced('table.test_independence')
+  def test_independence(self) -> Tuple[float, str]:
+    """
+    Prueba la independencia de las columnas seleccionadas. En una tabla 2x2, si alguna frecuencia esperada es
+    menor que `exact_threshold` se usa la prueba exacta de Fisher en lugar de la aproximación chi-cuadrado.
+
+    :return: Tupla con el valor p y el método usado ('chi2' o 'fisher').
+    """
+    entry = self.cache.entry(self._cache_key())
+    name = ('independence_test', self.exact_threshold)
+    if name not in entry:
+      self.get_contingency_table()
+      observed = self._split_contingency_table()[0]
+      df = self.get_degrees_of_freedom()
+      if df == 0:
+        # Con un solo nivel en alguna columna no hay nada que probar
+        entry[name] = (1.0, 'chi2')
+      elif observed.shape == (2, 2) and self.exact_threshold is not None and self._get_expected().min() < self.exact_threshold:
+        entry[name] = (fisher_exact(observed), 'fisher')
+      else:
+        entry[name] = (self.calculate_chi_squared().p_value, 'chi2')
+    return entry[name]
+
+  def calculate_p_value(self) -> float:
+    """
+    Calcula el valor p de la prueba de independencia para las columnas seleccionadas.
+
+    :return: Valor p (chi-cuadrado con (filas-1) * (columnas-1) grados de libertad, o exacto de Fisher en tablas 2x2 con frecuencias esperadas pequeñas).
+    """
+    p_value, _ = self.test_independence()
+    return p_value
+
+  def permutation_test(self, n_permutations: int = 10000, workers: int = None, seed: int = None) -> float:
+    """
+    Calcula un valor p empírico barajando una de las columnas seleccionadas.
+
+    :param n_permutations: Número de permutaciones.
+    :param workers: Procesos a usar (por defecto, el número de CPUs).
+    :param seed: Semilla para reproducir el resultado.
+    :return: Valor p empírico.
+    """
+    self.get_contingency_table()
+    observed = self._split_contingency_table()[0]
+    if observed.shape != (2, 2):
+      raise ValueError("La prueba de permutación solo está disponible para tablas 2x2.")
+    return float(permutation_p_values(observed, n_permutations, workers, seed))
+
+  def get_co_occurrence_matrix(self) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Obtiene la matriz de co-ocurrencia de todas las columnas (X^T X), que se mantiene actualizada con cada cambio.
+
+    :return: Tupla con la matriz de co-ocurrencia (k x k), las sumas por columna (k) y el total de filas.
+    """
+    return self.co_occurrence.copy(), np.diagonal(self.co_occurrence).copy(), self.row_count
+
+  @instrumentation.traced('table.co_occurrence')
+  def _compute_co_occurrence(self) -> np.ndarray:
+    """
+    Calcula la matriz de co-ocurrencia desde cero en una sola pasada vectorizada, repartiendo las filas entre
+    `workers` procesos cuando hay suficientes filas. Si todas las columnas binarias son dispersas (SparseColumn),
+    se cuentan los pares de ítems de cada fila en lugar de recorrer los bits. Solo se incluyen las columnas
+    binarias; las filas de las columnas categóricas quedan en 0.
+
+    :return: Matriz de co-ocurrencia (k x k).
+    """
+    k = len(self.columns)
+    co_occurrence = np.zeros((k, k), dtype=np.int64)
+    binary = [i for i, column in enumerate(self.columns) if column.is_binary]
+    if not binary or self.row_count == 0:
+      return co_occurrence
+
+    if all(isinstance(self.columns[i], SparseColumn) for i in binary):
+      # Con columnas dispersas el conteo recorre solo los unos de cada columna
+      rows = [self.columns[i].rows for i in binary]
+      co_occurrence[np.ix_(binary, binary)] = sparse_co_occurrence(rows, self.row_count)
+      instrumentation.count('table.nonzeros', sum(len(column_rows) for column_rows in rows))
     else:
-      messages.append(f"{chi_squared:.4f} < {critical_values['99%']}, entonces NO se rechaza hipótesis de independencia con confianza de 99%")
-    if chi_squared > critical_values['99.99%']:
-      significance = "Dependientes por confianza de 99.99%"
-      messages.append(f"{chi_squared:.4f} > {critical_values['99.99%']}, entonces SÍ se rechaza hipótesis de independencia con confianza de 99.99%")
+      bits = [self.columns[i].bits for i in binary]
+      co_occurrence[np.ix_(binary, binary)] = parallel_co_occurrence(bits, self.workers)
+      instrumentation.count('table.cells', self.row_count * len(binary))
+
+    return co_occurrence
+
+  @instrumentation.traced('table.calculate_all_pairs')
+  def calculate_all_pairs(self) -> dict:
+    """
+    Calcula tablas de contingencia, chi-cuadrado, factor de dependencia y significancia para todos los
+    pares de columnas a partir de la matriz de co-ocurrencia. Todos los resultados son matrices de NumPy
+    indexadas por [i, j], donde i y j son índices de columna.
+
+    :return: Diccionario con los nombres de las columnas, el total de filas, las celdas observadas y esperadas
+             (k x k x 2 x 2, orden [[11, 10], [01, 00]]), chi-cuadrado (k x k), valor p (k x k), pares resueltos
+             con la prueba exacta de Fisher (k x k), factor de dependencia (k x k x 2 x 2) y significancia
+             (k x k, número de niveles de confianza superados).
+    """
+    if not self.are_all_columns_binary():
+      raise ValueError("El análisis de todos los pares solo está disponible para columnas binarias.")
+    instrumentation.count('table.pairs', len(self.columns) * (len(self.columns) - 1) // 2)
+    co_occurrence, sums, total = self.get_co_occurrence_matrix()
+    rows = sums[:, None]
+    cols = sums[None, :]
+
+    observed = np.empty(co_occurrence.shape + (2, 2), dtype=np.int64)
+    observed[..., 0, 0] = co_occurrence
+    observed[..., 0, 1] = rows - co_occurrence
+    observed[..., 1, 0] = cols - co_occurrence
+    observed[..., 1, 1] = total - rows - cols + co_occurrence
+
+    # Totales marginales de cada par: filas (columna i) y columnas (columna j)
+    row_totals = np.stack(np.broadcast_arrays(rows, total - rows), axis=-1).astype(np.float64)
+    col_totals = np.stack(np.broadcast_arrays(cols, total - cols), axis=-1).astype(np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+      expected = row_totals[..., :, None] * col_totals[..., None, :] / total
+      components = np.where(expected != 0, (observed - expected) ** 2 / expected, 0.0)
+    # La regla j -> i de un par es la regla i -> j del par (j, i), así que basta una dirección
+    dependency_factor = rule_metrics(observed, ('dependency_factor',), both_directions=False)['dependency_factor']
+    dependency_factor = dependency_factor.reshape(observed.shape)
+    chi_squared = components.sum(axis=(-2, -1))
+    p_value = chi2_sf(chi_squared, 1)
+
+    significance = np.zeros(chi_squared.shape, dtype=np.int8)
+    for critical_value in CRITICAL_VALUES.values():
+      significance += chi_squared > critical_value
+
+    # Prueba exacta de Fisher para los pares con frecuencias esperadas pequeñas, todos en una sola llamada
+    exact = np.zeros(chi_squared.shape, dtype=bool)
+    if self.exact_threshold is not None:
+      exact = np.triu(expected.min(axis=(-2, -1)) < self.exact_threshold, k=1)
+      rows_exact, cols_exact = np.nonzero(exact)
+      exact_p_value = fisher_exact_p_values(observed[rows_exact, cols_exact])
+      exact_significance = (exact_p_value[:, None] < np.array(list(SIGNIFICANCE_LEVELS.values()))).sum(axis=1)
+      p_value[rows_exact, cols_exact] = p_value[cols_exact, rows_exact] = exact_p_value
+      significance[rows_exact, cols_exact] = significance[cols_exact, rows_exact] = exact_significance
+      exact |= exact.T
+
+    return {
+      'names': [column.name for column in self.columns],
+      'total': total,
+      'observed': observed,
+      'expected': expected,
+      'chi_squared': chi_squared,
+      'p_value': p_value,
+      'exact': exact,
+      'dependency_factor': dependency_factor,
+      'significance': significance
+    }
+
+  @instrumentation.traced('table.mine_rules')
+  def mine_rules(self, min_support: float = 0.1, min_confidence: float = 0.5, max_length: Optional[int] = None) -> List[RuleResult]:
+    """
+    Busca todas las reglas de asociación de k ítems cuyo conjunto supera el soporte mínimo y cuya confianza
+    supera la confianza mínima, usando Apriori sobre los bits empaquetados de las columnas. Con el histograma de
+    patrones, la frecuencia de todos los conjuntos sale de él en O(k 2^k) sin recorrer las filas.
+
+    :param min_support: Soporte mínimo, como fracción del total de filas (0 a 1).
+    :param min_confidence: Confianza mínima (0 a 1).
+    :param max_length: Número máximo de ítems por regla (sin límite por defecto).
+    :return: Lista de reglas (ver `association_rules`) con su cobertura, confianza, chi-cuadrado, valor p y factor de dependencia.
+    """
+    if not self.are_all_columns_binary():
+      raise ValueError("La búsqueda de reglas solo está disponible para columnas binarias.")
+    if self.pattern_histogram is not None:
+      min_count = max(1, math.ceil(min_support * self.row_count))
+      itemsets = pattern_itemsets(self.pattern_histogram, min_count, max_length)
     else:
-      messages.append(f"{chi_squared:.4f} < {critical_values['99.99%']}, entonces NO se rechaza hipótesis de independencia con confianza de 99.99%")
-    
-    return significance + "\n" + "\n".join(messages)
+      itemsets = frequent_itemsets(self.columns, min_support, max_length, self.co_occurrence)
+    rules = association_rules(itemsets, [column.name for column in self.columns], self.row_count, min_confidence)
+    instrumentation.count('table.itemsets', len(itemsets))
+    instrumentation.count('table.rules', len(rules))
+    return rules
 
 if __name__ == "__main__":
   # Creando instancias de Column
@@ -323,14 +775,19 @@ if __name__ == "__main__":
 
   # Imprimir las columnas de la tabla
   for col in table.columns:
-    print(f"Column Name: {col.name}, Column Values: {col.values}")
+    print(f"Column Name: {col.name}, Column Values: {col.values.tolist()}")
 
   # Obtener valor de chi-cuadrado, pasos de cálculo y cadena de resultados
-  chi_squared_value, chi_squared_steps, result_string = table.calculate_chi_squared()
+  chi_squared = table.calculate_chi_squared()
+  chi_squared_value = chi_squared.statistic
   print(f"Chi-squared value: {chi_squared_value}")
-  print(f"Calculation steps: {chi_squared_steps}")
-  print(result_string)
+  print(f"Calculation steps: {chi_squared.format_steps()}")
+  print(chi_squared.format_result())
 
   # Determinar significancia
   significance = table.determine_significance(chi_squared_value)
   print(f"Significance: {significance}")
+
+  # Analizar todos los pares de columnas a la vez
+  all_pairs = table.calculate_all_pairs()
+  print(f"Chi-cuadrado de todos los pares: \n{all_pairs['chi_squared']}")
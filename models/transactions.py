@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+from .column import Column, SparseColumn
+from .importer import DEFAULT_CHUNK_ROWS, category_labels, iter_chunks
+from .instrumentation import instrumentation
+
+class _Encoder:
+  # Asigna a cada valor distinto un código entero en orden de aparición. Cada bloque se codifica por separado
+  # y al final se unen sus valores distintos con una sola codificación global, sin recorrer valores en Python
+  def __init__(self):
+    self._codes = []
+    self._uniques = []
+
+  def add(self, values: np.ndarray):
+    codes, uniques = pd.factorize(values)
+    self._codes.append(codes)
+    self._uniques.append(np.asarray(uniques, dtype=object))
+
+  def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+    if not self._codes:
+      return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=object)
+    global_codes, values = pd.factorize(np.concatenate(self._uniques))
+    offsets = np.cumsum([0] + [len(uniques) for uniques in self._uniques[:-1]])
+    codes = np.concatenate([global_codes[offset + local] for offset, local in zip(offsets, self._codes)])
+    return codes, np.asarray(values, dtype=object)
+
+class Basket:
+  """
+  Matriz dispersa ítem x transacción en formato CSR: para cada ítem se guardan, ordenados, los índices de las
+  transacciones que lo contienen. La memoria usada depende del número de pares (transacción, ítem) distintos
+  y no de ítems x transacciones.
+  """
+
+  def __init__(self, items: List[str], transactions: np.ndarray, indptr: np.ndarray, indices: np.ndarray):
+    self.items = items
+    self.transactions = transactions
+    self.indptr = indptr
+    self.indices = indices
+
+  @property
+  def n_transactions(self) -> int:
+    return len(self.transactions)
+
+  @property
+  def nnz(self) -> int:
+    return len(self.indices)
+
+  def item_transactions(self, item: int) -> np.ndarray:
+    """
+    Obtiene las transacciones que contienen un ítem.
+
+    :param item: Índice del ítem.
+    :return: Índices ordenados de las transacciones.
+    """
+    return self.indices[self.indptr[item]:self.indptr[item + 1]]
+
+  def item_counts(self) -> np.ndarray:
+    """
+    Cuenta las transacciones que contienen cada ítem.
+
+    :return: Arreglo con la frecuencia de cada ítem.
+    """
+    return np.diff(self.indptr)
+
+  def to_columns(self, min_count: int = 1, sparse: bool = False) -> List[Column]:
+    """
+    Convierte la matriz en columnas binarias (una por ítem, una fila por transacción) que se pueden cargar
+    en una Table. Los bits de cada columna se llenan directamente desde sus índices, sin crear valores 0/1.
+
+    :param min_count: Frecuencia mínima de los ítems incluidos.
+    :param sparse: Si es True, se crean columnas dispersas (SparseColumn) que comparten los índices de la matriz,
+                   adecuadas para miles de ítems poco frecuentes.
+    :return: Lista de columnas.
+    """
+    n = self.n_transactions
+    columns = []
+    for item, name in enumerate(self.items):
+      rows = self.item_transactions(item)
+      if len(rows) < min_count:
+        continue
+      if sparse:
+        columns.append(SparseColumn(name, rows, n))
+        continue
+      # Cada transacción aparece una sola vez por ítem, así que sumar los bits de un byte equivale a unirlos
+      bits = np.bincount(rows >> 3, weights=0x80 >> (rows & 7), minlength=(n + 7) // 8).astype(np.uint8)
+      columns.append(Column.from_packed(name, bits, n))
+    return columns
+
+@instrumentation.traced('import.transactions')
+def import_transactions(path: str, transaction_column: Optional[str] = None, item_column: Optional[str] = None,
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                        progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Basket:
+  """
+  Importa un archivo .xlsx o .csv en formato largo (una fila por par transacción, ítem) bloque por bloque.
+  Cada bloque se codifica a enteros y solo se guardan los pares de códigos; nunca se crea la tabla ancha.
+  Las filas sin transacción o sin ítem se ignoran y un ítem repetido en una transacción cuenta una vez.
+
+  :param path: Ruta del archivo.
+  :param transaction_column: Nombre de la columna con el identificador de la transacción (por defecto la primera).
+  :param item_column: Nombre de la columna con el ítem (por defecto la segunda).
+  :param chunk_rows: Número de filas por bloque.
+  :param progress: Función opcional que recibe las filas leídas y el total estimado de filas.
+  :return: Matriz dispersa ítem x transacción, con los ítems y las transacciones en orden de aparición.
+  """
+  transactions = _Encoder()
+  items = _Encoder()
+  rows_read = 0
+  for names, block, total in iter_chunks(path, chunk_rows):
+    if rows_read == 0:
+      if len(names) < 2:
+        raise ValueError("El archivo debe tener una columna de transacciones y una de ítems.")
+      for name in (transaction_column, item_column):
+        if name is not None and name not in names:
+          raise ValueError(f"No existe la columna: {name}")
+      transaction_index = names.index(transaction_column) if transaction_column is not None else 0
+      item_index = names.index(item_column) if item_column is not None else 1
+
+    with instrumentation.span('import.encode', rows=len(block)):
+      transaction_values, item_values = block[:, transaction_index], block[:, item_index]
+      present = ~(pd.isna(transaction_values) | pd.isna(item_values))
+      transactions.add(transaction_values[present])
+      # Un bloque con celdas vacías se lee como float: el ítem 5 debe seguir siendo '5' y no '5.0'
+      items.add(category_labels(item_values[present]))
+    rows_read += len(block)
+    instrumentation.count('import.rows', len(block))
+    if progress:
+      progress(rows_read, total)
+
+  with instrumentation.span('import.sparse'):
+    transaction_codes, transaction_values = transactions.finish()
+    item_codes, item_values = items.finish()
+    n_transactions, n_items = len(transaction_values), len(item_values)
+    # Ordenar por (ítem, transacción) y quitar los pares repetidos
+    keys = np.sort(item_codes * n_transactions + transaction_codes)
+    if len(keys):
+      keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    indices = keys % max(n_transactions, 1)
+    indptr = np.zeros(n_items + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // max(n_transactions, 1), minlength=n_items), out=indptr[1:])
+  return Basket(item_values.tolist(), transaction_values, indptr, indices)
+
+if __name__ == "__main__":
+  import os
+  import tempfile
+
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'ventas.csv')
+    pd.DataFrame({
+      'ticket': [1, 1, 2, 2, 2, 3, 4, 4, 1],
+      'producto': ['Pan', 'Leche', 'Pan', 'Huevo', 'Leche', 'Huevo', 'Pan', 'Leche', 'Pan']
+    }).to_csv(path, index=False)
+    basket = import_transactions(path)
+    print(f"Ítems: {basket.items}, transacciones: {basket.n_transactions}, pares: {basket.nnz}")
+    for column in basket.to_columns():
+      print(f"{column.name}: {column.values.tolist()}")
+    for column in basket.to_columns(sparse=True):
+      print(f"{column.name} (dispersa): filas {column.rows.tolist()}")
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+# Valores aceptados en los arreglos de objetos: los dos primeros son ceros y los dos últimos unos
+_OBJECT_LEVELS = pd.Index([0, '0', 1, '1'], dtype=object)
+
+# Tipos lógicos, que se distinguen de 1 y 0 por el tipo de cada celda
+_LOGICAL_TYPES = pd.Index([bool, np.bool_], dtype=object)
+_cell_type = np.frompyfunc(type, 1, 1)
+
+class InvalidDataError(ValueError):
+  """
+  Error lanzado cuando un archivo importado contiene un valor distinto de 0 o 1.
+  """
+  def __init__(self, message: str, row: int, column: str):
+    super().__init__(message)
+    self.row = row
+    self.column = column
+
+def to_binary(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+  """
+  Convierte un bloque de valores a 0/1 de forma vectorizada, revisando primero su tipo de datos:
+  los bloques numéricos se comparan directamente y los de texto u objetos (celdas mezcladas de Excel)
+  aceptan tanto los números 0 y 1 como los textos '0' y '1'. Los valores lógicos (True y False) no son
+  válidos, aunque Python los compare como iguales a 1 y 0.
+
+  :param block: Arreglo (filas x columnas) con los valores leídos.
+  :return: Tupla con el bloque convertido a uint8 y una máscara con las celdas válidas.
+  """
+  if block.dtype.kind == 'b':
+    return np.zeros(block.shape, dtype=np.uint8), np.zeros(block.shape, dtype=bool)
+  if block.dtype.kind in 'iuf':
+    valid = (block == 0) | (block == 1)
+    return np.where(valid, block, 0).astype(np.uint8), valid
+  if block.dtype.kind == 'O':
+    # Una sola búsqueda en una tabla hash por celda; 1 y 1.0 caen en la misma entrada, pero también True,
+    # así que las celdas lógicas se descartan por su tipo
+    cells = block.ravel()
+    codes = _OBJECT_LEVELS.get_indexer(cells)
+    codes[_LOGICAL_TYPES.get_indexer(_cell_type(cells)) >= 0] = -1
+    codes = codes.reshape(block.shape)
+    return (codes >= 2).astype(np.uint8), codes >= 0
+  text = block.astype(str)
+  ones = text == '1'
+  return ones.astype(np.uint8), ones | (text == '0')
+
+def check_block(block: np.ndarray, valid: np.ndarray, names: List[str], rows_read: int):
+  """
+  Lanza InvalidDataError con la posición del primer valor no válido de un bloque.
+
+  :param block: Bloque leído del archivo.
+  :param valid: Máscara de celdas válidas retornada por `to_binary`.
+  :param names: Nombres de las columnas.
+  :param rows_read: Filas leídas antes de este bloque.
+  """
+  if valid.all():
+    return
+  row, col = np.argwhere(~valid)[0]
+  # +2 por la fila de encabezados y porque las filas del archivo empiezan en 1
+  raise InvalidDataError(
+    f"Valor no válido '{block[row, col]}' en la fila {rows_read + row + 2}, columna '{names[col]}'. "
+    f"El valor debe ser 0 o 1.",
+    rows_read + int(row), names[col]
+  )
+
+class ValidationErrors:
+  """
+  Índice compacto de las celdas con valores distintos de 0 o 1: un arreglo de filas, uno de columnas y el texto
+  original de cada celda (vacío si la celda no tiene valor), acumulados bloque por bloque durante la importación.
+  """
+
+  def __init__(self):
+    self._rows = []
+    self._cols = []
+    self._texts = []
+    self.names = []
+
+  def add(self, block: np.ndarray, valid: np.ndarray, rows_read: int):
+    """
+    Agrega las celdas no válidas de un bloque.
+
+    :param block: Bloque leído del archivo.
+    :param valid: Máscara de celdas válidas retornada por `to_binary`.
+    :param rows_read: Filas leídas antes de este bloque.
+    """
+    if valid.all():
+      return
+    rows, cols = np.nonzero(~valid)
+    self._rows.append((rows + rows_read).astype(np.int64))
+    self._cols.append(cols.astype(np.int32))
+    cells = block[rows, cols]
+    # Las celdas vacías (None o NaN) se guardan como texto vacío
+    self._texts.append(np.where(pd.isna(cells), '', cells.astype(str)))
+
+  def __len__(self) -> int:
+    return sum(len(rows) for rows in self._rows)
+
+  @property
+  def rows(self) -> np.ndarray:
+    return np.concatenate(self._rows) if self._rows else np.zeros(0, dtype=np.int64)
+
+  @property
+  def cols(self) -> np.ndarray:
+    return np.concatenate(self._cols) if self._cols else np.zeros(0, dtype=np.int32)
+
+  @property
+  def texts(self) -> np.ndarray:
+    return np.concatenate(self._texts) if self._texts else np.zeros(0, dtype=str)
+
+  def first_message(self) -> str:
+    """
+    Describe la primera celda no válida con el mismo mensaje que InvalidDataError.
+
+    :return: Mensaje, o una cadena vacía si no hay errores.
+    """
+    if not self._rows:
+      return ""
+    row, col, text = self._rows[0][0], self._cols[0][0], self._texts[0][0]
+    name = self.names[col] if col < len(self.names) else col
+    if not text:
+      return f"Celda vacía en la fila {row + 2}, columna '{name}'. El valor debe ser 0 o 1."
+    return f"Valor no válido '{text}' en la fila {row + 2}, columna '{name}'. El valor debe ser 0 o 1."
+
+if __name__ == "__main__":
+  import time
+  block = np.random.default_rng(0).integers(0, 2, (1_000_000, 10)).astype(object)
+  block[[5, 70_000], [2, 7]] = 'x', 3
+  start = time.perf_counter()
+  values, valid = to_binary(block)
+  errors = ValidationErrors()
+  errors.add(block, valid, 0)
+  print(f"{block.size} celdas validadas en {time.perf_counter() - start:.3f} s")
+  print(f"Celdas no válidas: {list(zip(errors.rows.tolist(), errors.cols.tolist(), errors.texts.tolist()))}")
@@ -0,0 +1,128 @@
+import os
+import numpy as np
+from typing import Callable, List, Optional
+from .column import Column, CategoricalColumn
+from .importer import import_columns
+from .instrumentation import instrumentation
+from .validation import ValidationErrors
+
+# Versión del formato del caché; cambiarla invalida todos los cachés escritos antes
+CACHE_VERSION = 1
+
+def cache_path(path: str) -> str:
+  """
+  Obtiene la ruta del archivo de caché que acompaña a un archivo de datos (en la misma carpeta).
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :return: Ruta del caché, por ejemplo `src/.PAN.xlsx.mechi.npz`.
+  """
+  directory, name = os.path.split(os.path.abspath(path))
+  return os.path.join(directory, f".{name}.mechi.npz")
+
+def _source_key(path: str) -> np.ndarray:
+  # Identifica el contenido del archivo de origen por su ruta, tamaño y fecha de modificación
+  status = os.stat(path)
+  return np.array([os.path.abspath(path), str(status.st_size), str(status.st_mtime_ns), str(CACHE_VERSION)])
+
+@instrumentation.traced('cache.read')
+def read_cache(path: str) -> Optional[List[Column]]:
+  """
+  Lee las columnas guardadas en el caché de un archivo si el caché sigue correspondiendo a ese archivo.
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :return: Lista de columnas, o None si no hay caché o el archivo cambió desde que se escribió.
+  """
+  try:
+    with np.load(cache_path(path), allow_pickle=False) as cache:
+      if not np.array_equal(cache['source'], _source_key(path)):
+        return None
+      names = cache['names'].tolist()
+      rows = int(cache['rows'])
+      bits = cache['bits']
+      binary = cache['binary']
+      columns = []
+      packed = 0
+      for i, name in enumerate(names):
+        if binary[i]:
+          columns.append(Column.from_packed(name, bits[packed].copy(), rows))
+          packed += 1
+        else:
+          columns.append(CategoricalColumn.from_codes(name, cache[f'codes_{i}'], cache[f'levels_{i}'].tolist()))
+      return columns
+  except (OSError, KeyError, ValueError):
+    return None
+
+@instrumentation.traced('cache.write')
+def write_cache(path: str, columns: List[Column], source: Optional[np.ndarray] = None):
+  """
+  Escribe el caché de un archivo con los bits empaquetados de sus columnas. El archivo se reemplaza de forma
+  atómica; si la carpeta no permite escribir, el caché simplemente no se guarda.
+
+  :param path: Ruta del archivo .xlsx o .csv de origen.
+  :param columns: Columnas importadas del archivo.
+  :param source: Identificación del archivo tomada antes de importarlo, para no asociar el caché a una versión
+                 del archivo modificada durante la importación.
+  """
+  binary = np.array([column.is_binary for column in columns], dtype=bool)
+  rows = len(columns[0]) if columns else 0
+  bits = [column.bits for column in columns if column.is_binary]
+  arrays = {
+    'source': _source_key(path) if source is None else source,
+    'names': np.array([column.name for column in columns], dtype=str),
+    'rows': np.array(rows),
+    'binary': binary,
+    'bits': np.stack(bits) if bits else np.zeros((0, (rows + 7) // 8), dtype=np.uint8)
+  }
+  for i, column in enumerate(columns):
+    if not column.is_binary:
+      arrays[f'codes_{i}'] = column.codes
+      arrays[f'levels_{i}'] = np.array(column.levels, dtype=str)
+
+  target = cache_path(path)
+  temporary = f"{target}.{os.getpid()}.tmp"
+  try:
+    with open(temporary, 'wb') as file:
+      np.savez(file, **arrays)
+    os.replace(temporary, target)
+  except OSError:
+    if os.path.exists(temporary):
+      os.remove(temporary)
+
+def load_columns(path: str, progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                 categorical: bool = False, use_cache: bool = True,
+                 errors: Optional[ValidationErrors] = None) -> List[Column]:
+  """
+  Carga las columnas de un archivo usando su caché si existe y está al día; en otro caso importa el archivo
+  y escribe el caché para las siguientes cargas.
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :param progress: Función opcional que recibe las filas leídas y el total estimado de filas.
+  :param categorical: Si es True, acepta columnas categóricas (ver `import_columns`).
+  :param use_cache: Si es False, siempre se importa el archivo y no se escribe el caché.
+  :param errors: Índice opcional de valores no válidos (ver `import_columns`); un archivo con errores no se guarda
+                 en el caché, para que se vuelvan a detectar en la siguiente carga.
+  :return: Lista de columnas importadas.
+  """
+  if use_cache:
+    columns = read_cache(path)
+    # Un caché con columnas categóricas no sirve para una importación que solo acepta 0 y 1
+    if columns is not None and (categorical or all(column.is_binary for column in columns)):
+      instrumentation.count('cache.hits')
+      if progress:
+        rows = len(columns[0]) if columns else 0
+        progress(rows, rows)
+      return columns
+
+  instrumentation.count('cache.misses')
+  source = _source_key(path)
+  columns = import_columns(path, progress=progress, categorical=categorical, errors=errors)
+  if use_cache and not errors:
+    write_cache(path, columns, source)
+  return columns
+
+if __name__ == "__main__":
+  import time
+  for attempt in ("primera carga", "carga desde el caché"):
+    start = time.perf_counter()
+    columns = load_columns("src/PAN.xlsx")
+    print(f"{attempt}: {len(columns)} columnas en {time.perf_counter() - start:.4f} s")
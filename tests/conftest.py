@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Las pruebas importan `models` y `views` desde la raíz del repositorio, como `main.py` y `cli.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Las pruebas de los modelos de Qt no necesitan pantalla
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
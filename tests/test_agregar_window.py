@@ -0,0 +1,60 @@
+import threading
+import pytest
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+from PyQt5.QtCore import QThreadPool
+from models.table import AnalysisCache
+
+@pytest.fixture(scope='module')
+def app():
+  return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def test_table_is_locked_while_results_are_computed(app):
+  from views.agregar_window import AgregarWindow
+  window = AgregarWindow()
+  for name in ('a', 'b'):
+    window.column_name_input.setText(name)
+    window.add_column()
+  for _ in range(20):
+    window.add_row()
+  window.generate_random_binaries()
+  for checkbox in window.checkboxes:
+    checkbox.setChecked(True)
+
+  window.show_results()
+  # Antes de que aparezca el diálogo de avance la tabla ya no se puede editar
+  assert not window.table.isEnabled() and not window.add_row_button.isEnabled()
+
+  QThreadPool.globalInstance().waitForDone()
+  app.processEvents()
+  assert window.table.isEnabled() and window.show_results_button.isEnabled()
+  assert window.result_window is not None
+  window.result_window.close()
+
+def test_analysis_cache_is_thread_safe():
+  cache = AnalysisCache(maxsize=8)
+
+  def use_cache(offset: int):
+    for i in range(2000):
+      cache.entry((offset, i % 20))['value'] = i
+
+  threads = [threading.Thread(target=use_cache, args=(offset,)) for offset in range(8)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  assert len(cache) == 8
+
+def test_header_only_file_loads_an_empty_table(app, tmp_path):
+  from PyQt5.QtWidgets import QProgressDialog
+  from views.agregar_window import AgregarWindow, load_file
+  path = str(tmp_path / 'vacio.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n')
+  window = AgregarWindow()
+  window.progress_dialog = QProgressDialog()
+  window.load_columns(load_file(path))
+  assert window.table_model.column_names == ['a', 'b'] and window.table_model.rowCount() == 0
+  assert [checkbox.text() for checkbox in window.checkboxes] == ['a', 'b']
+  window.add_row()
+  assert window.table_model.rowCount() == 1 and window.data_table.row_count == 1
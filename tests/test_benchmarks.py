@@ -0,0 +1,19 @@
+import json
+from benchmarks.run_benchmarks import main, synthetic_columns
+
+def test_synthetic_columns_keep_padding_bits_clear():
+  for column in synthetic_columns(13, 3):
+    assert len(column) == 13
+    assert column.count() == column.values.sum()
+    assert column.bits[-1] & 0b111 == 0
+
+def test_quick_report_can_be_compared(tmp_path, capsys):
+  report = str(tmp_path / 'reporte.json')
+  assert main(['--rows', '64', '--columns', '2', '--repeat', '1', '--max-import-cells', '0', '-o', report]) == 0
+  with open(report, encoding='utf-8') as file:
+    results = json.load(file)['results']
+  assert {result['benchmark'] for result in results} >= {'set_columns', 'calculate_all_pairs'}
+  assert all(result['rows'] == 64 and result['cells_per_second'] > 0 for result in results)
+  assert main(['--rows', '64', '--columns', '2', '--repeat', '1', '--max-import-cells', '0',
+               '-o', str(tmp_path / 'nuevo.json'), '--compare', report]) == 0
+  assert 'calculate_all_pairs' in capsys.readouterr().out
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+from PyQt5.QtCore import Qt
+from models.column import Column
+from models.table import Table, AnalysisCache
+from models.validation import ValidationErrors
+
+@pytest.fixture(scope='module')
+def app():
+  return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def model(app):
+  from views.binary_table_model import BinaryTableModel
+  return BinaryTableModel(Table(cache=AnalysisCache()))
+
+def texts(model) -> list:
+  return [[model.data(model.index(row, col)) for col in range(model.columnCount())] for row in range(model.rowCount())]
+
+def test_edits_match_reference(model):
+  for name in ('a', 'b'):
+    model.add_column(name)
+  for _ in range(3):
+    model.add_row()
+  assert texts(model) == [['', ''], ['', ''], ['', '']]
+  assert not model.is_valid()
+
+  model.setData(model.index(0, 0), '1')
+  model.setData(model.index(1, 0), '0')
+  model.setData(model.index(2, 0), '7')
+  model.setData(model.index(0, 1), '1')
+  model.setData(model.index(1, 1), '1')
+  model.setData(model.index(2, 1), '0')
+  assert texts(model) == [['1', '1'], ['0', '1'], ['7', '0']]
+  assert model.data(model.index(2, 0), Qt.BackgroundRole) is not None
+  assert model.invalid_cells().tolist() == [[2, 0]]
+  assert model.column_values(0).tolist() == [1, 0, model.EMPTY]
+  # Las celdas no válidas cuentan como 0 en la Table
+  assert model.table.co_occurrence.tolist() == [[1, 1], [1, 2]]
+
+  model.setData(model.index(2, 0), '1')
+  assert model.is_valid()
+  model.add_column('c')
+  assert texts(model)[0] == ['1', '1', ''] and not model.is_valid()
+  model.remove_last_column()
+  model.add_row()
+  model.remove_last_row()
+  assert model.is_valid() and texts(model) == [['1', '1'], ['0', '1'], ['1', '0']]
+
+def test_imported_columns_are_not_copied(model):
+  values = np.random.default_rng(0).integers(0, 2, (2, 1000), dtype=np.uint8)
+  columns = [Column('a', values[0]), Column('b', values[1])]
+  errors = ValidationErrors()
+  block = np.array([[0, 'x'], [1, None]], dtype=object)
+  errors.add(block, np.array([[True, False], [True, False]]), 10)
+  model.set_columns(columns, errors=errors)
+
+  # Solo la columna con errores tiene máscara; los valores se leen de las columnas de la Table
+  assert model.table.columns[0] is columns[0]
+  assert model._empty[0] is None and model._empty[1].count() == 2
+  assert model.data(model.index(10, 1)) == 'x' and model.data(model.index(11, 1)) == ''
+  assert model.data(model.index(5, 0)) == str(values[0, 5])
+  assert model.invalid_cells().tolist() == [[10, 1], [11, 1]]
+
+  model.fill_random()
+  assert model.is_valid() and model.table.row_count == 1000
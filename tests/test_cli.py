@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+import pandas as pd
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_data(tmp_path) -> str:
+  path = str(tmp_path / 'datos.csv')
+  pd.DataFrame({'A': [1, 1, 1, 0, 0, 0, 0, 0, 1, 0], 'B': [1, 0, 0, 1, 1, 1, 0, 0, 1, 0]}).to_csv(path, index=False)
+  return path
+
+def test_pair_analysis(tmp_path):
+  output = str(tmp_path / 'salida.json')
+  assert cli.main([write_data(tmp_path), '--pair', 'A', 'B', '--no-cache', '-o', output]) == 0
+  with open(output, encoding='utf-8') as file:
+    record, = json.load(file)
+  assert record['observed'] == [[2, 2], [3, 3]]
+  assert record['df'] == 1 and record['item1'] == 'A' and record['item2'] == 'B'
+
+def test_missing_column_fails(tmp_path, capsys):
+  assert cli.main([write_data(tmp_path), '--pair', 'A', 'Z', '--no-cache']) == 1
+  assert 'Z' in capsys.readouterr().err
+
+def test_batch_mode_never_imports_pyqt(tmp_path):
+  code = (f"import sys, cli; cli.main([{write_data(tmp_path)!r}, '--all-pairs', '--no-cache', '-o', {os.devnull!r}]); "
+          "sys.exit('PyQt5' in sys.modules)")
+  assert subprocess.run([sys.executable, '-c', code], cwd=ROOT).returncode == 0
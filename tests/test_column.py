@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from models.column import Column, SparseColumn
+
+def test_count_and_and_count_match_dense_values():
+  rng = np.random.default_rng(0)
+  # 1001 filas: el último byte tiene relleno, que no debe contarse
+  first, second = rng.integers(0, 2, (2, 1001))
+  column1, column2 = Column('a', first), Column('b', second)
+  assert column1.count() == first.sum()
+  assert column1.and_count(column2) == (first & second).sum()
+  assert column1.values.tolist() == first.tolist()
+
+def test_edits_keep_bits_and_fingerprint_consistent():
+  column = Column('a', [1, 0, 1])
+  fingerprint = column.fingerprint()
+  for value in (1, 1, 0, 1, 0, 1, 1):
+    column.append(value)
+  assert column.values.tolist() == [1, 0, 1, 1, 1, 0, 1, 0, 1, 1]
+  column.set(1, 1)
+  assert column.get(1) == 1 and column.count() == 8
+  assert column.pop() == 1 and column.pop() == 1
+  column.set(1, 0)
+  for _ in range(5):
+    column.pop()
+  # Después de crecer y reducirse, el contenido y su hash vuelven a los originales
+  assert column.values.tolist() == [1, 0, 1]
+  assert column.fingerprint() == fingerprint
+  assert Column.from_packed('a', column.bits, 3).fingerprint() == fingerprint
+
+def test_invalid_values_and_indices():
+  with pytest.raises(ValueError):
+    Column('a', [0, 2])
+  column = Column('a', [0, 1])
+  with pytest.raises(IndexError):
+    column.get(2)
+  with pytest.raises(ValueError):
+    column.set(0, 2)
+  with pytest.raises(ValueError):
+    column.and_count(Column('b', [1]))
+
+def test_sparse_column_matches_packed_column():
+  rng = np.random.default_rng(7)
+  first, second = (rng.random((2, 203)) < 0.1).astype(np.uint8)
+  dense1, dense2 = Column('a', first), Column('b', second)
+  sparse1, sparse2 = SparseColumn.from_column(dense1), SparseColumn.from_column(dense2)
+  assert sparse1.bits.tolist() == dense1.bits.tolist()
+  assert sparse1.count() == dense1.count()
+  assert sparse1.and_count(sparse2) == sparse1.and_count(dense2) == dense1.and_count(sparse2) == dense1.and_count(dense2)
+
+  for column in (sparse1, dense1):
+    column.set(5, 1)
+    column.set(int(np.flatnonzero(first)[0]), 0)
+    column.append(1)
+    column.append(0)
+    assert column.pop() == 0
+  assert sparse1.values.tolist() == dense1.values.tolist()
+  assert [sparse1.get(i) for i in range(len(sparse1))] == dense1.values.tolist()
+
+def test_sparse_column_rejects_unsorted_rows():
+  with pytest.raises(ValueError):
+    SparseColumn('a', [3, 1], 5)
+  with pytest.raises(ValueError):
+    SparseColumn('a', [1, 5], 5)
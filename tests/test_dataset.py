@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.dataset import create_dataset, is_dataset, open_dataset
+
+def test_dataset_round_trip_across_blocks(tmp_path):
+  values = np.random.default_rng(6).integers(0, 2, (21, 3))
+  path = str(tmp_path / 'datos.csv')
+  pd.DataFrame(values, columns=['a', 'b', 'c']).to_csv(path, index=False)
+  directory = str(tmp_path / 'dataset')
+  progress = []
+  columns = create_dataset(path, directory, chunk_rows=8, progress=lambda rows, total: progress.append(rows))
+
+  assert is_dataset(directory) and progress[-1] == 21
+  for created, opened, expected in zip(columns, open_dataset(directory), values.T):
+    assert isinstance(opened.bits, np.memmap)
+    assert created.values.tolist() == opened.values.tolist() == expected.tolist()
+    assert opened.count() == expected.sum()
+
+def test_dataset_rejects_unaligned_blocks(tmp_path):
+  with pytest.raises(ValueError):
+    create_dataset(str(tmp_path / 'datos.csv'), str(tmp_path / 'dataset'), chunk_rows=10)
+
+def test_dataset_of_a_file_without_rows_keeps_its_names(tmp_path):
+  path = str(tmp_path / 'datos.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n')
+  columns = create_dataset(path, str(tmp_path / 'dataset'))
+  assert [(column.name, len(column)) for column in columns] == [('a', 0), ('b', 0)]
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.importer import import_columns
+from models.validation import InvalidDataError, ValidationErrors
+
+def write_csv(tmp_path, data: dict) -> str:
+  path = str(tmp_path / 'datos.csv')
+  pd.DataFrame(data).to_csv(path, index=False)
+  return path
+
+def test_binary_round_trip(tmp_path):
+  values = np.random.default_rng(0).integers(0, 2, (100, 3))
+  path = write_csv(tmp_path, {name: values[:, i] for i, name in enumerate('xyz')})
+  columns = import_columns(path, chunk_rows=16)
+  assert [column.name for column in columns] == ['x', 'y', 'z']
+  for i, column in enumerate(columns):
+    assert column.values.tolist() == values[:, i].tolist()
+
+def test_xlsx_is_streamed_in_blocks(tmp_path):
+  from openpyxl import Workbook
+  values = np.random.default_rng(1).integers(0, 2, (21, 2))
+  path = str(tmp_path / 'datos.xlsx')
+  workbook = Workbook()
+  workbook.active.append(['x', 'y'])
+  for row in values.tolist():
+    workbook.active.append(row)
+  workbook.save(path)
+  progress = []
+  columns = import_columns(path, chunk_rows=8, progress=lambda rows, total: progress.append((rows, total)))
+  assert progress == [(8, 21), (16, 21), (21, 21)]
+  assert [column.values.tolist() for column in columns] == values.T.tolist()
+
+def test_import_rejects_unaligned_blocks(tmp_path):
+  with pytest.raises(ValueError):
+    import_columns(write_csv(tmp_path, {'a': [0, 1]}), chunk_rows=10)
+
+@pytest.mark.parametrize('line, extra', [(2, ',1'), (10, ',1'), (10, ',1,1'), (22, ',1,1')])
+def test_csv_row_wider_than_header_is_rejected(tmp_path, line, extra):
+  # Con chunk_rows=8 la fila 10 es la primera del segundo bloque, donde pandas descartaría la celda sobrante
+  rows = ['1,0'] * 24
+  rows[line - 2] += extra
+  path = str(tmp_path / 'datos.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n' + '\n'.join(rows) + '\n')
+  with pytest.raises(InvalidDataError) as error:
+    import_columns(path, chunk_rows=8)
+  assert error.value.row == line - 2 and error.value.column == 'Columna 3'
+
+def test_csv_every_row_wider_than_header_is_rejected(tmp_path):
+  path = str(tmp_path / 'datos.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n1,0,1\n0,1,0\n')
+  with pytest.raises(InvalidDataError) as error:
+    import_columns(path)
+  assert error.value.row == 0
+
+def test_csv_short_rows_and_trailing_separator_are_accepted(tmp_path):
+  path = str(tmp_path / 'datos.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n1,0,\n0\n')
+  errors = ValidationErrors()
+  columns = import_columns(path, errors=errors)
+  assert columns[0].values.tolist() == [1, 0]
+  # La celda que falta en la fila corta se lee como vacía
+  assert errors.rows.tolist() == [1] and errors.cols.tolist() == [1]
+
+def test_xlsx_without_dimension_rejects_wide_row(tmp_path):
+  import re
+  import zipfile
+  from openpyxl import Workbook
+  path, stripped = str(tmp_path / 'datos.xlsx'), str(tmp_path / 'sin_dimension.xlsx')
+  workbook = Workbook()
+  workbook.active.append(['a', 'b'])
+  for row in [[1, 0]] * 9 + [[1, 0, 1]]:
+    workbook.active.append(row)
+  workbook.save(path)
+  # Sin <dimension> openpyxl no rellena las filas al ancho de la hoja
+  with zipfile.ZipFile(path) as source, zipfile.ZipFile(stripped, 'w') as target:
+    for item in source.infolist():
+      data = source.read(item.filename)
+      if item.filename.startswith('xl/worksheets/'):
+        data = re.sub(rb'<dimension [^>]*/>', b'', data)
+      target.writestr(item, data)
+  with pytest.raises(InvalidDataError) as error:
+    import_columns(stripped, chunk_rows=8)
+  assert error.value.row == 9 and error.value.column == 'Columna 3'
+
+def test_categorical_levels_do_not_depend_on_block_dtype(tmp_path):
+  # El primer bloque es binario (se empaqueta), el segundo se lee como float y el tercero como entero
+  a = [0, 1] * 8 + [2.0, 1.0, 0.0, 10.0] * 4 + [2, 10, 1, 0] * 4
+  path = str(tmp_path / 'datos.csv')
+  with open(path, 'w') as file:
+    file.write('a,b\n')
+    for i, value in enumerate(a):
+      text = f'{value:.1f}' if 16 <= i < 32 else str(int(value))
+      file.write(f'{text},{i % 2}\n')
+  column, binary = import_columns(path, chunk_rows=16, categorical=True)
+
+  assert column.levels == ['0', '1', '2', '10']
+  assert column.values.tolist() == [str(int(value)) for value in a]
+  assert binary.is_binary and binary.count() == len(a) // 2
+
+def test_categorical_text_levels_follow_numeric_levels(tmp_path):
+  path = write_csv(tmp_path, {'a': [0, 1] * 8 + ['b', 'a', ' 2 ', '1'] * 4})
+  column, = import_columns(path, chunk_rows=16, categorical=True)
+  assert column.levels == ['0', '1', '2', 'a', 'b']
+  assert column.values[16:20].tolist() == ['b', 'a', '2', '1']
+
+def test_categorical_empty_cell_is_rejected(tmp_path):
+  path = write_csv(tmp_path, {'a': [0, 1] * 8 + [2, None, 1, 0]})
+  with pytest.raises(InvalidDataError) as error:
+    import_columns(path, chunk_rows=16, categorical=True)
+  assert error.value.row == 17 and error.value.column == 'a'
+
+@pytest.mark.parametrize('extension', ['csv', 'xlsx'])
+def test_header_without_rows_keeps_column_names(tmp_path, extension):
+  path = str(tmp_path / f'vacio.{extension}')
+  if extension == 'csv':
+    with open(path, 'w') as file:
+      file.write('a,b\n')
+  else:
+    from openpyxl import Workbook
+    workbook = Workbook()
+    workbook.active.append(['a', 'b'])
+    workbook.save(path)
+  for categorical in (False, True):
+    columns = import_columns(path, categorical=categorical)
+    assert [column.name for column in columns] == ['a', 'b']
+    assert all(len(column) == 0 for column in columns)
+
+def test_unnamed_xlsx_headers_get_positional_names(tmp_path):
+  from openpyxl import Workbook
+  path = str(tmp_path / 'datos.xlsx')
+  workbook = Workbook()
+  workbook.active.append(['a', None, 'c'])
+  workbook.active.append([1, 0, True])
+  workbook.save(path)
+  errors = ValidationErrors()
+  columns = import_columns(path, errors=errors)
+  assert [column.name for column in columns] == ['a', 'Columna 2', 'c']
+  # True no se acepta como 1
+  assert errors.cols.tolist() == [2] and errors.texts.tolist() == ['True']
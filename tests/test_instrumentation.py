@@ -0,0 +1,56 @@
+import json
+import pytest
+from models.column import Column
+from models.instrumentation import Instrumentation, instrumentation
+from models.table import Table, AnalysisCache
+
+def test_disabled_instrumentation_records_nothing():
+  trace = Instrumentation()
+  with trace.span('etapa') as span:
+    span.set(filas=3)
+  trace.count('filas', 3)
+  assert trace.to_dict()['traceEvents'] == [] and trace.to_dict()['counters'] == {}
+
+def test_spans_and_counters_are_exported(tmp_path):
+  trace = Instrumentation()
+  trace.enable()
+
+  @trace.traced('doble')
+  def double(value):
+    return 2 * value
+
+  with trace.span('etapa', bloque=1) as span:
+    span.set(filas=3)
+    assert double(2) == 4
+  trace.count('filas', 3)
+  trace.count('filas', 4)
+  trace.disable()
+  trace.count('filas', 100)
+
+  path = str(tmp_path / 'traza.json')
+  trace.export(path)
+  with open(path, encoding='utf-8') as file:
+    exported = json.load(file)
+  assert exported['counters'] == {'filas': 7}
+  spans = {event['name']: event for event in exported['traceEvents'] if event['ph'] == 'X'}
+  assert spans['etapa']['args'] == {'bloque': 1, 'filas': 3}
+  assert spans['etapa']['dur'] >= spans['doble']['dur']
+  assert {name: value['calls'] for name, value in trace.summary().items()} == {'etapa': 1, 'doble': 1}
+  trace.reset()
+  assert trace.to_dict()['traceEvents'] == []
+
+@pytest.fixture
+def enabled_instrumentation():
+  instrumentation.reset()
+  instrumentation.enable()
+  yield instrumentation
+  instrumentation.disable()
+  instrumentation.reset()
+
+def test_table_stages_are_counted(enabled_instrumentation):
+  table = Table(cache=AnalysisCache())
+  table.set_columns([Column('a', [1, 0, 1, 1]), Column('b', [0, 0, 1, 1]), Column('c', [1, 1, 1, 0])])
+  table.calculate_all_pairs()
+  assert enabled_instrumentation.counters['table.cells'] == 12
+  assert enabled_instrumentation.counters['table.pairs'] == 3
+  assert {'table.co_occurrence', 'table.calculate_all_pairs'} <= set(enabled_instrumentation.summary())
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from models.metrics import rule_metrics
+
+def brute_force_rules(observed):
+  # Reglas A=i -> B=j por filas y después B=j -> A=i por columnas, como `Table.get_rules`
+  observed = np.asarray(observed)
+  rows, cols, total = observed.sum(axis=1), observed.sum(axis=0), observed.sum()
+  rules = [(observed[i, j], rows[i], cols[j]) for i in range(observed.shape[0]) for j in range(observed.shape[1])]
+  rules += [(observed[i, j], cols[j], rows[i]) for j in range(observed.shape[1]) for i in range(observed.shape[0])]
+  for count, antecedent, consequent in rules:
+    confidence = count / antecedent
+    yield {
+      'count': count,
+      'antecedent_count': antecedent,
+      'consequent_count': consequent,
+      'coverage': count / total,
+      'confidence': confidence,
+      'dependency_factor': count * total / (antecedent * consequent),
+      'leverage': count / total - antecedent * consequent / total ** 2,
+      'conviction': (1 - consequent / total) / (1 - confidence) if confidence < 1 else np.inf
+    }
+
+def test_rule_metrics_match_brute_force_on_stacked_tables():
+  observed = np.array([[[3, 1, 2], [2, 4, 0]], [[5, 0, 1], [1, 2, 3]]])
+  metrics = rule_metrics(observed)
+  assert metrics['total'].tolist() == [12, 12]
+  for table, index in ((observed[0], 0), (observed[1], 1)):
+    for position, expected in enumerate(brute_force_rules(table)):
+      for name, value in expected.items():
+        assert metrics[name][index, position] == pytest.approx(value), (name, position)
+
+def test_rule_metrics_handle_empty_tables_and_one_direction():
+  metrics = rule_metrics(np.zeros((2, 2), dtype=int), both_directions=False)
+  assert metrics['count'].shape == (4,)
+  for name in ('coverage', 'confidence', 'dependency_factor', 'leverage'):
+    assert metrics[name].tolist() == [0.0] * 4
+  assert set(rule_metrics([[1, 1], [1, 1]], ('confidence',))) == {'count', 'antecedent_count', 'consequent_count', 'total', 'confidence'}
@@ -0,0 +1,58 @@
+import itertools
+import math
+import numpy as np
+import pytest
+from models.column import Column
+from models.mining import association_rules, frequent_itemsets
+from models.table import Table, AnalysisCache
+
+def brute_force_itemsets(values, min_count, max_length=None):
+  itemsets = {}
+  for size in range(1, (max_length or len(values)) + 1):
+    for items in itertools.combinations(range(len(values)), size):
+      count = int(np.logical_and.reduce(values[list(items)]).sum())
+      if count >= min_count:
+        itemsets[items] = count
+  return itemsets
+
+@pytest.mark.parametrize('max_length', [None, 2, 3])
+def test_frequent_itemsets_match_brute_force(max_length):
+  values = (np.random.default_rng(4).random((7, 60)) < 0.6).astype(np.uint8)
+  columns = [Column(f'c{i}', column) for i, column in enumerate(values)]
+  expected = brute_force_itemsets(values, math.ceil(0.2 * 60), max_length)
+  assert frequent_itemsets(columns, 0.2, max_length) == expected
+  co_occurrence = values.astype(np.int64) @ values.T.astype(np.int64)
+  assert frequent_itemsets(columns, 0.2, max_length, co_occurrence) == expected
+
+def test_association_rules_cover_every_split_of_each_itemset():
+  values = (np.random.default_rng(5).random((4, 40)) < 0.6).astype(np.uint8)
+  itemsets = brute_force_itemsets(values, 4)
+  rules = association_rules(itemsets, ['a', 'b', 'c', 'd'], 40, min_confidence=0.5)
+  names = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+  expected = sum(1 for items in itemsets for size in range(1, len(items))
+                 for antecedent in itertools.combinations(items, size)
+                 if itemsets[items] / itemsets[antecedent] >= 0.5)
+  assert len(rules) == expected
+  for rule in rules:
+    antecedent = tuple(names[name] for name, _ in rule.antecedent)
+    items = tuple(sorted(antecedent + tuple(names[name] for name, _ in rule.consequent)))
+    assert rule.count == itemsets[items] and rule.antecedent_count == itemsets[antecedent]
+    (a, b), (c, d) = rule.observed
+    assert rule.chi_squared == pytest.approx(40 * (a * d - b * c) ** 2 / ((a + b) * (c + d) * (a + c) * (b + d)))
+  # De mayor a menor confianza y, con la misma confianza, de mayor a menor frecuencia
+  keys = [(-rule.confidence, -rule.count) for rule in rules]
+  assert keys == sorted(keys)
+
+def test_rule_chi_squared_does_not_overflow_with_many_rows():
+  # Con 4e5 filas el producto de los cuatro totales marginales no cabe en int64
+  values = (np.random.default_rng(6).random((2, 400_000)) < 0.5).astype(np.uint8)
+  values[1, :200_000] = values[0, :200_000]
+  columns = [Column('a', values[0]), Column('b', values[1])]
+  table = Table(cache=AnalysisCache())
+  table.set_columns(columns)
+  pairs = table.calculate_all_pairs()
+  rules = association_rules(frequent_itemsets(columns, 0.1), ['a', 'b'], 400_000)
+  assert len(rules) == 2
+  for rule in rules:
+    assert rule.chi_squared == pytest.approx(pairs['chi_squared'][0, 1])
+    assert rule.p_value == pytest.approx(pairs['p_value'][0, 1])
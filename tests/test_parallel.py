@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+import models.parallel as parallel
+
+def dense_co_occurrence(values: np.ndarray) -> np.ndarray:
+  values = values.astype(np.int64)
+  return values @ values.T
+
+@pytest.mark.parametrize('k', [1, 2, 5])
+def test_blocks_never_exceed_float32_exact_rows(monkeypatch, k):
+  # Con un límite pequeño, cada bloque desempaquetado debe respetarlo aunque quepan más celdas
+  monkeypatch.setattr(parallel, 'FLOAT32_EXACT_ROWS', 64)
+  unpackbits = np.unpackbits
+  blocks = []
+
+  def recording_unpackbits(packed, *args, **kwargs):
+    blocks.append(packed.shape[-1] * 8)
+    return unpackbits(packed, *args, **kwargs)
+
+  monkeypatch.setattr(parallel.np, 'unpackbits', recording_unpackbits)
+  values = np.random.default_rng(k).integers(0, 2, (k, 1000), dtype=np.uint8)
+  result = parallel.count_co_occurrence([np.packbits(column) for column in values])
+  monkeypatch.undo()
+  assert max(blocks) <= 64
+  assert (result == dense_co_occurrence(values)).all()
+
+def test_parallel_matches_single_process(monkeypatch):
+  monkeypatch.setattr(parallel, 'MIN_SHARD_ROWS', 1 << 10)
+  values = np.random.default_rng(0).integers(0, 2, (4, 1 << 13), dtype=np.uint8)
+  bits = [np.packbits(column) for column in values]
+  assert (parallel.parallel_co_occurrence(bits, workers=3) == dense_co_occurrence(values)).all()
+
+def test_sparse_co_occurrence_matches_dense(monkeypatch):
+  values = (np.random.default_rng(8).random((6, 300)) < 0.2).astype(np.uint8)
+  values[3] = 0
+  expected = dense_co_occurrence(values)
+  assert parallel.sparse_co_occurrence([np.flatnonzero(column) for column in values], 300).tolist() == expected.tolist()
+  # Con lotes mínimos los pares de una fila se reparten entre varias iteraciones
+  monkeypatch.setattr(parallel, 'SPARSE_BATCH_PAIRS', 1)
+  assert parallel.sparse_co_occurrence([np.flatnonzero(column) for column in values], 300).tolist() == expected.tolist()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import models.patterns as patterns
+from models.column import Column
+from models.mining import frequent_itemsets
+
+def random_values(seed: int, k: int, rows: int) -> np.ndarray:
+  return (np.random.default_rng(seed).random((k, rows)) < 0.5).astype(np.uint8)
+
+def histogram_of(values: np.ndarray) -> np.ndarray:
+  return patterns.pattern_histogram([np.packbits(column) for column in values], values.shape[1])
+
+def test_histogram_matches_row_codes_across_blocks(monkeypatch):
+  values = random_values(10, 5, 101)
+  expected = np.bincount([patterns.pattern_code(row) for row in values.T], minlength=32)
+  assert histogram_of(values).tolist() == expected.tolist()
+  monkeypatch.setattr(patterns, 'PATTERN_BLOCK_BYTES', 3)
+  assert histogram_of(values).tolist() == expected.tolist()
+  with pytest.raises(ValueError):
+    histogram_of(random_values(10, patterns.MAX_PATTERN_COLUMNS + 1, 8))
+
+def test_co_occurrence_and_column_removal():
+  values = random_values(11, 4, 64)
+  histogram = histogram_of(values)
+  dense = values.astype(np.int64)
+  assert patterns.pattern_co_occurrence(histogram).tolist() == (dense @ dense.T).tolist()
+  for index in range(4):
+    assert patterns.remove_pattern_column(histogram, index).tolist() == histogram_of(np.delete(values, index, axis=0)).tolist()
+
+@pytest.mark.parametrize('max_length', [None, 2])
+def test_pattern_itemsets_match_apriori(max_length):
+  values = random_values(12, 6, 80)
+  expected = frequent_itemsets([Column(f'c{i}', column) for i, column in enumerate(values)], 0.1, max_length)
+  itemsets = patterns.pattern_itemsets(histogram_of(values), 8, max_length)
+  assert itemsets == expected
+  assert list(itemsets) == list(expected)
@@ -0,0 +1,26 @@
+import math
+import numpy as np
+import pytest
+from models.permutation import permutation_p_values
+
+def exact_p_value(observed) -> float:
+  # Probabilidad hipergeométrica de que |n11 - esperado| sea al menos el observado
+  (a, b), (c, d) = observed
+  row1, col1, total = a + b, a + c, a + b + c + d
+  expected = row1 * col1 / total
+  return sum(math.comb(col1, x) * math.comb(total - col1, row1 - x) / math.comb(total, row1)
+             for x in range(max(0, row1 + col1 - total), min(row1, col1) + 1)
+             if abs(x - expected) >= abs(a - expected) * (1 - 1e-9))
+
+def test_permutation_p_values_approach_the_exact_tail():
+  observed = np.array([[[8, 2], [1, 5]], [[3, 4], [5, 6]]])
+  p_values = permutation_p_values(observed, 20000, workers=1, seed=0)
+  assert p_values.shape == (2,)
+  assert p_values == pytest.approx([exact_p_value(table) for table in observed], abs=0.01)
+
+def test_permutation_p_values_are_reproducible_across_workers():
+  observed = [[8, 2], [1, 5]]
+  assert permutation_p_values(observed, 2000, workers=2, seed=3) == permutation_p_values(observed, 2000, workers=2, seed=3)
+
+def test_constant_margins_give_p_value_one():
+  assert permutation_p_values([[[4, 0], [0, 0]], [[2, 0], [3, 0]]], 100, workers=1, seed=0).tolist() == [1.0, 1.0]
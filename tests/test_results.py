@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from models.results import ChiSquaredResult, RuleResult
+
+def test_rule_result_derives_values_from_counts():
+  rule = RuleResult((('Pan', 1), ('Leche', 1)), (('Huevo', 1),), 3, 4, 5, 8, 1.5, 0.22, 1.2)
+  assert rule.rule == "Si (Pan=1, Leche=1) entonces Huevo=1"
+  assert rule.coverage == 3 / 8 and rule.confidence == 3 / 4
+  assert rule.observed == [[3, 1], [2, 2]]
+  assert rule.format_coverage() == "37.50% (3/8)" and rule.format_confidence() == "75.00% (3/4)"
+  exported = rule.to_dict()
+  assert exported['antecedent'] == ['Pan', 'Leche'] and exported['consequent'] == ['Huevo']
+  assert exported['observed'] == rule.observed and exported['p_value'] == 0.22
+  with pytest.raises(AttributeError):
+    rule.extra = 1
+
+def test_empty_rule_has_zero_coverage_and_confidence():
+  rule = RuleResult((('a', 1),), (('b', 0),), 0, 0, 0, 0)
+  assert rule.coverage == 0.0 and rule.confidence == 0.0
+
+def test_chi_squared_result_formats_on_demand():
+  observed = np.array([[3, 1], [1, 3]])
+  expected = np.full((2, 2), 2.0)
+  result = ChiSquaredResult(observed, expected, (observed - expected) ** 2 / expected, 1, 0.16)
+  assert result.statistic == 2.0
+  assert result.format_result() == "X^2 = 0.5000 + 0.5000 + 0.5000 + 0.5000 = 2.0000"
+  assert result.format_steps().startswith("(3 - 2.00)^2 / 2.00 = 0.5000, (1 - 2.00)^2 / 2.00 = 0.5000")
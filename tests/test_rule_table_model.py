@@ -0,0 +1,61 @@
+import pytest
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+from PyQt5.QtCore import Qt
+from models.results import RuleResult
+
+@pytest.fixture(scope='module')
+def app():
+  return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.fixture
+def model(app):
+  from views.rule_table_model import RuleTableModel
+  return RuleTableModel([
+    RuleResult((('Pan', 1),), (('Leche', 1),), 3, 4, 5, 10),
+    RuleResult((('Leche', 1),), (('Pan', 1),), 3, 5, 4, 10),
+    RuleResult((('Huevo', 1),), (('Pan', 1),), 1, 2, 4, 10),
+  ])
+
+def rules(model) -> list:
+  return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+def test_rows_are_formatted_on_demand(model):
+  assert model.rowCount() == 3 and model.columnCount() == 4
+  assert model.headerData(1, Qt.Horizontal) == "Cobertura"
+  assert [model.data(model.index(0, col)) for col in range(4)] == [
+    "Si (Pan=1) entonces Leche=1", "30.00% (3/10)", "75.00% (3/4)", "3"]
+  assert model.data(model.index(0, 2), Qt.TextAlignmentRole) == Qt.AlignCenter
+
+def test_sort_is_numeric_and_stable(model):
+  model.sort(2, Qt.DescendingOrder)
+  assert rules(model) == ["Si (Pan=1) entonces Leche=1", "Si (Leche=1) entonces Pan=1", "Si (Huevo=1) entonces Pan=1"]
+  model.sort(3, Qt.AscendingOrder)
+  assert rules(model) == ["Si (Huevo=1) entonces Pan=1", "Si (Pan=1) entonces Leche=1", "Si (Leche=1) entonces Pan=1"]
+  model.sort(-1)
+  assert model.rule(2).antecedent == (('Huevo', 1),)
+
+def test_filter_keeps_the_sort_order(model):
+  model.sort(0, Qt.AscendingOrder)
+  model.set_filter("  PAN=1) ")
+  assert rules(model) == ["Si (Pan=1) entonces Leche=1"]
+  model.set_filter("pan")
+  assert rules(model) == ["Si (Huevo=1) entonces Pan=1", "Si (Leche=1) entonces Pan=1", "Si (Pan=1) entonces Leche=1"]
+  model.set_rules([RuleResult((('Sal', 1),), (('Pan', 1),), 1, 1, 4, 10)])
+  assert rules(model) == ["Si (Sal=1) entonces Pan=1"]
+
+def test_rule_texts_are_built_only_when_needed(app, monkeypatch):
+  from views.rule_table_model import RuleTableModel
+  calls = []
+  text = RuleResult.rule.fget
+  monkeypatch.setattr(RuleResult, 'rule', property(lambda rule: calls.append(rule) or text(rule)))
+  model = RuleTableModel([RuleResult((('a', 1),), (('b', i),), 1, 2, 3, 10) for i in range(1000)])
+  model.sort(2, Qt.DescendingOrder)
+  model.set_rules([RuleResult((('a', 1),), (('b', i),), 1, 2, 3, 10) for i in range(1000)])
+  assert calls == []
+  assert model.data(model.index(5, 0)) == "Si (a=1) entonces b=5"
+  assert len(calls) == 1
+  model.set_filter("b=99")
+  assert len(calls) == 1001 and model.rowCount() == 11
+  model.set_filter("b=9")
+  assert len(calls) == 1001
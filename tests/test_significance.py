@@ -0,0 +1,63 @@
+import math
+import warnings
+import numpy as np
+import pytest
+import models.significance as significance
+from models.significance import LogFactorialTable, adjust_p_values, chi2_sf, fisher_exact, rank_by_p_value
+
+def test_chi2_sf_matches_known_values():
+  assert chi2_sf([3.841458820694124, 6.634896601021214, 10.827566170662733], 1) == pytest.approx([0.05, 0.01, 0.001])
+  # Con 2 y 4 grados de libertad la función de supervivencia tiene forma cerrada
+  x = np.array([0.0, 0.5, 3.0, 20.0, 200.0])
+  assert chi2_sf(x, 2) == pytest.approx(np.exp(-x / 2), rel=1e-12)
+  assert chi2_sf(x, 4) == pytest.approx(np.exp(-x / 2) * (1 + x / 2), rel=1e-12)
+  assert float(chi2_sf(100.0, 1)) == pytest.approx(math.erfc(math.sqrt(50.0)), rel=1e-10)
+
+def test_chi2_sf_rejects_non_positive_degrees_of_freedom():
+  with pytest.raises(ValueError):
+    chi2_sf(1.0, 0)
+
+def test_adjust_p_values():
+  p_values = np.array([[0.01, 0.04], [np.nan, 0.03], [0.005, 0.5]])
+  np.testing.assert_allclose(adjust_p_values(p_values, 'bonferroni'), [[0.05, 0.2], [np.nan, 0.15], [0.025, 1.0]])
+  np.testing.assert_allclose(adjust_p_values(p_values, 'bh'), [[0.025, 0.05], [np.nan, 0.05], [0.025, 0.5]])
+  with pytest.raises(ValueError):
+    adjust_p_values(p_values, 'holm')
+
+def test_rank_by_p_value():
+  assert rank_by_p_value([[0.2, np.nan], [0.01, 0.2]]).tolist() == [2, 0, 3, 1]
+
+def test_chi2_sf_handles_infinite_and_missing_statistics():
+  with warnings.catch_warnings():
+    warnings.simplefilter('error')
+    p_values = chi2_sf([np.inf, np.nan, 3.841458820694124, -1.0], [1, 3, 1, 2])
+  assert p_values[0] == 0.0 and np.isnan(p_values[1])
+  assert p_values[2:] == pytest.approx([0.05, 1.0])
+  assert float(chi2_sf(np.inf, 4)) == 0.0 and np.isnan(chi2_sf(np.nan, 1))
+
+def brute_force_fisher(observed) -> float:
+  (a, b), (c, d) = observed
+  row1, col1, total = a + b, a + c, a + b + c + d
+  probabilities = [math.comb(col1, x) * math.comb(total - col1, row1 - x) / math.comb(total, row1)
+                   for x in range(max(0, row1 + col1 - total), min(row1, col1) + 1)]
+  observed_probability = probabilities[a - max(0, row1 + col1 - total)]
+  return sum(p for p in probabilities if p <= observed_probability * (1 + 1e-7))
+
+def test_fisher_exact_matches_known_and_brute_force_values():
+  assert fisher_exact([[8, 2], [1, 5]]) == pytest.approx(0.03496503, rel=1e-6)
+  assert fisher_exact([[1, 9], [11, 3]]) == pytest.approx(0.00275945, rel=1e-5)
+  for observed in ([[0, 0], [0, 0]], [[0, 5], [5, 0]], [[3, 3], [3, 3]], [[12, 1], [0, 30]], [[2, 7], [9, 1]]):
+    assert fisher_exact(observed) == pytest.approx(min(brute_force_fisher(observed), 1.0))
+
+def test_log_factorial_table_grows_on_demand():
+  table = LogFactorialTable(4)
+  assert table(np.array([0, 1, 3, 2000])) == pytest.approx([0.0, 0.0, math.log(6), math.lgamma(2001)])
+
+def test_fisher_exact_p_values_match_table_by_table(monkeypatch):
+  observed = np.array([[[8, 2], [1, 5]], [[0, 0], [0, 0]], [[12, 1], [0, 30]], [[2, 7], [9, 1]], [[0, 3], [4, 0]]])
+  expected = [min(brute_force_fisher(table.tolist()), 1.0) for table in observed]
+  assert significance.fisher_exact_p_values(observed) == pytest.approx(expected)
+  # Con lotes pequeños las tablas se reparten entre varias iteraciones
+  for cells in (1, 7):
+    monkeypatch.setattr(significance, 'FISHER_BATCH_CELLS', cells)
+    assert significance.fisher_exact_p_values(observed.reshape(5, 1, 2, 2)) == pytest.approx(np.reshape(expected, (5, 1)))
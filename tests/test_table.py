@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.column import CategoricalColumn, Column, SparseColumn
+from models.significance import fisher_exact
+from models.table import Table, AnalysisCache
+
+def make_table(values, **kwargs) -> Table:
+  table = Table(cache=AnalysisCache(), **kwargs)
+  table.set_columns([Column(f'c{i}', column) for i, column in enumerate(values)])
+  return table
+
+def test_all_pairs_match_pair_by_pair_analysis():
+  values = np.random.default_rng(1).integers(0, 2, (4, 50))
+  table = make_table(values)
+  table.exact_threshold = None
+  pairs = table.calculate_all_pairs()
+  for i in range(4):
+    for j in range(4):
+      if i == j:
+        continue
+      table.selected_index_columns = [i, j]
+      result = table.calculate_chi_squared()
+      assert pairs['observed'][i, j].tolist() == np.asarray(result.observed).tolist()
+      assert pairs['observed'][i, j, 0, 0] == (values[i] & values[j]).sum()
+      assert pairs['chi_squared'][i, j] == pytest.approx(result.statistic)
+      assert pairs['p_value'][i, j] == pytest.approx(result.p_value)
+
+def test_edits_keep_co_occurrence_up_to_date():
+  rng = np.random.default_rng(2)
+  table = make_table(rng.integers(0, 2, (3, 20)))
+  table.append_row([1, 0, 1])
+  table.set_value(4, 1, 1 - table.columns[1].get(4))
+  table.set_value(0, 2, table.columns[2].get(0))
+  table.add_column(Column('c3', rng.integers(0, 2, 21)))
+  table.remove_last_row()
+  table.append_row([1, 1, 1, 1])
+  table.remove_column(1)
+  assert table.co_occurrence.tolist() == table._compute_co_occurrence().tolist()
+  values = np.array([column.values for column in table.columns], dtype=np.int64)
+  assert table.co_occurrence.tolist() == (values @ values.T).tolist()
+
+def test_cached_results_follow_edits():
+  table = make_table([[1, 1, 1, 0, 0, 0, 0, 0], [1, 0, 0, 1, 1, 1, 0, 0]])
+  table.selected_index_columns = [0, 1]
+  assert table.get_contingency_table()[0] == [1, 2, 3]
+  assert len(table.cache) == 1
+  # Editar una celda cambia la huella de la columna y con ella la llave de la caché
+  table.set_value(1, 1, 1)
+  assert table.get_contingency_table()[0] == [2, 1, 3]
+  assert len(table.cache) == 2
+
+def test_rule_metrics_are_shared_read_only():
+  table = make_table([[1, 1, 1, 0, 0, 0, 0, 0], [1, 0, 0, 1, 1, 1, 0, 0]])
+  table.selected_index_columns = [0, 1]
+  metrics = table.get_rule_metrics()
+  # Las consultas internas reciben el mismo objeto de la caché, sin copiarlo, y no pueden modificarlo
+  assert table.get_rule_metrics() is metrics
+  with pytest.raises(ValueError):
+    metrics['coverage'][0] = 1.0
+  with pytest.raises(TypeError):
+    metrics['coverage'] = None
+  assert table.calculate_coverage_confidence("Si (c0=1) entonces c1=1") == (0.125, 1 / 3, 1, 3)
+
+def test_mutable_results_are_copied():
+  table = make_table([[1, 1, 1, 0, 0, 0, 0, 0], [1, 0, 0, 1, 1, 1, 0, 0]])
+  table.selected_index_columns = [0, 1]
+  rules = table.get_rules()
+  rules[0].count = 100
+  assert table.get_rules()[0].count == 1
+
+def test_mutating_the_contingency_table_does_not_alter_the_cache():
+  table = make_table([[1, 1, 1, 0, 0, 0, 0, 0], [1, 0, 0, 1, 1, 1, 0, 0]])
+  table.selected_index_columns = [0, 1]
+  counts = table.get_contingency_table()
+  counts[0][0] = 100
+  table.contingency_table.iloc[0, 0] = 100
+  table.contingency_table.loc['All', 'All'] = 0
+  assert table.get_contingency_table() == [[1, 2, 3], [3, 2, 5], [4, 4, 8]]
+  assert table.contingency_table.values.tolist() == [[1, 2, 3], [3, 2, 5], [4, 4, 8]]
+  assert table.calculate_chi_squared().observed.tolist() == [[1, 2], [3, 2]]
+
+def test_all_pairs_use_fisher_for_small_expected_counts():
+  table = make_table([[1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0]])
+  pairs = table.calculate_all_pairs()
+  assert pairs['exact'][0, 1] and pairs['exact'][1, 0]
+  assert pairs['p_value'][0, 1] == pytest.approx(fisher_exact(pairs['observed'][0, 1]))
+  table.selected_index_columns = [0, 1]
+  assert table.test_independence() == (pytest.approx(pairs['p_value'][0, 1]), 'fisher')
+
+def test_sparse_columns_give_the_same_co_occurrence():
+  values = (np.random.default_rng(9).random((4, 90)) < 0.15).astype(np.uint8)
+  table = make_table(values)
+  sparse = Table(cache=AnalysisCache())
+  sparse.set_columns([SparseColumn.from_column(column) for column in table.columns])
+  assert sparse.co_occurrence.tolist() == table.co_occurrence.tolist()
+  sparse.set_value(0, 1, 1 - values[1, 0])
+  sparse.append_row([1, 1, 0, 1])
+  assert sparse.co_occurrence.tolist() == sparse._compute_co_occurrence().tolist()
+
+def test_edits_keep_pattern_histogram_up_to_date():
+  rng = np.random.default_rng(13)
+  table = make_table(rng.integers(0, 2, (3, 30)), patterns=True)
+  table.append_row([1, 0, 1])
+  table.set_value(2, 0, 1 - table.columns[0].get(2))
+  table.add_column(Column('c3', np.zeros(31, dtype=int)))
+  table.set_value(7, 3, 1)
+  table.remove_last_row()
+  table.remove_column(1)
+  assert table.pattern_histogram.tolist() == table._compute_pattern_histogram().tolist()
+  assert table.co_occurrence.tolist() == table._compute_co_occurrence().tolist()
+  plain = make_table([column.values for column in table.columns])
+  def counts(rules):
+    return [(rule.count, rule.antecedent_count, rule.consequent_count) for rule in rules]
+  assert counts(table.mine_rules(0.1, 0.3)) == counts(plain.mine_rules(0.1, 0.3))
+
+def test_categorical_contingency_table_matches_crosstab():
+  rng = np.random.default_rng(14)
+  first, second = rng.choice(['x', 'y', 'z'], 60), rng.choice(['p', 'q'], 60)
+  table = Table(cache=AnalysisCache())
+  table.set_columns([CategoricalColumn('a', first.tolist()), CategoricalColumn('b', second.tolist()), Column('c', rng.integers(0, 2, 60))])
+  table.selected_index_columns = [0, 1]
+  crosstab = pd.crosstab(first, second, margins=True)
+  assert table.get_contingency_table() == crosstab.values.tolist()
+  assert table.get_labels() == (['a=x', 'a=y', 'a=z'], ['b=p', 'b=q'])
+  assert table.get_degrees_of_freedom() == 2
+
+  observed = crosstab.values[:-1, :-1]
+  expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / 60
+  result = table.calculate_chi_squared()
+  assert result.df == 2 and result.statistic == pytest.approx(((observed - expected) ** 2 / expected).sum())
+  assert result.p_value == pytest.approx(np.exp(-result.statistic / 2))
+  # Las co-ocurrencias solo incluyen las columnas binarias
+  assert table.co_occurrence[:2].tolist() == [[0, 0, 0], [0, 0, 0]]
+
+def test_categorical_columns_reject_edits():
+  table = Table(cache=AnalysisCache())
+  table.set_columns([Column('a', [1, 0, 1]), CategoricalColumn('b', ['x', 'y', 'z']), Column('c', [1, 1, 0])])
+  with pytest.raises(ValueError, match="'b' es categórica"):
+    table.set_value(0, 1, 1)
+  with pytest.raises(ValueError, match="columnas categóricas: b"):
+    table.append_row([1, 0, 1])
+  with pytest.raises(ValueError, match="columnas categóricas: b"):
+    table.remove_last_row()
+  assert [len(column) for column in table.columns] == [3, 3, 3]
+  # Las celdas de las columnas binarias se siguen editando
+  table.set_value(1, 2, 0)
+  assert table.co_occurrence.tolist() == table._compute_co_occurrence().tolist() == [[2, 0, 1], [0, 0, 0], [1, 0, 1]]
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.column import SparseColumn
+from models.transactions import import_transactions
+
+def write_sales(tmp_path) -> str:
+  path = str(tmp_path / 'ventas.csv')
+  pd.DataFrame({
+    'producto': ['Pan', 'Leche', 'Pan', 'Huevo', 'Leche', 'Huevo', 'Pan', None, 'Leche', 'Pan', 'Sal'],
+    'ticket': [1, 1, 2, 2, 2, 3, 4, 4, 4, 1, None]
+  }).to_csv(path, index=False)
+  return path
+
+def test_transactions_round_trip_across_blocks(tmp_path):
+  basket = import_transactions(write_sales(tmp_path), 'ticket', 'producto', chunk_rows=4)
+  # Las filas incompletas se ignoran y el Pan repetido del ticket 1 cuenta una vez
+  assert basket.items == ['Pan', 'Leche', 'Huevo']
+  assert basket.transactions.tolist() == [1, 2, 3, 4]
+  assert basket.nnz == 8 and basket.item_counts().tolist() == [3, 3, 2]
+  assert [basket.item_transactions(item).tolist() for item in range(3)] == [[0, 1, 3], [0, 1, 3], [1, 2]]
+
+  dense = basket.to_columns()
+  sparse = basket.to_columns(sparse=True)
+  assert [column.values.tolist() for column in dense] == [[1, 1, 0, 1], [1, 1, 0, 1], [0, 1, 1, 0]]
+  assert all(isinstance(column, SparseColumn) for column in sparse)
+  assert [column.values.tolist() for column in sparse] == [column.values.tolist() for column in dense]
+  assert [column.name for column in basket.to_columns(min_count=3)] == ['Pan', 'Leche']
+
+def test_transactions_reject_unknown_columns(tmp_path):
+  with pytest.raises(ValueError):
+    import_transactions(write_sales(tmp_path), item_column='cantidad')
+
+def test_numeric_items_are_the_same_in_every_block(tmp_path):
+  # El segundo bloque tiene un ítem vacío, así que pandas lo lee como float (5.0)
+  path = str(tmp_path / 'ventas.csv')
+  with open(path, 'w') as file:
+    file.write('ticket,producto\n1,5\n1,7\n2,5\n3,7\n4,5\n4,\n5,5\n5,7\n6,7\n')
+  basket = import_transactions(path, chunk_rows=4)
+  assert basket.items == ['5', '7']
+  assert basket.item_counts().tolist() == [4, 4]
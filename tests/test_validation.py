@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from models.validation import InvalidDataError, ValidationErrors, check_block, to_binary
+
+def test_object_cells_accept_numbers_and_text():
+  block = np.array([[0, '1', 1.0], ['0', 1, 'x'], [None, 2, np.nan]], dtype=object)
+  values, valid = to_binary(block)
+  assert valid.tolist() == [[True, True, True], [True, True, False], [False, False, False]]
+  assert values[valid].tolist() == [0, 1, 1, 0, 1]
+
+def test_logical_cells_are_rejected():
+  _, valid = to_binary(np.array([[True, 1], [np.False_, 0]], dtype=object))
+  assert valid.tolist() == [[False, True], [False, True]]
+  _, valid = to_binary(np.array([[True, False]]))
+  assert not valid.any()
+
+@pytest.mark.parametrize('block', [np.array([[0, 1], [2, 1]]), np.array([[0.0, 1.0], [0.5, 1.0]]),
+                                   np.array([['0', '1'], ['a', '1']])])
+def test_numeric_and_text_blocks(block):
+  values, valid = to_binary(block)
+  assert valid.tolist() == [[True, True], [False, True]]
+  assert values.tolist() == [[0, 1], [0, 1]]
+
+def test_errors_index_and_messages():
+  block = np.array([[0, True], [None, 1]], dtype=object)
+  _, valid = to_binary(block)
+  with pytest.raises(InvalidDataError) as error:
+    check_block(block, valid, ['a', 'b'], 100)
+  assert (error.value.row, error.value.column) == (100, 'b')
+
+  errors = ValidationErrors()
+  errors.names = ['a', 'b']
+  errors.add(block, valid, 100)
+  assert len(errors) == 2
+  assert errors.rows.tolist() == [100, 101] and errors.cols.tolist() == [1, 0]
+  assert errors.texts.tolist() == ['True', '']
+  assert errors.first_message().startswith("Valor no válido 'True' en la fila 102, columna 'b'")
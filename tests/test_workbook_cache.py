@@ -0,0 +1,37 @@
+import os
+import pandas as pd
+import pytest
+from models.column import Column, CategoricalColumn
+from models.validation import InvalidDataError
+from models.workbook_cache import cache_path, load_columns, read_cache, write_cache
+
+def write_csv(tmp_path, data: dict) -> str:
+  path = str(tmp_path / 'datos.csv')
+  pd.DataFrame(data).to_csv(path, index=False)
+  return path
+
+def test_cache_round_trip_keeps_binary_and_categorical_columns(tmp_path):
+  path = write_csv(tmp_path, {'a': [1, 0, 1]})
+  columns = [Column('a', [1, 0, 1, 1, 0, 0, 0, 1, 1]), CategoricalColumn('b', ['x', 'y', 'x', 'z', 'x', 'y', 'y', 'z', 'x'])]
+  write_cache(path, columns)
+  cached = read_cache(path)
+  assert [column.name for column in cached] == ['a', 'b']
+  assert [column.fingerprint() for column in cached] == [column.fingerprint() for column in columns]
+  assert cached[1].levels == columns[1].levels and cached[1].codes.tolist() == columns[1].codes.tolist()
+
+def test_cache_is_ignored_after_the_file_changes(tmp_path):
+  path = write_csv(tmp_path, {'a': [1, 0, 1], 'b': [0, 0, 1]})
+  assert [column.values.tolist() for column in load_columns(path)] == [[1, 0, 1], [0, 0, 1]]
+  assert os.path.exists(cache_path(path))
+  assert [column.values.tolist() for column in read_cache(path)] == [[1, 0, 1], [0, 0, 1]]
+
+  write_csv(tmp_path, {'a': [0, 1, 1, 1], 'b': [1, 1, 0, 0]})
+  os.utime(path, ns=(0, 1))
+  assert read_cache(path) is None
+  assert [column.values.tolist() for column in load_columns(path)] == [[0, 1, 1, 1], [1, 1, 0, 0]]
+
+def test_binary_import_does_not_reuse_a_categorical_cache(tmp_path):
+  path = write_csv(tmp_path, {'a': [0, 1, 2]})
+  assert load_columns(path, categorical=True)[0].levels == ['0', '1', '2']
+  with pytest.raises(InvalidDataError):
+    load_columns(path)
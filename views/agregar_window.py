@@ -1,14 +1,37 @@
-import random
-import pandas as pd
 from PyQt5.QtWidgets import (
-  QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QLineEdit, QMessageBox, QFileDialog,
-  QCheckBox, QHeaderView, QLabel, QSpacerItem, QSizePolicy
+  QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QLineEdit, QMessageBox, QFileDialog,
+  QCheckBox, QHeaderView, QLabel, QSpacerItem, QSizePolicy, QScrollArea, QProgressDialog
 )
-from PyQt5.QtGui import QIcon, QColor
+from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt
 from models.table import Table
-from models.column import Column
-from views.result_window import ResultWindow
+from models.instrumentation import instrumentation
+from models.validation import ValidationErrors
+from models.workbook_cache import load_columns
+from views.binary_table_model import BinaryTableModel
+from views.result_window import ResultWindow, compute_results
+from views.workers import Worker
+
+# Número de columnas hasta el cual se estiran para ocupar todo el ancho de la tabla
+STRETCH_COLUMN_LIMIT = 8
+
+def load_file(path: str, progress=None) -> tuple:
+  """
+  Importa un archivo (o lo lee de su caché en disco) y calcula la matriz de co-ocurrencia de sus columnas y, si
+  son pocas, el histograma de sus patrones de fila.
+  Los valores no válidos no detienen la importación: se recogen en un índice para marcarlos en la tabla.
+  Se ejecuta en un hilo en segundo plano.
+
+  :param path: Ruta del archivo .xlsx o .csv.
+  :param progress: Función opcional que recibe las filas leídas y el total estimado de filas.
+  :return: Tupla con las columnas importadas, su matriz de co-ocurrencia, su histograma de patrones (o None) y
+           el índice de valores no válidos.
+  """
+  errors = ValidationErrors()
+  columns = load_columns(path, progress=progress, errors=errors)
+  table = Table(patterns=True)
+  table.set_columns(columns)
+  return columns, table.co_occurrence, table.pattern_histogram, errors
 
 class AgregarWindow(QWidget):
   """
@@ -45,7 +68,7 @@ class AgregarWindow(QWidget):
         border-radius: 5px;
         font-size: 14px;
       }
-      QTableWidget {
+      QTableView {
         background-color: white;
         border: 1px solid #ccc;
       }
@@ -130,22 +153,39 @@ class AgregarWindow(QWidget):
     self.table_layout = QVBoxLayout(self.table_container)
     self.right_panel.addWidget(self.table_container)
 
-    # Layout para checkboxes
-    self.checkboxes_layout = QHBoxLayout()
-    self.table_layout.addLayout(self.checkboxes_layout)
-
-    # Crear tabla
-    self.table = QTableWidget(self)
+    # Layout para checkboxes, dentro de un área con desplazamiento horizontal
+    self.checkboxes_container = QWidget()
+    self.checkboxes_layout = QHBoxLayout(self.checkboxes_container)
+    self.checkboxes_layout.setAlignment(Qt.AlignLeft)
+    self.checkboxes_scroll = QScrollArea(self)
+    self.checkboxes_scroll.setWidgetResizable(True)
+    self.checkboxes_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+    self.checkboxes_scroll.setFixedHeight(60)
+    self.checkboxes_scroll.setWidget(self.checkboxes_container)
+    self.table_layout.addWidget(self.checkboxes_scroll)
+
+    # Crear objeto Table; con pocas columnas mantiene el histograma de patrones de fila, así que los resultados
+    # de cualquier par seleccionado salen de 2^k conteos sin importar cuántas filas haya
+    self.data_table = Table(patterns=True)
+
+    # Crear tabla respaldada por un modelo; solo se dibujan las celdas visibles
+    self.table_model = BinaryTableModel(self.data_table, self)
+    self.table = QTableView(self)
+    self.table.setModel(self.table_model)
     self.table_layout.addWidget(self.table)
 
     self.column_names = []
     self.checkboxes = []
 
-    # Crear objeto Table
-    self.data_table = Table()
+    # Tarea en segundo plano en curso (importación o cálculo de resultados) y su diálogo de avance
+    self.worker = None
+    self.progress_dialog = None
 
     # Configurar la tabla para ajustar el encabezado y envolver texto
-    self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    self.table_model.columnsInserted.connect(self.update_header_mode)
+    self.table_model.columnsRemoved.connect(self.update_header_mode)
+    self.table_model.modelReset.connect(self.update_header_mode)
+    self.update_header_mode()
     self.table.horizontalHeader().setStyleSheet("""
       QHeaderView::section { 
         background-color: #145c96; 
@@ -156,6 +196,15 @@ class AgregarWindow(QWidget):
     """)
     self.table.setWordWrap(True)
 
+  def update_header_mode(self):
+    """
+    Estira las columnas cuando caben en la vista; con muchas columnas permite desplazarse horizontalmente.
+    """
+    if self.table_model.columnCount() <= STRETCH_COLUMN_LIMIT:
+      self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    else:
+      self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+
   def add_column(self):
     """
     Añade una nueva columna a la tabla y un checkbox correspondiente.
@@ -167,12 +216,7 @@ class AgregarWindow(QWidget):
         if column_name in self.column_names:
           QMessageBox.warning(self, "Advertencia", "El nombre de la columna ya existe.")
           return
-        if self.table.columnCount() >= 8:
-          QMessageBox.warning(self, "Advertencia", "No se pueden agregar más de 8 columnas.")
-          return
-        current_column_count = self.table.columnCount()
-        self.table.insertColumn(current_column_count)
-        self.table.setHorizontalHeaderItem(current_column_count, QTableWidgetItem(column_name))
+        self.table_model.add_column(column_name)
         self.column_names.append(column_name)
         # Añadir un nuevo checkbox
         checkbox = QCheckBox(column_name, self)
@@ -188,9 +232,9 @@ class AgregarWindow(QWidget):
     """
     Elimina la última columna de la tabla y su checkbox correspondiente.
     """
-    current_column_count = self.table.columnCount()
+    current_column_count = self.table_model.columnCount()
     if current_column_count > 0:
-      self.table.removeColumn(current_column_count - 1)
+      self.table_model.remove_last_column()
       # Remover el último checkbox
       if self.checkboxes:
         checkbox = self.checkboxes.pop()
@@ -198,7 +242,7 @@ class AgregarWindow(QWidget):
         checkbox.deleteLater()
       self.column_names.pop()
       # Limpiar tabla si no quedan columnas
-      if self.table.columnCount() == 0:
+      if self.table_model.columnCount() == 0:
         self.clear_table()
     else:
       QMessageBox.warning(self, "Advertencia", "No hay columnas para eliminar.")
@@ -207,9 +251,8 @@ class AgregarWindow(QWidget):
     """
     Añade una nueva fila a la tabla.
     """
-    if self.table.columnCount() > 0:  # Verificar que hay al menos una columna
-      row_count = self.table.rowCount()
-      self.table.insertRow(row_count)
+    if self.table_model.columnCount() > 0:  # Verificar que hay al menos una columna
+      self.table_model.add_row()
     else:
       QMessageBox.warning(self, "Advertencia", "Agregue al menos una columna antes de agregar filas.")
 
@@ -217,9 +260,9 @@ class AgregarWindow(QWidget):
     """
     Elimina la última fila de la tabla.
     """
-    row_count = self.table.rowCount()
+    row_count = self.table_model.rowCount()
     if row_count > 0:
-      self.table.removeRow(row_count - 1)
+      self.table_model.remove_last_row()
     else:
       QMessageBox.warning(self, "Advertencia", "No hay filas para eliminar.")
 
@@ -227,8 +270,7 @@ class AgregarWindow(QWidget):
     """
     Limpia toda la tabla y los checkboxes.
     """
-    self.table.setRowCount(0)
-    self.table.setColumnCount(0)
+    self.table_model.clear()
     self.column_names = []
     # Limpiar checkboxes
     for checkbox in self.checkboxes:
@@ -238,72 +280,129 @@ class AgregarWindow(QWidget):
 
   def import_data(self):
     """
-    Importa datos desde un archivo de Excel a la tabla.
+    Importa datos desde un archivo de Excel o CSV a la tabla. El archivo se lee por bloques en un hilo
+    en segundo plano, mostrando el avance y permitiendo cancelar la importación.
     """
     options = QFileDialog.Options()
-    file_name, _ = QFileDialog.getOpenFileName(self, "Abrir archivo de Excel", "", "Archivos Excel (*.xlsx);;Todos los archivos (*)", options=options)
+    file_name, _ = QFileDialog.getOpenFileName(self, "Abrir archivo de datos", "", "Archivos de datos (*.xlsx *.csv);;Archivos Excel (*.xlsx);;Archivos CSV (*.csv);;Todos los archivos (*)", options=options)
 
     if file_name:
-      try:
-        df = pd.read_excel(file_name)
+      self.progress_dialog = QProgressDialog("Importando datos...", "Cancelar", 0, 0, self)
+      self.progress_dialog.setWindowTitle("Importar Datos")
+      self.progress_dialog.setWindowModality(Qt.WindowModal)
+      self.progress_dialog.setMinimumDuration(500)
+
+      self.set_busy(True)
+      self.worker = Worker(load_file, file_name)
+      self.worker.signals.progress.connect(self.report_import_progress)
+      self.worker.signals.finished.connect(self.load_columns)
+      self.worker.signals.failed.connect(self.report_import_error)
+      self.worker.signals.cancelled.connect(self.finish_task)
+      self.progress_dialog.canceled.connect(self.worker.cancel)
+      self.worker.start()
+
+  def report_import_progress(self, rows_read: int, total_rows: int):
+    """
+    Actualiza el diálogo de avance de la importación.
 
-        # Verificar que el archivo tiene datos
-        if df.empty:
-          QMessageBox.warning(self, "Advertencia", "El archivo está vacío.")
-          return
+    :param rows_read: Filas leídas hasta ahora.
+    :param total_rows: Total estimado de filas (0 si no se conoce).
+    """
+    if total_rows:
+      self.progress_dialog.setMaximum(total_rows)
+      self.progress_dialog.setValue(min(rows_read, total_rows))
+    self.progress_dialog.setLabelText(f"Importando datos... {rows_read} filas leídas")
 
-        # Verificar el número de columnas
-        if len(df.columns) > 8:
-          QMessageBox.warning(self, "Advertencia", "El archivo tiene más de 8 columnas.")
-          return
+  def report_import_error(self, error: Exception):
+    """
+    Muestra el error ocurrido durante la importación.
 
-        # Verificar nombres de columnas repetidos
-        if any(column in self.column_names for column in df.columns):
-          QMessageBox.warning(self, "Advertencia", "El archivo contiene nombres de columnas repetidos.")
-          return
+    :param error: Excepción lanzada por la tarea.
+    """
+    self.finish_task()
+    QMessageBox.warning(self, "Error", f"Ocurrió un error al leer el archivo: {str(error)}")
 
-        # Limpiar tabla existente antes de cargar nuevos datos
-        self.clear_table()
+  def load_columns(self, loaded):
+    """
+    Carga en la tabla las columnas importadas por la tarea en segundo plano.
+
+    :param loaded: Tupla con las columnas importadas, su matriz de co-ocurrencia, su histograma de patrones y el
+                   índice de valores no válidos.
+    """
+    self.finish_task()
+    columns, co_occurrence, pattern_histogram, errors = loaded
+
+    # Verificar que el archivo tiene columnas; uno con encabezados y sin filas se carga como una tabla vacía
+    if not columns:
+      QMessageBox.warning(self, "Advertencia", "El archivo está vacío.")
+      return
+
+    # Verificar nombres de columnas repetidos
+    if any(column.name in self.column_names for column in columns):
+      QMessageBox.warning(self, "Advertencia", "El archivo contiene nombres de columnas repetidos.")
+      return
+
+    # Limpiar tabla existente antes de cargar nuevos datos
+    self.clear_table()
 
-        # Configurar tabla con número de columnas y filas del archivo
-        num_columns = len(df.columns)
-        num_rows = len(df)
-
-        # Configurar tabla
-        self.table.setColumnCount(num_columns)
-        self.table.setRowCount(num_rows)
-        self.table.setHorizontalHeaderLabels(df.columns)
-        self.column_names.extend(df.columns)
-
-        # Crear checkboxes para las columnas
-        self.checkboxes = []
-        self.checkboxes_layout.setSpacing(10)  # Opcional: ajustar espaciado entre checkboxes
-
-        for i, column in enumerate(df.columns):
-          checkbox = QCheckBox(column, self)
-          self.checkboxes_layout.addWidget(checkbox)
-          self.checkboxes.append(checkbox)
-
-        # Añadir filas con datos y aplicar validación
-        for row_index, row in df.iterrows():
-          for col_index, value in enumerate(row):
-            item = QTableWidgetItem(str(value))
-            if str(value) not in ['0', '1']:
-              item.setBackground(QColor('#FFCCCC'))  # Indicar error en rojo claro
-              item.setToolTip("El valor debe ser 0 o 1.")
-            self.table.setItem(row_index, col_index, item)
-
-      except Exception as e:
-        QMessageBox.warning(self, "Error", f"Ocurrió un error al leer el archivo: {str(e)}")
+    # Configurar tabla
+    names = [column.name for column in columns]
+    self.table_model.set_columns(columns, co_occurrence, errors, pattern_histogram)
+    self.column_names.extend(names)
+
+    # Crear checkboxes para las columnas
+    self.checkboxes = []
+    self.checkboxes_layout.setSpacing(10)  # Opcional: ajustar espaciado entre checkboxes
+
+    for name in names:
+      checkbox = QCheckBox(name, self)
+      self.checkboxes_layout.addWidget(checkbox)
+      self.checkboxes.append(checkbox)
+
+    if errors:
+      self.show_invalid_cell()
+      QMessageBox.warning(self, "Advertencia",
+                          f"El archivo contiene {len(errors)} valores no válidos, marcados en rojo. "
+                          f"Corríjalos antes de mostrar los resultados.\n{errors.first_message()}")
+
+  def show_invalid_cell(self):
+    """
+    Selecciona y muestra la primera celda vacía o con un valor no válido de la tabla.
+    """
+    positions = self.table_model.invalid_cells()
+    if len(positions):
+      index = self.table_model.index(int(positions[0, 0]), int(positions[0, 1]))
+      self.table.setCurrentIndex(index)
+      self.table.scrollTo(index)
+
+  def set_busy(self, busy: bool):
+    """
+    Bloquea la tabla y las acciones mientras una tarea en segundo plano usa sus datos. El diálogo de avance solo
+    aparece después de `setMinimumDuration`, así que por sí solo no impide editar la tabla mientras tanto.
+
+    :param busy: True al iniciar la tarea y False al terminarla.
+    """
+    widgets = [
+      self.column_name_input, self.add_column_button, self.remove_column_button, self.add_row_button,
+      self.remove_row_button, self.clear_table_button, self.import_data_button, self.random_binary_button,
+      self.show_results_button, self.table, self.checkboxes_container
+    ]
+    for widget in widgets:
+      widget.setEnabled(not busy)
+
+  def finish_task(self):
+    """
+    Cierra el diálogo de avance, libera la tarea en segundo plano terminada y vuelve a permitir los cambios.
+    """
+    self.progress_dialog.close()
+    self.worker = None
+    self.set_busy(False)
 
   def generate_random_binaries(self):
     """
     Genera valores binarios aleatorios (0 o 1) para toda la tabla.
     """
-    for row in range(self.table.rowCount()):
-      for col in range(self.table.columnCount()):
-        random_value = str(random.randint(0, 1))
-        self.table.setItem(row, col, QTableWidgetItem(random_value))
+    self.table_model.fill_random()
 
   def show_results(self):
     """
@@ -316,37 +415,61 @@ class AgregarWindow(QWidget):
       return
 
     # Verificar que hay al menos una fila
-    if self.table.rowCount() == 0:
+    if self.table_model.rowCount() == 0:
       QMessageBox.warning(self, "Advertencia", "Debe haber al menos una fila en la tabla.")
       return
 
     # Verificar que todos los valores son binarios y están presentes
-    all_values_valid = True
-    for row in range(self.table.rowCount()):
-      for col in range(self.table.columnCount()):
-        item = self.table.item(row, col)
-        if not item or item.text() not in ['0', '1']:
-          all_values_valid = False
-          break
-      if not all_values_valid:
-        break
-
-    if not all_values_valid:
+    with instrumentation.span('gui.validate', rows=self.table_model.rowCount(), columns=self.table_model.columnCount()):
+      valid = self.table_model.is_valid()
+    if not valid:
+      self.show_invalid_cell()
       QMessageBox.warning(self, "Advertencia", "Todas las filas deben tener valores válidos (0 o 1).")
       return
 
-    # Actualizar la data_table con los valores de la tabla
-    self.data_table.clear_columns()
-    for col_index in range(self.table.columnCount()):
-      column_data = []
-      for row_index in range(self.table.rowCount()):
-        item = self.table.item(row_index, col_index)
-        column_data.append(int(item.text()))
-      column_name = self.table.horizontalHeaderItem(col_index).text()
-      column = Column(column_name, column_data)
-      self.data_table.add_column(column)
-
+    # La data_table ya está sincronizada con la tabla; sus co-ocurrencias se actualizan con cada cambio.
+    # Los resultados se calculan en segundo plano sobre la misma data_table, así que la tabla y las acciones
+    # quedan bloqueadas hasta que la tarea termine
     self.data_table.selected_index_columns = selected_checkboxes
-    self.data_table.get_contingency_table()
-    self.result_window = ResultWindow(self.data_table)
+    self.progress_dialog = QProgressDialog("Calculando resultados...", "Cancelar", 0, 0, self)
+    self.progress_dialog.setWindowTitle("Resultados")
+    self.progress_dialog.setWindowModality(Qt.WindowModal)
+    self.progress_dialog.setMinimumDuration(500)
+
+    self.set_busy(True)
+    self.worker = Worker(compute_results, self.data_table)
+    self.worker.signals.progress.connect(self.report_analysis_progress)
+    self.worker.signals.finished.connect(self.open_results)
+    self.worker.signals.failed.connect(self.report_analysis_error)
+    self.worker.signals.cancelled.connect(self.finish_task)
+    self.progress_dialog.canceled.connect(self.worker.cancel)
+    self.worker.start()
+
+  def report_analysis_progress(self, done: int, total: int):
+    """
+    Actualiza el diálogo de avance del cálculo de resultados.
+
+    :param done: Pasos terminados.
+    :param total: Total de pasos.
+    """
+    self.progress_dialog.setMaximum(total)
+    self.progress_dialog.setValue(done)
+
+  def report_analysis_error(self, error: Exception):
+    """
+    Muestra el error ocurrido durante el cálculo de resultados.
+
+    :param error: Excepción lanzada por la tarea.
+    """
+    self.finish_task()
+    QMessageBox.warning(self, "Error", f"Ocurrió un error al calcular los resultados: {str(error)}")
+
+  def open_results(self, results: dict):
+    """
+    Muestra la ventana de resultados con los resultados calculados en segundo plano.
+
+    :param results: Resultados de `compute_results`.
+    """
+    self.finish_task()
+    self.result_window = ResultWindow(self.data_table, results)
     self.result_window.show()
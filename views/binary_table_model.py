@@ -0,0 +1,224 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from models.column import Column
+from models.table import Table
+from models.validation import ValidationErrors
+
+class BinaryTableModel(QAbstractTableModel):
+  """
+  Modelo de datos para la tabla de la ventana de agregar datos.
+  Los valores se leen directamente de las columnas empaquetadas de la Table asociada y solo se genera el texto
+  de las celdas visibles, por lo que la vista se mantiene rápida aunque haya millones de filas y no guarda otra
+  copia de los datos. Las celdas vacías o no válidas (que cuentan como 0 en la Table) se marcan aparte: una
+  máscara de bits por columna, creada solo si la columna tiene alguna, y el texto original de las no válidas.
+  Cada cambio se replica en la Table, que actualiza sus co-ocurrencias de forma incremental.
+  """
+
+  # Valor de una celda vacía o con un valor no válido en `column_values`
+  EMPTY = -1
+
+  def __init__(self, table: Table, parent=None):
+    super().__init__(parent)
+    self.table = table
+    self._names = []
+    self._rows = 0
+    # Máscara de celdas vacías o no válidas de cada columna (None si la columna no tiene ninguna)
+    self._empty = []
+    # Texto original de las celdas con valores distintos de 0 o 1, indexado por (fila, columna)
+    self._invalid = {}
+
+  @property
+  def column_names(self) -> list[str]:
+    return list(self._names)
+
+  def rowCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else self._rows
+
+  def columnCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else len(self._names)
+
+  def data(self, index, role=Qt.DisplayRole):
+    if not index.isValid():
+      return None
+    row, col = index.row(), index.column()
+    if role in (Qt.DisplayRole, Qt.EditRole):
+      if self._is_empty(row, col):
+        return self._invalid.get((row, col), "")
+      return str(self.table.columns[col].get(row))
+    if role == Qt.BackgroundRole and (row, col) in self._invalid:
+      return QColor('#FFCCCC')  # Indicar error en rojo claro
+    if role == Qt.ToolTipRole and (row, col) in self._invalid:
+      return "El valor debe ser 0 o 1."
+    return None
+
+  def setData(self, index, value, role=Qt.EditRole) -> bool:
+    if not index.isValid() or role != Qt.EditRole:
+      return False
+    row, col = index.row(), index.column()
+    text = str(value).strip()
+    self.table.set_value(row, col, 1 if text == '1' else 0)
+    self._set_empty(row, col, text not in ('0', '1'))
+    if text and text not in ('0', '1'):
+      self._invalid[(row, col)] = text
+    else:
+      self._invalid.pop((row, col), None)
+    self.dataChanged.emit(index, index, [role])
+    return True
+
+  def flags(self, index):
+    if not index.isValid():
+      return Qt.NoItemFlags
+    return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+  def headerData(self, section, orientation, role=Qt.DisplayRole):
+    if role != Qt.DisplayRole:
+      return None
+    if orientation == Qt.Horizontal:
+      return self._names[section] if section < len(self._names) else None
+    return str(section + 1)
+
+  def add_column(self, name: str):
+    """
+    Añade una columna vacía al final de la tabla.
+
+    :param name: Nombre de la nueva columna.
+    """
+    position = len(self._names)
+    self.beginInsertColumns(QModelIndex(), position, position)
+    self._names.append(name)
+    self._empty.append(Column(name, np.ones(self._rows, dtype=np.uint8)) if self._rows else None)
+    self.table.add_column(Column(name, np.zeros(self._rows, dtype=np.uint8)))
+    self.endInsertColumns()
+
+  def remove_last_column(self):
+    """
+    Elimina la última columna de la tabla.
+    """
+    position = len(self._names) - 1
+    self.beginRemoveColumns(QModelIndex(), position, position)
+    self._names.pop()
+    self._empty.pop()
+    self._invalid = {key: text for key, text in self._invalid.items() if key[1] != position}
+    self.table.remove_column(position)
+    self.endRemoveColumns()
+
+  def add_row(self):
+    """
+    Añade una fila vacía al final de la tabla.
+    """
+    self.beginInsertRows(QModelIndex(), self._rows, self._rows)
+    for col in range(len(self._names)):
+      self._empty_mask(col).append(1)
+    self._rows += 1
+    self.table.append_row([0] * len(self._names))
+    self.endInsertRows()
+
+  def remove_last_row(self):
+    """
+    Elimina la última fila de la tabla.
+    """
+    position = self._rows - 1
+    self.beginRemoveRows(QModelIndex(), position, position)
+    for mask in self._empty:
+      if mask is not None:
+        mask.pop()
+    self._rows -= 1
+    self._invalid = {key: text for key, text in self._invalid.items() if key[0] != position}
+    self.table.remove_last_row()
+    self.endRemoveRows()
+
+  def clear(self):
+    """
+    Elimina todas las filas y columnas.
+    """
+    self.beginResetModel()
+    self._names = []
+    self._rows = 0
+    self._empty = []
+    self._invalid = {}
+    self.table.clear_columns()
+    self.endResetModel()
+
+  def set_columns(self, columns: list[Column], co_occurrence: np.ndarray = None, errors: ValidationErrors = None,
+                  pattern_histogram: np.ndarray = None):
+    """
+    Reemplaza todo el contenido del modelo con columnas importadas, reutilizándolas en la Table.
+
+    :param columns: Columnas con el mismo número de filas.
+    :param co_occurrence: Matriz de co-ocurrencia ya calculada; si se omite, la Table la calcula.
+    :param errors: Índice opcional de las celdas no válidas del archivo (importadas como 0), que se marcan en rojo.
+    :param pattern_histogram: Histograma de patrones de fila ya calculado; si se omite, la Table lo calcula si lo usa.
+    """
+    self.beginResetModel()
+    self._names = [column.name for column in columns]
+    self._rows = len(columns[0]) if columns else 0
+    self._empty = [None] * len(columns)
+    self._invalid = {}
+    if errors:
+      rows, cols = errors.rows, errors.cols
+      for col in np.unique(cols):
+        mask = np.zeros(self._rows, dtype=np.uint8)
+        mask[rows[cols == col]] = 1
+        self._empty[col] = Column(self._names[col], mask)
+      self._invalid = dict(zip(zip(rows.tolist(), cols.tolist()), errors.texts.tolist()))
+    self.table.set_columns(columns, co_occurrence, pattern_histogram)
+    self.endResetModel()
+
+  def fill_random(self):
+    """
+    Llena todas las celdas con valores binarios aleatorios (0 o 1).
+    """
+    rng = np.random.default_rng()
+    self._empty = [None] * len(self._names)
+    self._invalid = {}
+    self.table.set_columns([Column(name, rng.integers(0, 2, self._rows, dtype=np.uint8)) for name in self._names])
+    if self._rows and self._names:
+      self.dataChanged.emit(self.index(0, 0), self.index(self._rows - 1, len(self._names) - 1))
+
+  def is_valid(self) -> bool:
+    """
+    Verifica que todas las celdas tengan un valor 0 o 1.
+
+    :return: True si no hay celdas vacías ni con valores no válidos.
+    """
+    return all(mask is None or mask.count() == 0 for mask in self._empty)
+
+  def invalid_cells(self) -> np.ndarray:
+    """
+    Obtiene las posiciones de las celdas vacías o con valores no válidos, columna por columna.
+
+    :return: Arreglo (n x 2) con la fila y la columna de cada celda, ordenado por columna y luego por fila.
+    """
+    positions = [np.zeros((0, 2), dtype=np.int64)]
+    for col, mask in enumerate(self._empty):
+      rows = np.flatnonzero(mask.values) if mask is not None else []
+      if len(rows):
+        positions.append(np.column_stack((rows, np.full(len(rows), col))))
+    return np.concatenate(positions)
+
+  def column_values(self, col: int) -> np.ndarray:
+    """
+    Obtiene los valores de una columna, con EMPTY en las celdas vacías o no válidas.
+
+    :param col: Índice de la columna.
+    :return: Arreglo int8 con los valores de las filas existentes.
+    """
+    values = self.table.columns[col].values.astype(np.int8)
+    if self._empty[col] is not None:
+      values[self._empty[col].values.astype(bool)] = self.EMPTY
+    return values
+
+  def _is_empty(self, row: int, col: int) -> bool:
+    mask = self._empty[col]
+    return mask is not None and mask.get(row) == 1
+
+  def _empty_mask(self, col: int) -> Column:
+    # La máscara de una columna se crea la primera vez que tiene una celda vacía
+    if self._empty[col] is None:
+      self._empty[col] = Column(self._names[col], np.zeros(self._rows, dtype=np.uint8))
+    return self._empty[col]
+
+  def _set_empty(self, row: int, col: int, empty: bool):
+    if empty or self._empty[col] is not None:
+      self._empty_mask(col).set(row, int(empty))
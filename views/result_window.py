@@ -1,10 +1,46 @@
 from PyQt5.QtWidgets import (
-  QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QScrollArea
+  QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QScrollArea, QTableView, QLineEdit
 )
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QColor
-from models.column import Column
+from PyQt5.QtGui import QIcon
 from models.table import Table
+from models.instrumentation import instrumentation
+from views.rule_table_model import RuleTableModel
+
+@instrumentation.traced('analysis')
+def compute_results(table: Table, progress=None) -> dict:
+  """
+  Calcula todos los resultados que muestra la ventana de resultados. No usa widgets, así que puede ejecutarse
+  en un hilo en segundo plano mientras la interfaz sigue respondiendo.
+
+  :param table: Tabla con las columnas seleccionadas.
+  :param progress: Función opcional que recibe los pasos terminados y el total de pasos.
+  :return: Diccionario con la tabla de contingencia, las reglas con su cobertura y confianza, factor de dependencia,
+           chi-cuadrado y significancia.
+  """
+  steps = 5
+  results = {}
+  if progress:
+    progress(0, steps)
+  results['contingency'] = table.get_contingency_table()
+  if progress:
+    progress(1, steps)
+  results['rules'] = table.get_rules()
+  if progress:
+    progress(2, steps)
+  results['dependency'] = table.get_dependency_factor()
+  if progress:
+    progress(3, steps)
+  results['chi_squared'] = table.calculate_chi_squared()
+  if progress:
+    progress(4, steps)
+  p_value, method = table.test_independence()
+  results['significance'] = table.determine_significance(
+    results['chi_squared'].statistic, df=results['chi_squared'].df, p_value=p_value, method=method
+  )
+  if progress:
+    progress(steps, steps)
+  return results
 
 class ResultWindow(QWidget):
   """
@@ -12,7 +48,7 @@ class ResultWindow(QWidget):
   Muestra los resultados de la tabla de contingencia, confianza y cobertura, factor de dependencia, y chi-cuadrado.
   """
 
-  def __init__(self, table):
+  def __init__(self, table, results: dict = None):
     super().__init__()
     self.setWindowTitle("Resultados")
     self.setGeometry(200, 200, 800, 700)
@@ -21,8 +57,11 @@ class ResultWindow(QWidget):
     self.setWindowIcon(QIcon('img/IconLogoMechi.png'))  # Cambiar a la ruta de tu icono
 
     self.table = table
+    # Los resultados normalmente llegan ya calculados desde un hilo en segundo plano
+    self.results = results if results is not None else compute_results(table)
     self.init_ui()
 
+  @instrumentation.traced('gui.result_window')
   def init_ui(self):
     main_layout = QVBoxLayout()
 
@@ -47,7 +86,7 @@ class ResultWindow(QWidget):
     layout.addWidget(cont_table_title)
 
     # Tabla de contingencia
-    self.create_table(layout, self.table.get_contingency_table(), "contingency")
+    self.create_table(layout, self.results['contingency'], "contingency")
 
     # Separador
     layout.addWidget(self.create_separator())
@@ -60,24 +99,7 @@ class ResultWindow(QWidget):
     layout.addWidget(conf_cov_title)
 
     # Resultados de confianza y cobertura
-    coverage_list, confidence_list = self.table.get_coverage_confidence()
-    for coverage, confidence in zip(coverage_list, confidence_list):
-      coverage_label = QLabel(f"Cobertura: {coverage}")
-      confidence_label = QLabel(f"Confianza: {confidence}")
-      separator_label = QLabel("." * 100)  # Separador
-
-      coverage_label.setStyleSheet("font-size: 17px; color: #333; margin-bottom: 5px;")
-      confidence_label.setStyleSheet("font-size: 17px; color: #333; margin-bottom: 15px;")
-      separator_label.setStyleSheet("color: #ccc; margin-bottom: 10px;")
-
-      coverage_label.setAccessibleName("Cobertura")
-      coverage_label.setAccessibleDescription(f"Valor de cobertura: {coverage}")
-      confidence_label.setAccessibleName("Cobertura")
-      confidence_label.setAccessibleDescription(f"Valor de confianza: {confidence}")
-      
-      layout.addWidget(coverage_label)
-      layout.addWidget(confidence_label)
-      layout.addWidget(separator_label)
+    self.create_rule_list(layout, self.results['rules'])
 
     # Separador
     layout.addWidget(self.create_separator())
@@ -90,14 +112,16 @@ class ResultWindow(QWidget):
     layout.addWidget(dep_factor_title)
 
     # Tabla de factores de dependencia
-    self.create_table(layout, self.table.get_dependency_factor(), "dependency")
+    self.create_table(layout, self.results['dependency'], "dependency")
 
     # Separador
     layout.addWidget(self.create_separator())
 
     # Cálculo de chi-cuadrado
-    chi_squared_value, chi_squared_steps, result_string = self.table.calculate_chi_squared()
-    significance = self.table.determine_significance(chi_squared_value)
+    # El texto del cálculo se genera solo al mostrar la ventana
+    chi_squared_value = self.results['chi_squared'].statistic
+    result_string = self.results['chi_squared'].format_result()
+    significance = self.results['significance']
 
     # Título de los resultados de chi-cuadrado
     chi_squared_title = QLabel("Chi-cuadrado")
@@ -140,16 +164,14 @@ class ResultWindow(QWidget):
     """
     table_size_x = 700
     table_size_y = 250
+    labels1, labels2 = self.table.get_labels()
+    table = QTableWidget(len(data), len(data[0]))
     if table_type == "contingency":
-      name1, name2 = self.table.get_names()
-      table = QTableWidget(len(data), len(data[0]))
-      table.setHorizontalHeaderLabels([f"{name2}", f"~{name2}", "Σ"])
-      table.setVerticalHeaderLabels([f"{name1}", f"~{name1}", "Σ"])
+      table.setHorizontalHeaderLabels(labels2 + ["Σ"])
+      table.setVerticalHeaderLabels(labels1 + ["Σ"])
     elif table_type == "dependency":
-      name1, name2 = self.table.get_names()
-      table = QTableWidget(len(data), len(data[0]))
-      table.setHorizontalHeaderLabels([f"{name2}", f"~{name2}"])
-      table.setVerticalHeaderLabels([f"{name1}", f"~{name1}"])
+      table.setHorizontalHeaderLabels(labels2)
+      table.setVerticalHeaderLabels(labels1)
 
     for row in range(len(data)):
       for col in range(len(data[0])):
@@ -178,6 +200,55 @@ class ResultWindow(QWidget):
     """)
     layout.addWidget(table)
 
+  def create_rule_list(self, layout, rules):
+    """
+    Crea la lista de reglas con su cobertura y confianza, respaldada por un modelo: solo se dibujan las filas
+    visibles, se ordena al hacer clic en los encabezados y se filtra escribiendo parte del texto de la regla.
+
+    :param layout: Layout donde se agregará la lista.
+    :param rules: Reglas a mostrar (ver `RuleTableModel.set_rules`).
+    """
+    self.rule_filter = QLineEdit()
+    self.rule_filter.setPlaceholderText("Filtrar reglas...")
+    self.rule_filter.setStyleSheet("padding: 2px; border: 1px solid #ccc; border-radius: 5px; font-size: 14px;")
+    self.rule_filter.setAccessibleName("Filtrar reglas")
+    layout.addWidget(self.rule_filter)
+
+    self.rule_model = RuleTableModel(rules, self)
+    self.rule_filter.textChanged.connect(self.rule_model.set_filter)
+
+    self.rule_view = QTableView()
+    self.rule_view.setModel(self.rule_model)
+    self.rule_view.setSortingEnabled(True)
+    # Sin orden inicial las reglas se muestran en el orden en que se calcularon
+    self.rule_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    # Anchos fijos: ajustar las columnas a su contenido obligaría a medir todas las filas
+    self.rule_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+    for col, width in ((1, 150), (2, 150), (3, 100)):
+      self.rule_view.horizontalHeader().setSectionResizeMode(col, QHeaderView.Interactive)
+      self.rule_view.setColumnWidth(col, width)
+    # Altura de fila fija para no medir el contenido de cada fila
+    self.rule_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    self.rule_view.verticalHeader().setDefaultSectionSize(28)
+    self.rule_view.setSelectionBehavior(QTableView.SelectRows)
+    self.rule_view.setFixedSize(700, 300)
+    self.rule_view.setAccessibleName("Confianza y cobertura")
+    self.rule_view.setAccessibleDescription("Lista de reglas con su cobertura y confianza")
+    self.rule_view.setStyleSheet("""
+      QTableView {
+        background-color: white;
+        border: 1px solid #ccc;
+        font-size: 15px;
+      }
+      QHeaderView::section {
+        background-color: #145c96;
+        color: white;
+        padding: 5px;
+        border: 1px solid #ccc;
+      }
+    """)
+    layout.addWidget(self.rule_view)
+
   def create_separator(self):
     """
     Crea un separador visual.
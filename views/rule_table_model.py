@@ -0,0 +1,130 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from models.results import RuleResult
+
+class RuleTableModel(QAbstractTableModel):
+  """
+  Modelo de datos para la lista de reglas de la ventana de resultados.
+  Guarda las reglas con sus valores numéricos y solo genera el texto de las filas visibles, por lo que
+  miles de reglas se muestran de inmediato. El orden y el filtro se calculan con NumPy sobre todas las reglas
+  a la vez (un QSortFilterProxyModel llamaría a `data` en cada comparación) y la vista solo ve la permutación
+  resultante de las filas; el texto de todas las reglas solo se genera al filtrar u ordenar por él.
+  """
+
+  # Encabezado y clave de la regla de cada columna
+  COLUMNS = [("Regla", 'rule'), ("Cobertura", 'coverage'), ("Confianza", 'confidence'), ("Ocurrencias", 'count')]
+
+  def __init__(self, rules: list[RuleResult] = None, parent=None):
+    super().__init__(parent)
+    self._filter = ""
+    self._sort_column = -1
+    self._sort_order = Qt.AscendingOrder
+    self._set_rules(rules or [])
+
+  def rowCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else len(self._order)
+
+  def columnCount(self, parent=QModelIndex()) -> int:
+    return 0 if parent.isValid() else len(self.COLUMNS)
+
+  def data(self, index, role=Qt.DisplayRole):
+    if not index.isValid():
+      return None
+    rule = self._rules[self._order[index.row()]]
+    key = self.COLUMNS[index.column()][1]
+    if role in (Qt.DisplayRole, Qt.ToolTipRole, Qt.AccessibleTextRole):
+      return self._format(rule, key)
+    if role == Qt.TextAlignmentRole and key != 'rule':
+      return Qt.AlignCenter
+    return None
+
+  def headerData(self, section, orientation, role=Qt.DisplayRole):
+    if role != Qt.DisplayRole:
+      return None
+    if orientation == Qt.Horizontal:
+      return self.COLUMNS[section][0]
+    return str(section + 1)
+
+  def sort(self, column: int, order=Qt.AscendingOrder):
+    """
+    Ordena las reglas por el valor de una columna (el texto de la regla o su valor numérico).
+
+    :param column: Índice de la columna; -1 conserva el orden en que se calcularon las reglas.
+    :param order: Qt.AscendingOrder o Qt.DescendingOrder.
+    """
+    self.layoutAboutToBeChanged.emit()
+    self._sort_column, self._sort_order = column, order
+    self._update_order()
+    self.layoutChanged.emit()
+
+  def set_filter(self, text: str):
+    """
+    Muestra solo las reglas que contienen un texto, sin distinguir mayúsculas de minúsculas.
+
+    :param text: Texto a buscar; vacío muestra todas las reglas.
+    """
+    self.beginResetModel()
+    self._filter = text.strip().lower()
+    self._update_order()
+    self.endResetModel()
+
+  def set_rules(self, rules: list[RuleResult]):
+    """
+    Reemplaza las reglas mostradas, conservando el orden y el filtro actuales.
+
+    :param rules: Reglas de un par (`Table.get_rules`) o encontradas por Apriori (`Table.mine_rules`).
+    """
+    self.beginResetModel()
+    self._set_rules(rules)
+    self.endResetModel()
+
+  def rule(self, row: int) -> RuleResult:
+    """
+    Obtiene la regla de una fila de la vista.
+
+    :param row: Fila en el orden y con el filtro actuales.
+    :return: Regla de la fila.
+    """
+    return self._rules[self._order[row]]
+
+  def _set_rules(self, rules: list[RuleResult]):
+    self._rules = list(rules)
+    # Valores de cada columna como arreglos, para ordenar y filtrar sin recorrer las reglas en Python. Se generan
+    # la primera vez que se ordena o se filtra por ellos, así que cargar las reglas no crea ningún texto
+    self._keys = {}
+    self._search = None
+    self._update_order()
+
+  def _column_keys(self, key: str) -> np.ndarray:
+    if key not in self._keys:
+      self._keys[key] = np.array([getattr(rule, key) for rule in self._rules], dtype=str if key == 'rule' else np.float64)
+    return self._keys[key]
+
+  def _search_texts(self) -> np.ndarray:
+    if self._search is None:
+      self._search = np.char.lower(self._column_keys('rule'))
+    return self._search
+
+  def _update_order(self):
+    rows = np.arange(len(self._rules))
+    if self._filter:
+      rows = rows[np.char.find(self._search_texts()[rows], self._filter) >= 0]
+    if self._sort_column >= 0:
+      values = self._column_keys(self.COLUMNS[self._sort_column][1])[rows]
+      descending = self._sort_order == Qt.DescendingOrder
+      if descending and values.dtype.kind == 'f':
+        values, descending = -values, False
+      # Orden estable: las reglas con el mismo valor conservan su orden original
+      rows = rows[np.argsort(values, kind='stable')]
+      if descending:
+        rows = rows[::-1]
+    self._order = rows
+
+  @staticmethod
+  def _format(rule: RuleResult, key: str) -> str:
+    # El texto se genera solo al dibujar una celda
+    if key == 'coverage':
+      return rule.format_coverage()
+    if key == 'confidence':
+      return rule.format_confidence()
+    return str(getattr(rule, key))
@@ -0,0 +1,78 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class CancelledError(Exception):
+  """
+  Error lanzado dentro de una tarea en segundo plano cuando se solicita su cancelación.
+  """
+
+class WorkerSignals(QObject):
+  """
+  Señales de una tarea en segundo plano. El objeto se crea en el hilo de la interfaz, así que los métodos
+  de ventanas conectados a estas señales se ejecutan en ese hilo aunque la señal se emita desde el pool.
+  """
+  # Avance (hecho, total); el total es 0 si no se conoce
+  progress = pyqtSignal(int, int)
+  finished = pyqtSignal(object)
+  failed = pyqtSignal(object)
+  cancelled = pyqtSignal()
+
+class Worker(QRunnable):
+  """
+  Tarea que ejecuta una función en el QThreadPool global sin bloquear la interfaz.
+  La función recibe un argumento `progress(hecho, total)` que emite la señal de avance y lanza
+  CancelledError si se pidió cancelar, de modo que la tarea se detiene en el siguiente reporte de avance.
+  """
+
+  def __init__(self, function, *args, **kwargs):
+    super().__init__()
+    # La ventana que inicia la tarea guarda la referencia; así Qt no destruye el objeto al terminar
+    self.setAutoDelete(False)
+    self.function = function
+    self.args = args
+    self.kwargs = kwargs
+    self.signals = WorkerSignals()
+    self._cancelled = threading.Event()
+
+  def cancel(self):
+    """
+    Solicita la cancelación de la tarea.
+    """
+    self._cancelled.set()
+
+  @property
+  def is_cancelled(self) -> bool:
+    return self._cancelled.is_set()
+
+  def report_progress(self, done: int, total: int = None):
+    """
+    Reporta el avance de la tarea.
+
+    :param done: Unidades de trabajo terminadas.
+    :param total: Total de unidades de trabajo (None si no se conoce).
+    """
+    if self._cancelled.is_set():
+      raise CancelledError()
+    self.signals.progress.emit(int(done), int(total or 0))
+
+  def run(self):
+    try:
+      result = self.function(*self.args, progress=self.report_progress, **self.kwargs)
+    except CancelledError:
+      self.signals.cancelled.emit()
+      return
+    except Exception as e:
+      self.signals.failed.emit(e)
+      return
+    if self._cancelled.is_set():
+      self.signals.cancelled.emit()
+    else:
+      self.signals.finished.emit(result)
+
+  def start(self, pool: QThreadPool = None):
+    """
+    Inicia la tarea en el pool indicado (por defecto, el pool global de Qt).
+
+    :param pool: Pool de hilos donde se ejecuta la tarea.
+    """
+    (pool or QThreadPool.globalInstance()).start(self)